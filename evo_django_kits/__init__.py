@@ -1,3 +1,10 @@
-from .django_moduler.evo_router import get_router
-
 __all__ = ["get_router"]
+
+
+def __getattr__(name):
+    # Imported lazily so the package (CLI, benchmarks) can be imported before Django settings are configured
+    if name == "get_router":
+        from .django_moduler.evo_router import get_router
+
+        return get_router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
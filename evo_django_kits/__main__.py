@@ -1,6 +1,8 @@
 """Entry point for evo_django_kits."""
 
+import sys
+
 from .cli import main  # pragma: no cover
 
 if __name__ == "__main__":  # pragma: no cover
-    main()
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Offline benchmarks of evo_django_kits against an in-memory SQLite database and synthetic models.
+
+Each benchmark module exposes a ``run(**params)`` function returning a dict of measurements
+and can be executed directly, e.g. ``python -m evo_django_kits.benchmarks.fast_read``.
+"""
+
+import statistics
+import time
+
+import django
+from django.conf import settings
+
+
+def setup_django():
+    """Configure a standalone Django project with the synthetic benchmark models"""
+    if settings.configured:
+        return
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY="evo-django-kits-benchmarks",
+        ALLOWED_HOSTS=["testserver"],
+        USE_TZ=True,
+        DEFAULT_AUTO_FIELD="django.db.models.AutoField",
+        DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
+        INSTALLED_APPS=[
+            "django.contrib.contenttypes",
+            "django.contrib.auth",
+            "rest_framework",
+            "evo_django_kits.benchmarks",
+        ],
+        MIDDLEWARE=[],
+        ROOT_URLCONF=[],
+        REST_FRAMEWORK={
+            "DEFAULT_PAGINATION_CLASS": "evo_django_kits.entities.pagination.EvoPageNumberPagination",
+            "DEFAULT_FILTER_BACKENDS": ["rest_framework.filters.OrderingFilter"],
+            "DEFAULT_AUTHENTICATION_CLASSES": [],
+            "UNAUTHENTICATED_USER": None,
+        },
+    )
+    django.setup()
+
+    from django.core.management import call_command
+
+    call_command("migrate", run_syncdb=True, verbosity=0)
+
+
+def measure(func, repeat=10, warmup=1):
+    """Median wall time of ``func`` in seconds"""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
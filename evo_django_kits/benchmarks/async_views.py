@@ -0,0 +1,68 @@
+"""Concurrent throughput of the list endpoint of BaseViewSet vs AsyncBaseViewSet through Django's ASGI handler"""
+
+import asyncio
+import json
+import time
+import types
+
+from evo_django_kits.benchmarks import setup_django
+
+
+def run(rows=2000, concurrency=(1, 10, 50), requests=200, page_size=50, query_latency=0.0):
+    """``query_latency`` seconds are added to every query to emulate a database over the network"""
+    setup_django()
+
+    from asgiref.sync import async_to_sync
+    from django.db import connection
+    from django.test import AsyncClient, override_settings
+    from django.urls import path
+
+    from evo_django_kits.benchmarks.models import RECORD_FIELDS, BenchRecord, seed_records
+    from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+
+    seed_records(rows)
+    moduler = RestFrameworkModuler()
+    serializer_class = moduler.create_serializer_class(BenchRecord, fields=RECORD_FIELDS)
+    urlconf = types.ModuleType("evo_django_kits_benchmark_urls")
+    urlconf.urlpatterns = [
+        path(
+            f"{mode}/",
+            moduler.create_viewset_class(
+                BenchRecord, serializer_class, async_=mode == "async", ordering=["id"]
+            ).as_view({"get": "list"}),
+        )
+        for mode in ("sync", "async")
+    ]
+
+    def slow_query(execute, sql, params, many, context):
+        time.sleep(query_latency)
+        return execute(sql, params, many, context)
+
+    async def load(url, workers):
+        client = AsyncClient()
+        pending = iter(range(requests))
+
+        async def worker():
+            for _ in pending:
+                response = await client.get(url, {"page_size": page_size})
+                assert response.status_code == 200, response.content
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return time.perf_counter() - start
+
+    results = {}
+    with override_settings(ROOT_URLCONF=urlconf), connection.execute_wrapper(slow_query):
+        for mode in ("sync", "async"):
+            for workers in concurrency:
+                # Called from the main thread so thread sensitive ORM calls share the in-memory database connection
+                seconds = async_to_sync(load)(f"/{mode}/", workers)
+                results[f"{mode}.concurrency_{workers}"] = {
+                    "seconds": seconds,
+                    "requests_per_second": requests / seconds,
+                }
+    return results
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print(json.dumps(run(), indent=2))
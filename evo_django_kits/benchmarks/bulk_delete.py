@@ -0,0 +1,44 @@
+"""Time of the bulk_delete action for growing id lists, rows are seeded again before every measure"""
+
+import json
+import statistics
+import time
+import types
+
+from evo_django_kits.benchmarks import setup_django
+
+
+def run(sizes=(1000, 10000, 100000), repeat=3):
+    setup_django()
+
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from evo_django_kits.benchmarks.models import RECORD_FIELDS, BenchRecord, seed_records
+    from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+
+    moduler = RestFrameworkModuler()
+    serializer_class = moduler.create_serializer_class(BenchRecord, fields=RECORD_FIELDS)
+    viewset_class = moduler.create_viewset_class(BenchRecord, serializer_class)
+    # The action's serializer and permission classes, as the router would pass them
+    view = viewset_class.as_view({"delete": "bulk_delete"}, **viewset_class.bulk_delete.kwargs)
+    factory = APIRequestFactory()
+    admin = types.SimpleNamespace(is_staff=True, is_authenticated=True)
+
+    results = {}
+    for size in sizes:
+        timings = []
+        for _ in range(repeat):
+            ids = [record.pk for record in seed_records(size, tags=1)]
+            request = factory.delete("/records/bulk_delete/", {"ids": ids}, format="json")
+            force_authenticate(request, user=admin)
+            start = time.perf_counter()
+            response = view(request)
+            timings.append(time.perf_counter() - start)
+            assert response.status_code == 204, response.data
+        seconds = statistics.median(timings)
+        results[f"ids_{size}"] = {"seconds": seconds, "rows_per_second": size / seconds}
+    return results
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,38 @@
+"""Throughput of list pages rendered by the serializer vs the compiled fast read path"""
+
+import json
+
+from evo_django_kits.benchmarks import measure, setup_django
+
+
+def run(rows=2000, page_sizes=(10, 50, 100), repeat=20):
+    setup_django()
+
+    from rest_framework.test import APIRequestFactory
+
+    from evo_django_kits.benchmarks.models import RECORD_FIELDS, BenchRecord, seed_records
+    from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+
+    seed_records(rows)
+    moduler = RestFrameworkModuler()
+    serializer_class = moduler.create_serializer_class(BenchRecord, fields=RECORD_FIELDS + ["company.city.name"])
+    factory = APIRequestFactory()
+
+    results = {}
+    for mode in ("serializer", "fast_read"):
+        viewset_class = moduler.create_viewset_class(
+            BenchRecord, serializer_class, fast_read=mode == "fast_read", ordering=["id"]
+        )
+        view = viewset_class.as_view({"get": "list"})
+        for page_size in page_sizes:
+
+            def list_page():
+                view(factory.get("/records/", {"page_size": page_size})).render()
+
+            seconds = measure(list_page, repeat=repeat)
+            results[f"{mode}.page_size_{page_size}"] = {"seconds": seconds, "rows_per_second": page_size / seconds}
+    return results
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print(json.dumps(run(), indent=2))
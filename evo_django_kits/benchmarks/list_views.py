@@ -0,0 +1,40 @@
+"""List throughput of the generated viewsets at several page sizes, with and without dotted fields"""
+
+import json
+
+from evo_django_kits.benchmarks import measure, setup_django
+
+FIELD_SETS = {
+    "flat": [],
+    "dotted": ["company.name", "company.city.name", "company.city.country.code", "tags.name"],
+}
+
+
+def run(rows=2000, page_sizes=(10, 50, 100), repeat=20):
+    setup_django()
+
+    from rest_framework.test import APIRequestFactory
+
+    from evo_django_kits.benchmarks.models import RECORD_FIELDS, BenchRecord, seed_records
+    from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+
+    seed_records(rows)
+    moduler = RestFrameworkModuler()
+    factory = APIRequestFactory()
+
+    results = {}
+    for field_set, dotted_fields in FIELD_SETS.items():
+        serializer_class = moduler.create_serializer_class(BenchRecord, fields=RECORD_FIELDS + dotted_fields)
+        view = moduler.create_viewset_class(BenchRecord, serializer_class, ordering=["id"]).as_view({"get": "list"})
+        for page_size in page_sizes:
+
+            def list_page():
+                view(factory.get("/records/", {"page_size": page_size})).render()
+
+            seconds = measure(list_page, repeat=repeat)
+            results[f"{field_set}.page_size_{page_size}"] = {"seconds": seconds, "rows_per_second": page_size / seconds}
+    return results
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,89 @@
+import datetime
+import decimal
+
+from django.db import models
+from django.utils import timezone
+
+
+class BenchCountry(models.Model):
+    code = models.CharField(max_length=2)
+    name = models.CharField(max_length=100)
+
+
+class BenchCity(models.Model):
+    name = models.CharField(max_length=100)
+    country = models.ForeignKey(BenchCountry, on_delete=models.CASCADE)
+
+
+class BenchCompany(models.Model):
+    name = models.CharField(max_length=100)
+    city = models.ForeignKey(BenchCity, on_delete=models.CASCADE)
+
+
+class BenchTag(models.Model):
+    name = models.CharField(max_length=50)
+
+
+class BenchRecord(models.Model):
+    """Wide row with a foreign key chain (company -> city -> country) and a many-to-many relation"""
+
+    name = models.CharField(max_length=100)
+    description = models.TextField()
+    code = models.CharField(max_length=20)
+    email = models.EmailField()
+    quantity = models.IntegerField()
+    rank = models.IntegerField()
+    price = models.DecimalField(max_digits=12, decimal_places=2)
+    weight = models.FloatField()
+    active = models.BooleanField(default=True)
+    archived = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    due_date = models.DateField()
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=[("new", "New"), ("done", "Done")], default="new")
+    company = models.ForeignKey(BenchCompany, on_delete=models.CASCADE)
+    tags = models.ManyToManyField(BenchTag, blank=True)
+
+
+RECORD_FIELDS = [field.name for field in BenchRecord._meta.concrete_fields]
+
+
+def seed_records(count, companies=20, tags=5):
+    """Create ``count`` records spread over a few companies, each record tagged with every tag"""
+    BenchRecord.objects.all().delete()
+    country = BenchCountry.objects.create(code="VN", name="Vietnam")
+    city = BenchCity.objects.create(name="Hanoi", country=country)
+    company_objs = BenchCompany.objects.bulk_create(
+        [BenchCompany(name=f"company-{i}", city=city) for i in range(companies)]
+    )
+    tag_objs = BenchTag.objects.bulk_create([BenchTag(name=f"tag-{i}") for i in range(tags)])
+
+    now = timezone.now()
+    records = BenchRecord.objects.bulk_create(
+        [
+            BenchRecord(
+                name=f"record-{i}",
+                description="lorem ipsum " * 20,
+                code=f"R{i:08d}",
+                email=f"record-{i}@example.com",
+                quantity=i,
+                rank=i % 100,
+                price=decimal.Decimal(i) / 100,
+                weight=i / 3,
+                created_at=now - datetime.timedelta(minutes=i),
+                updated_at=now,
+                due_date=now.date(),
+                payload={"index": i, "labels": ["a", "b"]},
+                company=company_objs[i % companies],
+            )
+            for i in range(count)
+        ],
+        batch_size=500,
+    )
+    through = BenchRecord.tags.through
+    through.objects.bulk_create(
+        [through(benchrecord_id=record.pk, benchtag_id=tag.pk) for record in records for tag in tag_objs],
+        batch_size=1000,
+    )
+    return records
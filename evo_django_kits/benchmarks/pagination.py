@@ -0,0 +1,59 @@
+"""Cost of deep pages, OFFSET based page numbers (with each count strategy) vs keyset cursors"""
+
+import base64
+import json
+
+from evo_django_kits.benchmarks import measure, setup_django
+
+
+def encode_cursor(position):
+    """Cursor of EvoCursorPagination pointing after ``position``, without walking the previous pages"""
+    return base64.urlsafe_b64encode(json.dumps([position, False]).encode()).decode()
+
+
+def run(rows=20000, page_size=100, depths=(0.0, 0.5, 0.99), repeat=10):
+    """``depths`` are the positions of the requested pages, as a fraction of the table"""
+    setup_django()
+
+    from rest_framework.test import APIRequestFactory
+
+    from evo_django_kits.benchmarks.models import RECORD_FIELDS, BenchRecord, seed_records
+    from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+
+    records = seed_records(rows, tags=0)
+    moduler = RestFrameworkModuler()
+    serializer_class = moduler.create_serializer_class(BenchRecord, fields=RECORD_FIELDS)
+    factory = APIRequestFactory()
+    pages = rows // page_size
+
+    results = {}
+    for count_strategy in ("exact", "cached", "none"):
+        view = moduler.create_viewset_class(
+            BenchRecord, serializer_class, count_strategy=count_strategy, ordering=["id"]
+        ).as_view({"get": "list"})
+        for depth in depths:
+            page = int(depth * (pages - 1)) + 1
+
+            def page_number_page():
+                view(factory.get("/records/", {"page": page, "page_size": page_size})).render()
+
+            results[f"page_number.{count_strategy}.depth_{depth}"] = {"seconds": measure(page_number_page, repeat)}
+
+    view = moduler.create_viewset_class(BenchRecord, serializer_class, pagination="cursor", ordering=["id"]).as_view(
+        {"get": "list"}
+    )
+    for depth in depths:
+        offset = int(depth * (pages - 1)) * page_size
+        params = {"page_size": page_size}
+        if offset:
+            params["cursor"] = encode_cursor([records[offset - 1].pk])
+
+        def cursor_page():
+            view(factory.get("/records/", params)).render()
+
+        results[f"cursor.depth_{depth}"] = {"seconds": measure(cursor_page, repeat)}
+    return results
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,67 @@
+"""Startup cost of registering models with @rest_api and auto_router, eager vs lazy serializer / viewset construction"""
+
+import json
+import time
+
+from evo_django_kits.benchmarks import setup_django
+
+
+def define_models(prefix, count):
+    """Define ``count`` models of a few fields each, as a project's models modules would on import"""
+    from django.db import models
+
+    from evo_django_kits.benchmarks.models import BenchCompany
+
+    model_classes = []
+    for index in range(count):
+        attrs = {
+            "__module__": "evo_django_kits.benchmarks.models",
+            "name": models.CharField(max_length=100),
+            "code": models.CharField(max_length=20),
+            "quantity": models.IntegerField(),
+            "created_at": models.DateTimeField(),
+            "company": models.ForeignKey(BenchCompany, on_delete=models.CASCADE, related_name="+"),
+        }
+        model_classes.append(type(f"{prefix}Model{index}", (models.Model,), attrs))
+    return model_classes
+
+
+def run(models=500):
+    setup_django()
+
+    from django.test import override_settings
+    from loguru import logger
+    from rest_framework.routers import DefaultRouter
+
+    from evo_django_kits.django_moduler.evo_router import EvoRouter
+    from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler, rest_api
+
+    moduler = RestFrameworkModuler()
+    logger.disable("evo_django_kits")
+    results = {}
+    try:
+        for mode in ("eager", "lazy"):
+            model_classes = define_models(mode.capitalize(), models)
+            options = {"fields": ["id", "name", "code", "quantity", "created_at", "company", "company.name"]}
+            with override_settings(EVO_LAZY_REGISTRATION=mode == "lazy"):
+                start = time.perf_counter()
+                for model_class in model_classes:
+                    rest_api(search_fields=["name"], ordering=["id"], **options)(model_class)
+                results[f"{mode}.register_seconds"] = time.perf_counter() - start
+
+            # What lazy registrations pay later, once, when the URLs are loaded
+            start = time.perf_counter()
+            moduler.materialize()
+            results[f"{mode}.materialize_seconds"] = time.perf_counter() - start
+
+            # Route discovery plus the routing of the registrations on a fresh router
+            start = time.perf_counter()
+            EvoRouter(router=DefaultRouter()).auto_router()
+            results[f"{mode}.auto_router_seconds"] = time.perf_counter() - start
+    finally:
+        logger.enable("evo_django_kits")
+    return results
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,45 @@
+"""Encode throughput of the JSON / MessagePack renderers on list pages of serialized rows and raw .values() rows"""
+
+import json
+
+from evo_django_kits.benchmarks import measure, setup_django
+
+
+def run(rows=100, repeat=50):
+    setup_django()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from evo_django_kits.benchmarks.models import RECORD_FIELDS, BenchRecord, seed_records
+    from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+    from evo_django_kits.entities.renderers import EvoJSONRenderer, EvoMessagePackRenderer, msgpack
+
+    seed_records(rows)
+    serializer_class = RestFrameworkModuler().create_serializer_class(BenchRecord, fields=RECORD_FIELDS)
+    queryset = BenchRecord.objects.order_by("id")[:rows]
+    # Pages in the {message, data} envelope of EvoResponse, the .values() rows hold Decimals and datetimes
+    payloads = {
+        "serialized": serializer_class(queryset, many=True).data,
+        "values": list(queryset.values(*RECORD_FIELDS)),
+    }
+
+    renderers = {"drf_json": JSONRenderer(), "evo_json": EvoJSONRenderer()}
+    if msgpack is not None:
+        renderers["msgpack"] = EvoMessagePackRenderer()
+
+    results = {}
+    for payload_name, page in payloads.items():
+        data = {"message": None, "data": {"count": len(page), "results": page}}
+        for renderer_name, renderer in renderers.items():
+            size = len(renderer.render(data))
+            seconds = measure(lambda: renderer.render(data), repeat=repeat)
+            results[f"{payload_name}.{renderer_name}"] = {
+                "seconds": seconds,
+                "rows_per_second": len(page) / seconds,
+                "bytes": size,
+            }
+    return results
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,98 @@
+"""
+Run the benchmark modules together, write their results as JSON and compare them with a saved baseline.
+
+Results files are baselines: save one on the main branch, then run the suite with ``--baseline`` on a change.
+"""
+
+import importlib
+import json
+import platform
+import time
+
+RESULTS_VERSION = 1
+
+# name -> (module, parameters of the quick run)
+SUITES = {
+    "registration": ("evo_django_kits.benchmarks.registration", {"models": 50}),
+    "list_views": ("evo_django_kits.benchmarks.list_views", {"rows": 500, "repeat": 5}),
+    "fast_read": ("evo_django_kits.benchmarks.fast_read", {"rows": 500, "repeat": 5}),
+    "renderers": ("evo_django_kits.benchmarks.renderers", {"rows": 100, "repeat": 5}),
+    "pagination": ("evo_django_kits.benchmarks.pagination", {"rows": 2000, "repeat": 3}),
+    "bulk_delete": ("evo_django_kits.benchmarks.bulk_delete", {"sizes": (1000, 10000), "repeat": 1}),
+    "url_resolution": ("evo_django_kits.benchmarks.url_resolution", {"resources": (50, 400), "resolves": 20}),
+    "async_views": ("evo_django_kits.benchmarks.async_views", {"concurrency": (1, 10), "requests": 50}),
+}
+
+
+def run_suites(names=None, quick=False):
+    """Run the named benchmarks (all by default), ``quick`` runs them on smaller data sets"""
+    import django
+
+    names = names or list(SUITES)
+    unknown = [name for name in names if name not in SUITES]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks {unknown}, expected some of {list(SUITES)}")
+
+    suites = {}
+    for name in names:
+        module_name, quick_params = SUITES[name]
+        params = quick_params if quick else {}
+        start = time.perf_counter()
+        results = importlib.import_module(module_name).run(**params)
+        suites[name] = {"params": params, "seconds": time.perf_counter() - start, "results": results}
+    return {
+        "version": RESULTS_VERSION,
+        "quick": quick,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "suites": suites,
+    }
+
+
+def flatten_metrics(results, prefix=""):
+    """``{"a": {"b": 1}}`` -> ``{"a.b": 1}``"""
+    metrics = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten_metrics(value, f"{name}."))
+        elif isinstance(value, (int, float)):
+            metrics[name] = value
+    return metrics
+
+
+def compare(current, baseline, threshold=0.1):
+    """
+    Compare the timings (metrics ending with "seconds", lower is better) of two results files.
+    Returns ``(name, baseline, current, ratio)`` rows sorted by ratio, and the names of those slower than the
+    baseline by more than ``threshold`` (0.1 = 10%). Metrics missing from either side are skipped.
+    """
+    rows = []
+    regressions = []
+    for suite_name, suite in current["suites"].items():
+        if suite_name not in baseline["suites"]:
+            continue
+        before = flatten_metrics(baseline["suites"][suite_name]["results"], f"{suite_name}.")
+        after = flatten_metrics(suite["results"], f"{suite_name}.")
+        for name, value in after.items():
+            if not name.endswith("seconds") or not before.get(name):
+                continue
+            ratio = value / before[name]
+            rows.append((name, before[name], value, ratio))
+            if ratio > 1 + threshold:
+                regressions.append(name)
+    rows.sort(key=lambda row: row[3], reverse=True)
+    return rows, regressions
+
+
+def load_results(path):
+    with open(path) as results_file:
+        results = json.load(results_file)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path} is not a version {RESULTS_VERSION} benchmark results file")
+    return results
+
+
+def save_results(path, results):
+    with open(path, "w") as results_file:
+        json.dump(results, results_file, indent=2)
@@ -0,0 +1,66 @@
+"""URL resolution time of the linear and indexed dispatch as the number of registered resources grows"""
+
+import json
+
+from evo_django_kits.benchmarks import measure, setup_django
+
+
+def run(resources=(50, 200, 400), resolves=200, repeat=5):
+    setup_django()
+
+    from django.urls import URLResolver
+    from django.urls.resolvers import RoutePattern
+    from rest_framework import viewsets
+    from rest_framework.decorators import action
+    from rest_framework.routers import DefaultRouter
+
+    from evo_django_kits.django_moduler.indexed_resolver import IndexedURLResolver
+
+    class ResourceViewSet(viewsets.ViewSet):
+        """The routes of a generated viewset: list, detail and extra actions"""
+
+        def list(self, request):
+            pass
+
+        def retrieve(self, request, pk=None):
+            pass
+
+        @action(detail=False, methods=["post"])
+        def bulk_create(self, request):
+            pass
+
+        @action(detail=False, methods=["delete"])
+        def bulk_delete(self, request):
+            pass
+
+        @action(detail=False, methods=["get"])
+        def export(self, request):
+            pass
+
+    results = {}
+    for count in resources:
+        router = DefaultRouter()
+        for index in range(count):
+            router.register(f"resource-{index}", ResourceViewSet, basename=f"resource-{index}")
+        urlpatterns = router.urls
+        # The detail route of the last registered resource, the worst case of the linear dispatch
+        path = f"api/resource-{count - 1}/42/"
+        for mode, resolver_class in (("linear", URLResolver), ("indexed", IndexedURLResolver)):
+            resolver = resolver_class(RoutePattern("api/"), urlpatterns)
+            resolver.resolve(path)
+
+            def resolve():
+                for _ in range(resolves):
+                    resolver.resolve(path)
+
+            seconds = measure(resolve, repeat=repeat)
+            results[f"{mode}.resources_{count}"] = {
+                "seconds": seconds,
+                "resolve_seconds": seconds / resolves,
+                "patterns": len(urlpatterns),
+            }
+    return results
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print(json.dumps(run(), indent=2))
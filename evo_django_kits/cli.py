@@ -1,28 +1,73 @@
 """CLI interface for evo_django_kits project.
 
-Be creative! do whatever you want!
-
-- Install click or typer and create a CLI app
-- Use builtin argparse
-- Start a web application
-- Import things from your .base module
+$ evo_django_kits bench                                  # run every benchmark
+$ evo_django_kits bench --quick --only list_views        # smaller data sets, one benchmark
+$ evo_django_kits bench --output baseline.json           # save the results
+$ evo_django_kits bench --baseline baseline.json         # fail on timings 10% slower than the baseline
 """
 
+import argparse
+import sys
+
+
+def get_parser():
+    from evo_django_kits.benchmarks.suite import SUITES
+
+    parser = argparse.ArgumentParser(prog="evo_django_kits")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    bench = subparsers.add_parser("bench", help="Run the offline benchmarks (in-memory SQLite, synthetic models)")
+    bench.add_argument("--only", action="append", choices=list(SUITES), help="Benchmark to run, can be repeated")
+    bench.add_argument("--quick", action="store_true", help="Run on smaller data sets")
+    bench.add_argument("--output", help="Write the results as JSON to this file")
+    bench.add_argument("--baseline", help="Results file to compare with")
+    bench.add_argument(
+        "--threshold", type=float, default=0.1, help="Slowdown ratio counted as a regression (default: 0.1, 10%%)"
+    )
+    return parser
+
+
+def bench(args):
+    from evo_django_kits.benchmarks.suite import compare, load_results, run_suites, save_results
 
-def main():  # pragma: no cover
+    baseline = load_results(args.baseline) if args.baseline else None
+    results = run_suites(args.only, quick=args.quick)
+    if args.output:
+        save_results(args.output, results)
+
+    for name, suite in results["suites"].items():
+        print(f"{name} ({suite['seconds']:.1f}s)")
+        for metric, value in suite["results"].items():
+            seconds = value.get("seconds") if isinstance(value, dict) else value
+            print(f"  {metric:<45} {seconds * 1000:>10.2f}ms")
+
+    if baseline is None:
+        return 0
+    if baseline.get("quick") != results["quick"]:
+        print("Warning: the baseline and the results were not run with the same --quick option")
+
+    rows, regressions = compare(results, baseline, threshold=args.threshold)
+    print(f"\n{'metric':<60} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, before, after, ratio in rows:
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<60} {before * 1000:>8.2f}ms {after * 1000:>8.2f}ms {ratio - 1:>+8.1%}{flag}")
+    if regressions:
+        print(f"\n{len(regressions)} timings regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main(argv=None):  # pragma: no cover
     """
     The main function executes on commands:
     `python -m evo_django_kits` and `$ evo_django_kits `.
+    Returns the exit code.
+    """
+    args = get_parser().parse_args(argv)
+    if args.command == "bench":
+        return bench(args)
+    return 0
 
-    This is your program's entry point.
 
-    You can change this function to do whatever you want.
-    Examples:
-        * Run a test suite
-        * Run a server
-        * Do some other stuff
-        * Run a command line application (Click, Typer, ArgParse)
-        * List all available tasks
-        * Run an application (Flask, FastAPI, Django, etc.)
-    """
-    print("This will do something")
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
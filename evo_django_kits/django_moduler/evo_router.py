@@ -1,20 +1,44 @@
-import importlib.util
-
+import importlib
+import json
+import os
+import time
 
+from django.apps import apps
 from django.conf import settings as django_settings
-from django.urls import include, path
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import URLResolver, include, path
+from django.urls.resolvers import RoutePattern
 from loguru import logger
 from rest_framework.routers import BaseRouter
+
+from evo_django_kits.entities.batch_view import BatchView
+
+from .indexed_resolver import IndexedURLResolver
 from .rest_framework import RestFrameworkModuler
 
+MANIFEST_VERSION = 1
+
 
 class EvoRouter:
+    """
+    Collects the DRF routers of the installed apps and the models registered with ``@rest_api`` into one router.
+
+    Route modules are found with ``settings.EVO_ROUTE_DISCOVERY``:
+
+    - "scan" (default): ``<app>.urls`` is imported for every installed app
+    - "marker": only apps declaring ``evo_routes`` on their package or AppConfig are imported,
+      ``evo_routes = True`` for ``<app>.urls``, or module paths (relative ones like ".api.urls" start with a dot)
+
+    With ``settings.EVO_ROUTE_MANIFEST`` set to a file path, the discovered route modules are persisted as JSON
+    and later workers import them directly instead of running discovery again. Delete the file (or call
+    ``auto_router(refresh_manifest=True)``) after adding an app.
+    """
 
     __default_router = None
 
-    def __init__(self, app_prefix=None):
+    def __init__(self, app_prefix=None, router=None):
         self.app_prefix = app_prefix
-        self.main_router = self.get_default_router()
+        self.main_router = router if router is not None else self.get_default_router()
         self.routers = [self.main_router]
 
     def get_default_router(self):
@@ -26,59 +50,159 @@ class EvoRouter:
 
     def extend_router(self, app_router):
         """
-        Extends the main router with routes from an app router
+        Extends the main router with routes from an app router, routes already registered are skipped
         """
+        registered = {(prefix, basename): viewset for prefix, viewset, basename in self.main_router.registry}
+        added = 0
         for prefix, viewset, basename in app_router.registry:
+            existing = registered.get((prefix, basename))
+            if existing is not None:
+                if existing is not viewset:
+                    logger.warning(
+                        f"Route '{prefix}' is already registered with {existing.__name__}, skipping {viewset.__name__}"
+                    )
+                continue
             self.main_router.register(prefix=prefix, viewset=viewset, basename=basename)
+            registered[(prefix, basename)] = viewset
+            added += 1
+        return added
 
-    def auto_router(self):
-        INSTALLED_APPS = django_settings.INSTALLED_APPS
-        IS_DEBUG = django_settings.DEBUG
+    def get_app_configs(self):
+        app_configs = apps.get_app_configs()
         if self.app_prefix:
-            INSTALLED_APPS = [app for app in INSTALLED_APPS if app.startswith(self.app_prefix)]
-
-        # Collect router registrations
-        registered_routers = []
-
-        for app in INSTALLED_APPS:
+            app_configs = [app_config for app_config in app_configs if app_config.name.startswith(self.app_prefix)]
+        return app_configs
+
+    def get_routes_declaration(self, app_config):
+        """The ``evo_routes`` of an AppConfig or app package, None when the app doesn't declare any"""
+        routes = getattr(app_config, "evo_routes", None)
+        if routes is None:
+            routes = getattr(app_config.module, "evo_routes", None)
+        return routes
+
+    def get_route_module_names(self, app_config, routes):
+        if routes is None or routes is True:
+            return [f"{app_config.name}.urls"]
+        if isinstance(routes, str):
+            routes = [routes]
+        return [f"{app_config.name}{name}" if name.startswith(".") else name for name in routes]
+
+    def import_route_module(self, module_name, declared):
+        try:
+            return importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            # Scanned apps without a urls module are expected
+            if e.name != module_name or declared:
+                raise e
+        except (ImportError, AttributeError) as e:
+            if declared or django_settings.DEBUG:
+                raise e
+        return None
+
+    def discover_routes(self):
+        """Import the route modules of the installed apps, returning the manifest entries of those with routers"""
+        discovery = getattr(django_settings, "EVO_ROUTE_DISCOVERY", "scan")
+        if discovery not in ("scan", "marker"):
+            raise ImproperlyConfigured(f"Unknown EVO_ROUTE_DISCOVERY '{discovery}', expected 'scan' or 'marker'")
+
+        entries = []
+        for app_config in self.get_app_configs():
+            routes = self.get_routes_declaration(app_config)
+            if routes is None and discovery == "marker":
+                continue
+            started = time.perf_counter()
+            for module_name in self.get_route_module_names(app_config, routes):
+                module = self.import_route_module(module_name, declared=routes is not None)
+                if module is None:
+                    continue
+                routers = [name for name, value in vars(module).items() if isinstance(value, BaseRouter)]
+                if routers:
+                    entries.append({"app": app_config.name, "module": module_name, "routers": routers})
+            logger.debug(f"Route discovery for {app_config.name} took {(time.perf_counter() - started) * 1000:.1f}ms")
+        return entries
+
+    def load_manifest(self, manifest_path):
+        """Route entries persisted by a previous discovery, None when missing or outdated"""
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest.get("version") != MANIFEST_VERSION:
+            return None
+        return manifest["routes"]
+
+    def save_manifest(self, manifest_path, entries):
+        # Written to a temporary file then renamed, workers starting concurrently never read a partial manifest
+        temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as manifest_file:
+            json.dump({"version": MANIFEST_VERSION, "routes": entries}, manifest_file, indent=2)
+        os.replace(temp_path, manifest_path)
+
+    def register_routes(self, entries):
+        """Extend the main router with the routers of manifest entries, returning False when an entry is stale"""
+        for entry in entries:
+            started = time.perf_counter()
             try:
-                urls_module = importlib.import_module(f"{app}.urls")
-                attrs = dir(urls_module)
-                for attr in attrs:
-                    attr_obj = getattr(urls_module, attr)
-                    if isinstance(attr_obj, BaseRouter):
-                        app_router = urls_module.router
-                        registered_routers.append((app, attr))
-                        self.extend_router(app_router)
-
-            except ModuleNotFoundError as e:
-                if e.name != f"{app}.urls":
-                    raise e
-
-            except ImportError as e:
-                if IS_DEBUG:
-                    raise e
-            except AttributeError as e:
-                if IS_DEBUG:
-                    raise e
-
-        # Print registration summary as a table
-        if registered_routers:
-            print("\nAuto-registered Routers:")
-            print("=" * 50)
-            print(f"{'App':<30} {'Router':<20}")
-            print("-" * 50)
-            for app, router_name in registered_routers:
-                print(f"\033[94m{app:<30}\033[0m {router_name:<20}")
-            print("=" * 50 + "\n")
-
-        self.extend_router(RestFrameworkModuler().router)
-
+                module = importlib.import_module(entry["module"])
+                app_routers = [getattr(module, name) for name in entry["routers"]]
+            except (ImportError, AttributeError) as e:
+                logger.warning(f"Stale route manifest entry {entry}: {e}")
+                return False
+            added = sum(self.extend_router(app_router) for app_router in app_routers)
+            logger.debug(
+                f"Routes of {entry['app']} ({entry['module']}: {', '.join(entry['routers'])}) registered "
+                f"in {(time.perf_counter() - started) * 1000:.1f}ms, {added} new"
+            )
+        return True
+
+    def auto_router(self, refresh_manifest=False):
+        started = time.perf_counter()
+        manifest_path = getattr(django_settings, "EVO_ROUTE_MANIFEST", None)
+
+        entries = None
+        if manifest_path and not refresh_manifest:
+            entries = self.load_manifest(manifest_path)
+        if entries is None or not self.register_routes(entries):
+            entries = self.discover_routes()
+            self.register_routes(entries)
+            if manifest_path:
+                self.save_manifest(manifest_path, entries)
+
+        # Builds the serializer / viewset classes of lazy @rest_api registrations
+        self.extend_router(RestFrameworkModuler().materialize())
+
+        logger.info(
+            f"Auto-registered {len(entries)} app routers and {len(self.main_router.registry)} routes "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
         return self.main_router
 
-    def get_paths(self, base_url: str = ""):
-        # Since we've consolidated all routes into main_router, we only need to return its paths
-        return [path(base_url, include(self.main_router.urls))]
+    def get_resolver_class(self):
+        dispatch = getattr(django_settings, "EVO_URL_DISPATCH", "linear")
+        if dispatch not in ("linear", "indexed"):
+            raise ImproperlyConfigured(f"Unknown EVO_URL_DISPATCH '{dispatch}', expected 'linear' or 'indexed'")
+        return IndexedURLResolver if dispatch == "indexed" else URLResolver
+
+    def get_paths(self, base_url: str = "", batch: bool = False):
+        """
+        Since we've consolidated all routes into main_router, we only need to return its paths.
+        With ``batch``, ``<base_url>batch/`` runs many requests of these routes in one call (see BatchView).
+
+        With ``settings.EVO_URL_DISPATCH = "indexed"``, the routes are indexed by resource name and a request
+        is only matched against the routes of its resource (see IndexedURLResolver), for routers with
+        hundreds of resources. The default "linear" tries every route in order.
+        """
+        resolver_class = self.get_resolver_class()
+        urlpatterns = self.main_router.urls
+        paths = []
+        if batch:
+            resolver = resolver_class(RoutePattern(""), urlpatterns)
+            paths.append(
+                path(f"{base_url}batch/", BatchView.as_view(resolver=resolver, prefix=base_url), name="evo-batch")
+            )
+        if resolver_class is IndexedURLResolver:
+            return paths + [IndexedURLResolver(RoutePattern(base_url), urlpatterns)]
+        return paths + [path(base_url, include(urlpatterns))]
 
 
 def get_router():
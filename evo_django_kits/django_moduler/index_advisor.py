@@ -0,0 +1,199 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, models
+from django.db.models.constants import LOOKUP_SEP
+
+# Rows per representative list query, the default page size
+EXPLAIN_LIMIT = 10
+
+
+class AccessPattern:
+    """
+    Columns a generated endpoint filters or orders a model's table on, ``fields`` in index order
+    (``-name`` for a descending column). Patterns with a ``note`` can't be served by a btree index.
+    """
+
+    def __init__(self, kind, name, fields, note=None):
+        self.kind = kind
+        self.name = name
+        self.fields = list(fields)
+        self.note = note
+        self.covered_by = None
+
+    def __repr__(self):
+        return f"AccessPattern({self.kind} {self.name}: {self.fields})"
+
+    def get_columns(self, model_class):
+        return [get_local_field(model_class, field.lstrip("-")).column for field in self.fields]
+
+
+def get_local_field(model_class, name):
+    """The concrete field of the model's table a lookup reads, None for lookups across relations"""
+    name = model_class._meta.pk.name if name == "pk" else name
+    if LOOKUP_SEP in name:
+        return None
+    try:
+        field = model_class._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    return field if field.concrete and not field.many_to_many else None
+
+
+def strip_primary_key(model_class, fields):
+    """Trailing primary key columns are the tie-breaker of the ordering, every table row is unique by them"""
+    fields = list(fields)
+    while fields and get_local_field(model_class, fields[-1].lstrip("-")) is model_class._meta.pk:
+        fields.pop()
+    return fields
+
+
+def get_access_patterns(model_class, options):
+    """Access patterns declared by the ordering, ordering_fields, filterset_fields, changes and search_fields options"""
+    patterns = []
+    ordering = options.get("ordering") or []
+    ordering = [ordering] if isinstance(ordering, str) else list(ordering)
+    default_ordering = [field for field in ordering if get_local_field(model_class, field.lstrip("-"))]
+    if len(default_ordering) != len(ordering):
+        patterns.append(AccessPattern("ordering", ",".join(ordering), [], note="orders on a related table"))
+    elif ordering:
+        patterns.append(AccessPattern("ordering", ",".join(ordering), strip_primary_key(model_class, default_ordering)))
+
+    for name in options.get("ordering_fields") or []:
+        if name == "__all__":
+            continue
+        if get_local_field(model_class, name) is None:
+            patterns.append(AccessPattern("order", name, [], note="orders on a related table"))
+        else:
+            patterns.append(AccessPattern("order", name, strip_primary_key(model_class, [name])))
+
+    filter_fields = options.get("filterset_fields") or []
+    for name in filter_fields if not isinstance(filter_fields, dict) else filter_fields.keys():
+        if get_local_field(model_class, name) is None:
+            patterns.append(AccessPattern("filter", name, [], note="filters on a related table"))
+            continue
+        # Filtered list pages are sorted by the default ordering, one composite index serves both
+        fields = [name] + [field for field in default_ordering if field.lstrip("-") != name]
+        patterns.append(AccessPattern("filter", name, strip_primary_key(model_class, fields)))
+
+    # The changes feed of an updated-at field reads the rows changed after a cursor, in (field, pk) order
+    changes = options.get("changes")
+    if isinstance(changes, str) and get_local_field(model_class, changes) is not None:
+        patterns.append(AccessPattern("changes", changes, [changes]))
+
+    for name in options.get("search_fields") or []:
+        lookup, field_name = ("istartswith", name[1:]) if name.startswith("^") else ("icontains", name.lstrip("=@$"))
+        if name.startswith("="):
+            lookup = "iexact"
+        if options.get("search_index"):
+            patterns.append(AccessPattern("search", name, [], note="served by the full-text search_index"))
+        elif get_local_field(model_class, field_name) is None:
+            patterns.append(AccessPattern("search", name, [], note="searches a related table"))
+        elif lookup == "icontains":
+            patterns.append(
+                AccessPattern("search", name, [], note="icontains can't use an index, consider search_index=True")
+            )
+        else:
+            patterns.append(AccessPattern("search", name, [field_name]))
+    return patterns
+
+
+def get_table_indexes(model_class, using):
+    """Column lists of the indexes of the model's table, read from the database"""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, model_class._meta.db_table)
+    return {
+        name: constraint["columns"]
+        for name, constraint in constraints.items()
+        if (constraint["index"] or constraint["unique"] or constraint["primary_key"]) and constraint["columns"]
+    }
+
+
+def check_patterns(model_class, patterns, using):
+    """Set ``covered_by`` on the patterns whose columns are the leftmost columns of an existing index"""
+    indexes = get_table_indexes(model_class, using)
+    for pattern in patterns:
+        if not pattern.fields:
+            pattern.covered_by = "primary key" if pattern.note is None else None
+            continue
+        columns = pattern.get_columns(model_class)
+        for name, index_columns in indexes.items():
+            if index_columns[: len(columns)] == columns:
+                pattern.covered_by = name
+                break
+    return patterns
+
+
+def get_missing_indexes(model_class, patterns):
+    """Indexes of the uncovered patterns, without those that are the leftmost columns of another one"""
+    missing = []
+    for pattern in patterns:
+        if pattern.covered_by is None and pattern.note is None and pattern.fields not in missing:
+            missing.append(pattern.fields)
+    missing = [
+        fields for fields in missing if not any(other != fields and other[: len(fields)] == fields for other in missing)
+    ]
+    indexes = []
+    for fields in missing:
+        index = models.Index(fields=fields)
+        index.set_name_with_model(model_class)
+        indexes.append(index)
+    return indexes
+
+
+def get_sample_value(model_class, field, using):
+    return (
+        model_class._base_manager.using(using)
+        .filter(**{f"{field.attname}__isnull": False})
+        .values_list(field.attname, flat=True)
+        .first()
+    )
+
+
+def get_representative_queries(model_class, options, using):
+    """The querysets of the default list, each filter and each ordering of a generated endpoint, by label"""
+    queryset = model_class._base_manager.using(using).all()
+    ordering = options.get("ordering") or []
+    ordering = [ordering] if isinstance(ordering, str) else list(ordering)
+    queries = {"list": queryset.order_by(*ordering)[:EXPLAIN_LIMIT]}
+
+    filter_fields = options.get("filterset_fields") or []
+    for name in filter_fields if not isinstance(filter_fields, dict) else filter_fields.keys():
+        field = get_local_field(model_class, name)
+        if field is None:
+            continue
+        value = get_sample_value(model_class, field, using)
+        # Empty tables have nothing to filter on
+        if value is not None:
+            queries[f"filter {name}"] = queryset.filter(**{field.attname: value}).order_by(*ordering)[:EXPLAIN_LIMIT]
+
+    for name in options.get("ordering_fields") or []:
+        if name != "__all__":
+            queries[f"order {name}"] = queryset.order_by(name)[:EXPLAIN_LIMIT]
+    return queries
+
+
+def get_plan_warnings(plan, vendor, filtered=False):
+    """
+    Full scans and sorts spotted in an EXPLAIN output. Scans of unfiltered queries read the table in
+    index order and stop at the LIMIT, they only matter when the rows are sorted afterwards.
+    """
+    scan = sort = False
+    for line in plan.splitlines():
+        if vendor == "sqlite":
+            scan = scan or ("SCAN " in line and " USING " not in line)
+            sort = sort or "TEMP B-TREE" in line
+        elif vendor == "postgresql":
+            scan = scan or "Seq Scan" in line
+            sort = sort or line.strip().lstrip("-> ").startswith("Sort")
+    warnings = ["full scan"] if scan and (filtered or sort) else []
+    return warnings + (["sort"] if sort else [])
+
+
+def explain_queries(model_class, options, using):
+    """``(label, plan, warnings)`` of the representative queries"""
+    vendor = connections[using].vendor
+    results = []
+    for label, queryset in get_representative_queries(model_class, options, using).items():
+        plan = queryset.explain()
+        results.append((label, plan, get_plan_warnings(plan, vendor, filtered=label.startswith("filter"))))
+    return results
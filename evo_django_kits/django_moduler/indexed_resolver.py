@@ -0,0 +1,88 @@
+import re
+
+from django.urls import Resolver404, URLResolver
+from django.utils.functional import cached_property
+
+# Characters of a path segment key: "students", "unplanned-students"...
+SEGMENT = re.compile(r"[\w\-~]*")
+# Regex tokens ending the literal segment of a pattern, the path segment ends at the same position
+SEGMENT_ENDS = ("/", "\\/", "\\.")
+PATTERN_ENDS = ("$", "\\Z")
+QUANTIFIERS = ("?", "*", "+", "{")
+
+
+def get_path_segment(path):
+    return SEGMENT.match(path).group()
+
+
+def get_pattern_segment(pattern):
+    """
+    The literal first segment every path matched by a URL pattern starts with, ``"students"`` for DRF's
+    ``^students/(?P<pk>[^/.]+)/$``. None when the pattern can match paths of several segments (the API root,
+    a group or an alternation at the start, an unanchored regex...).
+    """
+    regex = getattr(pattern.pattern, "_regex", None)
+    if not isinstance(regex, str) or not regex.startswith("^") or "|" in regex:
+        return None
+
+    segment = []
+    index = 1
+    while index < len(regex):
+        char = regex[index]
+        # RoutePattern escapes its literal text, "unplanned\-students"
+        if char == "\\" and regex[index + 1 : index + 2] in ("-", "~"):
+            char = regex[index + 1]
+            index += 1
+        elif not SEGMENT.fullmatch(char):
+            break
+        segment.append(char)
+        index += 1
+
+    rest = regex[index:]
+    if not segment:
+        return None
+    if rest in PATTERN_ENDS:
+        return "".join(segment)
+    end = next((end for end in SEGMENT_ENDS if rest.startswith(end)), None)
+    if end is None:
+        return None
+    # An optional separator, "students/?$", only ends the segment when nothing can follow it
+    if rest[len(end) : len(end) + 1] in QUANTIFIERS and rest[len(end) + 1 :] not in PATTERN_ENDS:
+        return None
+    return "".join(segment)
+
+
+class IndexedURLResolver(URLResolver):
+    """
+    URLResolver indexing its patterns by the literal first segment of their paths. A request is only matched
+    against the patterns of its segment (a DRF resource's list, detail and extra action routes), plus the
+    patterns without a literal segment, instead of every pattern in order. Patterns are tried in their
+    original order, so the first match is the one of URLResolver. Reversing uses every pattern as usual.
+    """
+
+    @cached_property
+    def segment_resolvers(self):
+        """A URLResolver per segment holding its candidate patterns, and one for the other segments"""
+        segments = {}
+        unindexed = []
+        for position, pattern in enumerate(self.url_patterns):
+            segment = get_pattern_segment(pattern)
+            if segment is None:
+                unindexed.append((position, pattern))
+            else:
+                segments.setdefault(segment, []).append((position, pattern))
+
+        def get_resolver(patterns):
+            url_patterns = [pattern for _, pattern in sorted(patterns, key=lambda item: item[0])]
+            return URLResolver(self.pattern, url_patterns, self.default_kwargs, self.app_name, self.namespace)
+
+        resolvers = {segment: get_resolver(patterns + unindexed) for segment, patterns in segments.items()}
+        return resolvers, get_resolver(unindexed)
+
+    def resolve(self, path):
+        path = str(path)
+        match = self.pattern.match(path)
+        if not match:
+            raise Resolver404({"path": path})
+        resolvers, default_resolver = self.segment_resolvers
+        return resolvers.get(get_path_segment(match[0]), default_resolver).resolve(path)
@@ -0,0 +1,76 @@
+import threading
+from collections.abc import Mapping
+
+
+class ModelRegistration(Mapping):
+    """
+    Record of a ``@rest_api`` registration. The serializer and viewset classes are built on first access,
+    once, whatever the number of threads asking for them.
+
+    A read only mapping of the former registry dicts' keys (``registration["viewset_class"]``, ``get``,
+    ``items``...), reading the classes builds them.
+    """
+
+    KEYS = ("serializer_class", "viewset_class", "resource_name", "options")
+
+    def __init__(self, moduler, model_class, resource_name, options, abstract_viewset_class=None, mixins=None):
+        self.moduler = moduler
+        self.model_class = model_class
+        self.resource_name = resource_name
+        self.options = options
+        self.abstract_viewset_class = abstract_viewset_class
+        self.mixins = mixins
+        # Set once the viewset is registered with the moduler router
+        self.routed = False
+        self._serializer_class = options.get("serializer_class")
+        self._viewset_class = options.get("viewset_class")
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        state = "materialized" if self.is_materialized else "pending"
+        return f"<ModelRegistration {self.model_class.__name__} '{self.resource_name}' ({state})>"
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __contains__(self, key):
+        # Without building the classes like Mapping.__contains__ would
+        return key in self.KEYS
+
+    # A registration is equal to itself only, comparing items would build the classes
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    @property
+    def is_materialized(self):
+        return self._viewset_class is not None
+
+    @property
+    def serializer_class(self):
+        if self._serializer_class is None:
+            with self._lock:
+                if self._serializer_class is None:
+                    self._serializer_class = self.moduler.create_serializer_class(self.model_class, **self.options)
+        return self._serializer_class
+
+    @property
+    def viewset_class(self):
+        if self._viewset_class is None:
+            with self._lock:
+                if self._viewset_class is None:
+                    self._viewset_class = self.moduler.create_viewset_class(
+                        self.model_class,
+                        self.serializer_class,
+                        abstract_viewset_class=self.abstract_viewset_class,
+                        mixins=self.mixins,
+                        **self.options,
+                    )
+        return self._viewset_class
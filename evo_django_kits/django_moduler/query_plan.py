@@ -0,0 +1,266 @@
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import F
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+
+class QueryPlan:
+    """Relation loading plan (select_related / prefetch_related / annotations) applied to a viewset queryset"""
+
+    def __init__(self, select_related=None, prefetch_related=None, annotations=None, fields=None):
+        self.select_related = _unique(select_related or [])
+        self.prefetch_related = _unique(prefetch_related or [])
+        self.annotations = dict(annotations or {})
+        # Per serializer field plans, used to narrow the plan to a subset of fields
+        self.fields = fields or {}
+
+    def __bool__(self):
+        return bool(self.select_related or self.prefetch_related or self.annotations)
+
+    def __repr__(self):
+        return (
+            f"QueryPlan(select_related={self.select_related}, prefetch_related={self.prefetch_related}, "
+            f"annotations={list(self.annotations)})"
+        )
+
+    @classmethod
+    def merge(cls, plans, fields=None):
+        """Combine several plans into one"""
+        select_related = []
+        prefetch_related = []
+        annotations = {}
+        for plan in plans:
+            select_related.extend(plan.select_related)
+            prefetch_related.extend(plan.prefetch_related)
+            annotations.update(plan.annotations)
+        return cls(
+            select_related=select_related, prefetch_related=prefetch_related, annotations=annotations, fields=fields
+        )
+
+    def narrow(self, field_names):
+        """Plan of a subset of the serializer fields, the whole plan when it has no per field plans"""
+        if not self.fields:
+            return self
+        fields = {name: self.fields[name] for name in field_names if name in self.fields}
+        return QueryPlan.merge(fields.values(), fields=fields)
+
+    def apply(self, queryset):
+        """Apply the plan to a queryset"""
+        if self.annotations:
+            queryset = queryset.annotate(**self.annotations)
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+
+def _unique(items):
+    return list(dict.fromkeys(items))
+
+
+def resolve_relation_path(model_class, path):
+    """
+    Classify a ``__`` separated attribute path of a model into relation loading lookups.
+
+    Forward foreign keys and one-to-one relations (both directions) are joined with select_related,
+    everything from the first reverse foreign key or many-to-many relation onwards is prefetched.
+    Traversal stops at the first non relational field.
+
+    Returns a ``(select_related, prefetch_related)`` tuple, each item being a lookup or None.
+    Raises FieldDoesNotExist when a part of the path is not a field of the model.
+    """
+    opts = model_class._meta
+    relation_parts = []
+    select_depth = None
+    for part in path.split(LOOKUP_SEP):
+        field = opts.get_field(part)
+        if not field.is_relation:
+            break
+        relation_parts.append(part)
+        is_single = (field.many_to_one or field.one_to_one) and field.related_model is not None
+        # Generic foreign keys can't be joined, they are prefetched like multi valued relations
+        if select_depth is None and not (is_single and (field.concrete or field.one_to_one)):
+            select_depth = len(relation_parts) - 1
+        if field.related_model is None:
+            break
+        opts = field.related_model._meta
+
+    if not relation_parts:
+        return None, None
+    if select_depth is None:
+        return LOOKUP_SEP.join(relation_parts), None
+    select_related = LOOKUP_SEP.join(relation_parts[:select_depth]) or None
+    return select_related, LOOKUP_SEP.join(relation_parts)
+
+
+def build_dotted_field_plan(model_class, path):
+    """
+    Plan of a dotted serializer field such as ``campus.university.country.code``.
+
+    Paths following single valued relations down to a column are annotated with ``F()`` under the
+    serializer field name, so the value comes with the row and no related instance is built. Paths
+    crossing multi valued relations or ending on a relation / property are loaded with select_related
+    or prefetch_related and read from the instances.
+
+    Raises ImproperlyConfigured when the path doesn't exist on the model.
+    """
+    parts = path.split(".")
+    lookup = LOOKUP_SEP.join(parts)
+    relation_lookup = lookup
+    annotate = True
+    opts = model_class._meta
+    for index, part in enumerate(parts):
+        is_last = index == len(parts) - 1
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            # Properties and methods of the last model are still readable from the instance
+            if is_last and hasattr(opts.model, part):
+                annotate = False
+                relation_lookup = LOOKUP_SEP.join(parts[:-1])
+                break
+            raise ImproperlyConfigured(
+                f"Invalid dotted field '{path}' on {model_class.__name__}: {opts.object_name} has no field '{part}'"
+            )
+        if is_last:
+            annotate = annotate and field.concrete and not field.is_relation
+            break
+        if not field.is_relation or field.related_model is None:
+            raise ImproperlyConfigured(
+                f"Invalid dotted field '{path}' on {model_class.__name__}: "
+                f"{opts.object_name}.{part} is not a relation that can be followed"
+            )
+        if not ((field.many_to_one and field.concrete) or field.one_to_one):
+            annotate = False
+        opts = field.related_model._meta
+
+    if annotate:
+        return QueryPlan(annotations={lookup: F(lookup)})
+
+    select_lookup, prefetch_lookup = resolve_relation_path(model_class, relation_lookup)
+    return QueryPlan(
+        select_related=[select_lookup] if select_lookup else [],
+        prefetch_related=[prefetch_lookup] if prefetch_lookup else [],
+    )
+
+
+def get_field_relation_paths(field, prefix=""):
+    """Collect the relation paths a bound serializer field reads while rendering"""
+    if field.write_only or field.source == "*":
+        return []
+
+    source = prefix + LOOKUP_SEP.join(field.source_attrs)
+
+    if isinstance(field, serializers.ListSerializer):
+        return [source] + get_serializer_relation_paths(field.child, prefix=source + LOOKUP_SEP)
+
+    if isinstance(field, serializers.BaseSerializer):
+        return [source] + get_serializer_relation_paths(field, prefix=source + LOOKUP_SEP)
+
+    if isinstance(field, ManyRelatedField):
+        return [source]
+
+    if isinstance(field, RelatedField):
+        # The pk only optimization reads ``<field>_id`` from the row itself
+        if len(field.source_attrs) == 1 and field.use_pk_only_optimization():
+            return []
+        return [source]
+
+    if len(field.source_attrs) > 1:
+        return [source]
+
+    return []
+
+
+def get_serializer_relation_paths(serializer, prefix=""):
+    paths = []
+    for field in serializer.fields.values():
+        paths.extend(get_field_relation_paths(field, prefix=prefix))
+    return paths
+
+
+def build_query_plan(model_class, serializer_class):
+    """
+    Build the relation loading plan of a model serializer.
+
+    Every readable serializer field is inspected (nested serializers, related fields and dotted sources) and its
+    attribute path is resolved against the model ``_meta``. Paths that can't be resolved (properties, methods)
+    are skipped. The dotted fields generated by ``RestFrameworkModuler.create_serializer_class`` are planned by
+    ``build_dotted_field_plan``.
+    """
+    serializer = serializer_class()
+    dotted_fields = getattr(serializer_class, "evo_dotted_fields", {})
+
+    field_plans = {}
+    for field_name, field in serializer.fields.items():
+        if field_name in dotted_fields:
+            field_plans[field_name] = build_dotted_field_plan(model_class, dotted_fields[field_name])
+            continue
+
+        paths = get_field_relation_paths(field)
+
+        select_related = []
+        prefetch_related = []
+        for path in paths:
+            try:
+                select_lookup, prefetch_lookup = resolve_relation_path(model_class, path)
+            except FieldDoesNotExist:
+                continue
+            if select_lookup:
+                select_related.append(select_lookup)
+            if prefetch_lookup:
+                prefetch_related.append(prefetch_lookup)
+        field_plans[field_name] = QueryPlan(select_related=select_related, prefetch_related=prefetch_related)
+
+    return QueryPlan.merge(field_plans.values(), fields=field_plans)
+
+
+def get_only_fields(model_class, serializer, field_names, query_plan):
+    """
+    Model fields to load with ``.only()`` to render the given serializer fields with the given plan.
+
+    Annotated dotted fields come with the row, the relations of the plan keep their local column.
+    Returns None when a field reads something that can't be traced back to columns
+    (method fields, ``source="*"``, properties...), the queryset must then load every column.
+    """
+    opts = model_class._meta
+    dotted_fields = getattr(serializer, "evo_dotted_fields", {})
+    only_fields = []
+    for field_name in field_names:
+        if field_name in dotted_fields:
+            continue
+        field = serializer.fields[field_name]
+        if field.source == "*" or len(field.source_attrs) != 1:
+            return None
+        try:
+            model_field = opts.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if model_field.concrete and not model_field.many_to_many:
+            only_fields.append(model_field.name)
+
+    for lookup in query_plan.select_related + query_plan.prefetch_related:
+        model_field = opts.get_field(lookup.split(LOOKUP_SEP, 1)[0])
+        if model_field.concrete and not model_field.many_to_many:
+            only_fields.append(model_field.name)
+    return _unique(only_fields)
+
+
+def get_query_plan(query_plan, model_class, serializer_class):
+    """
+    Resolve the ``query_plan`` option of a registration:
+
+    - True: build the plan automatically from the serializer
+    - None / False: no relation loading
+    - dict: explicit ``select_related`` / ``prefetch_related`` lookups
+    - QueryPlan: used as is
+    """
+    if isinstance(query_plan, QueryPlan):
+        return query_plan
+    if isinstance(query_plan, dict):
+        return QueryPlan(**query_plan)
+    if query_plan is True:
+        return build_query_plan(model_class, serializer_class)
+    return QueryPlan()
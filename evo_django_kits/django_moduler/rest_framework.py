@@ -1,9 +1,24 @@
 import importlib
+import threading
 
 from django.conf import settings
-from rest_framework import serializers
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+from loguru import logger
+from rest_framework.filters import SearchFilter
 from rest_framework.routers import DefaultRouter
 
+from evo_django_kits.django_moduler.model_registration import ModelRegistration
+from evo_django_kits.django_moduler.query_plan import build_dotted_field_plan
+from evo_django_kits.entities.changes_feed import register_change_feed
+from evo_django_kits.entities.model_version import track_model_writes, track_related_writes
+from evo_django_kits.entities.filters.search_index_filter import SearchIndexFilter
+from evo_django_kits.entities.pagination import PAGINATION_CLASSES
+from evo_django_kits.entities.response_cache import get_fields_related_paths, get_related_paths
+from evo_django_kits.entities.search_index import register_search_index
+from evo_django_kits.entities.serializers.dotted_path_field import DottedPathField
+from evo_django_kits.entities.serializers.evo_model_serializer import EvoModelSerializer
+
 
 class RestFrameworkModuler:
     """Class that handles registration of Django models with REST framework"""
@@ -15,10 +30,16 @@ class RestFrameworkModuler:
         if cls._instance is None:
             cls._instance = super(RestFrameworkModuler, cls).__new__(cls)
             # Initialize instance attributes
-            cls._instance.router = DefaultRouter()
+            cls._instance._router = DefaultRouter()
             cls._instance.registry = {}
+            cls._instance._materialize_lock = threading.Lock()
         return cls._instance
 
+    @property
+    def router(self):
+        """The router of every registration, lazy registrations are routed on access"""
+        return self.materialize()
+
     def create_serializer_class(self, model_class, **options):
         """Dynamically create a serializer class for a model"""
         # Define Meta class attributes
@@ -26,32 +47,26 @@ class RestFrameworkModuler:
 
         # Process fields
         all_fields = options.get("fields", "__all__")
-        nested_fields = {}
-        transformed_field_names = []
+        # Dotted fields of any depth, keyed by their serializer field name: "campus.name" -> "campus__name"
+        dotted_fields = {}
 
         # If fields is not "__all__", process for nested lookups
         if all_fields != "__all__":
             regular_fields = []
             for field in all_fields:
                 if "." in field:
-                    # This is a nested field
-                    parts = field.split(".", 1)
-                    base_field, nested_attr = parts
-                    if base_field not in nested_fields:
-                        nested_fields[base_field] = []
-                    nested_fields[base_field].append(nested_attr)
-
                     # Ensure the base field is included
+                    base_field = field.split(".", 1)[0]
                     if base_field not in regular_fields:
                         regular_fields.append(base_field)
 
-                    # Store the transformed field name
-                    transformed_field_names.append(field.replace(".", "__"))
-                else:
+                    # Create a valid Python identifier for the serializer field using double underscores
+                    dotted_fields[field.replace(".", "__")] = field
+                elif field not in regular_fields:
                     regular_fields.append(field)
 
             # Include both regular fields and transformed nested fields in Meta.fields
-            meta_attrs["fields"] = regular_fields + transformed_field_names
+            meta_attrs["fields"] = regular_fields + list(dotted_fields)
         else:
             meta_attrs["fields"] = "__all__"
 
@@ -68,32 +83,13 @@ class RestFrameworkModuler:
         # Add any custom serializer fields
         serializer_attrs.update(options.get("serializer_fields", {}))
 
-        # Add method fields for nested attributes
-        for base_field, attrs in nested_fields.items():
-            for attr in attrs:
-                original_field_name = f"{base_field}.{attr}"
-                # Create a valid Python identifier for the serializer field using double underscores
-                safe_field_name = original_field_name.replace(".", "__")
-                method_name = f"get_{safe_field_name}"
-
-                # Create the getter method with a closure that properly captures variables
-                def make_getter(base_field, attr):
-                    def getter(self, obj):
-                        # Navigate through the object relationship
-                        related_obj = getattr(obj, base_field, None)
-                        if related_obj is None:
-                            return None
-                        return getattr(related_obj, attr, None)
-
-                    return getter
-
-                # Add the method to the serializer
-                serializer_attrs[method_name] = make_getter(base_field, attr)
-                # Add the SerializerMethodField with the safe name
-                serializer_attrs[safe_field_name] = serializers.SerializerMethodField(method_name=method_name)
+        # Dotted fields are read from queryset annotations (see query_plan.build_dotted_field_plan)
+        serializer_attrs["evo_dotted_fields"] = dotted_fields
+        for safe_field_name, original_field_name in dotted_fields.items():
+            serializer_attrs[safe_field_name] = DottedPathField(path=original_field_name)
 
         # Create and return the serializer class
-        return type(f"{model_class.__name__}Serializer", (serializers.ModelSerializer,), serializer_attrs)
+        return type(f"{model_class.__name__}Serializer", (EvoModelSerializer,), serializer_attrs)
 
     def get_abstract_viewset_class(self):
         """Get the abstract viewset class from settings or use default"""
@@ -115,6 +111,10 @@ class RestFrameworkModuler:
     def create_viewset_class(self, model_class, serializer_class, abstract_viewset_class=None, mixins=None, **options):
         """Dynamically create a viewset class for a model"""
 
+        if abstract_viewset_class is None and options.get("async_"):
+            from evo_django_kits.entities.async_base_viewset import AsyncBaseViewSet
+
+            abstract_viewset_class = AsyncBaseViewSet
         if abstract_viewset_class is None:
             abstract_viewset_class = self.get_abstract_viewset_class()
         if mixins is None:
@@ -127,6 +127,8 @@ class RestFrameworkModuler:
         viewset_attrs = {
             "queryset": model_class.objects.all(),
             "serializer_class": serializer_class,
+            # Relation loading plan, built from the serializer on first use (see query_plan.py)
+            "query_plan": options.get("query_plan", True),
         }
 
         # Add optional attributes
@@ -134,6 +136,18 @@ class RestFrameworkModuler:
         if search_fields:
             viewset_attrs["search_fields"] = search_fields
 
+        search_index = self.get_search_index(model_class, options)
+        if search_index is not None:
+            viewset_attrs["search_index"] = search_index
+            # ?search= goes to the index, after the ordering so the relevance comes first
+            viewset_attrs["filter_backends"] = [
+                backend for backend in abstract_viewset_class.filter_backends if not issubclass(backend, SearchFilter)
+            ] + [SearchIndexFilter]
+
+        change_feed = self.get_change_feed(model_class, options)
+        if change_feed is not None:
+            viewset_attrs["change_feed"] = change_feed
+
         ordering_fields = options.get("ordering_fields")
         if ordering_fields:
             viewset_attrs["ordering_fields"] = ordering_fields
@@ -147,11 +161,87 @@ class RestFrameworkModuler:
         if filter_fields:
             viewset_attrs["filterset_fields"] = filter_fields
 
+        pagination = options.get("pagination")
+        if pagination:
+            viewset_attrs["pagination_class"] = self.get_pagination_class(pagination)
+
+        for viewset_option in (
+            "count_strategy",
+            "count_cache_timeout",
+            "cache_responses",
+            "cache_timeout",
+            "cache_scope",
+            "fast_read",
+            "export_max_rows",
+            "export_chunk_size",
+            "export_permission_classes",
+            "field_presets",
+            "bulk_max_items",
+            "bulk_batch_size",
+            "bulk_unique_fields",
+            "bulk_delete_chunk_size",
+            "bulk_delete_atomic",
+            "read_replicas",
+            "primary_sticky_seconds",
+            "changes_batch_size",
+            "aggregate_fields",
+            "aggregate_cache_timeout",
+            "aggregate_max_groups",
+            "patch_without_fetch",
+        ):
+            if options.get(viewset_option) is not None:
+                viewset_attrs[viewset_option] = options[viewset_option]
+
+        assert_query_plan = options.get("assert_query_plan")
+        if assert_query_plan is not None:
+            viewset_attrs["assert_query_plan"] = assert_query_plan
+
         # Create the viewset class
         viewset_class = type(f"{model_class.__name__}ViewSet", (DynamicViewSet,), viewset_attrs)
 
         return viewset_class
 
+    def get_search_index(self, model_class, options):
+        """Register the search index of the search_index option: True for the search_fields or a list of fields"""
+        fields = options.get("search_index")
+        if not fields:
+            return None
+        if fields is True:
+            # DRF's lookup prefixes ("^name", "=code"...) don't apply to full-text search
+            fields = [field.lstrip("^=@$") for field in options.get("search_fields") or []]
+        if not fields:
+            raise ImproperlyConfigured(f"search_index=True needs search_fields on {model_class.__name__}")
+        return register_search_index(model_class, fields)
+
+    def get_change_feed(self, model_class, options):
+        """Register the changes feed of the changes option: True for the change log or an updated-at field name"""
+        changes = options.get("changes")
+        if not changes:
+            return None
+        return register_change_feed(model_class, changes)
+
+    def get_related_paths(self, options):
+        """
+        Dotted paths of the relations the serializer of a registration renders, read from the options
+        so the serializer isn't built before the registration is materialized
+        """
+        serializer_class = options.get("serializer_class")
+        if serializer_class is not None:
+            return get_related_paths(serializer_class)
+        fields = options.get("fields", "__all__")
+        paths = [] if fields == "__all__" else [field for field in fields if "." in field]
+        return paths + get_fields_related_paths(options.get("serializer_fields", {}))
+
+    def get_pagination_class(self, pagination):
+        """Resolve the pagination option: "page", "cursor" or a pagination class"""
+        if not isinstance(pagination, str):
+            return pagination
+        if pagination not in PAGINATION_CLASSES:
+            raise ImproperlyConfigured(
+                f"Unknown pagination '{pagination}', expected one of {list(PAGINATION_CLASSES)} or a pagination class"
+            )
+        return PAGINATION_CLASSES[pagination]
+
     def get_resource_name(self, model_class):
         """
         Convert model class name to URL resource name
@@ -180,52 +270,106 @@ class RestFrameworkModuler:
         Args:
             model_class: The Django model class to register
             **options: Additional options for customization
-                - fields: Fields to include in the serializer (default: '__all__')
+                - fields: Fields to include in the serializer (default: '__all__'), dotted paths of any
+                  depth like 'campus.university.name' are rendered as flat read only fields
                 - serializer_fields: Custom serializer fields
                 - search_fields: Fields to search on
                 - ordering_fields: Fields to allow ordering on
                 - ordering: Default ordering
+                - pagination: "page" (EvoPageNumberPagination), "cursor" (EvoCursorPagination) or a pagination class
+                - count_strategy: "exact", "cached", "estimated" or "none" (default: EVO_PAGINATION_COUNT or "exact")
+                - count_cache_timeout: Seconds a cached count is kept
+                - cache_responses: Cache list / retrieve payloads with ETag support (default: False)
+                - cache_timeout: Seconds a cached response is kept
+                - cache_scope: "user" or "permission", how cached responses are shared between users
+                - fast_read: Render list pages from .values() rows when every field can be compiled
+                - export_max_rows / export_chunk_size / export_permission_classes: Streaming export settings,
+                  the export action is limited to admin users unless given other permission classes
+                - bulk_max_items / bulk_batch_size: Items accepted by bulk_create / bulk_update, rows per query
+                - bulk_unique_fields: Fields identifying conflicting rows in bulk_create upsert mode
+                - bulk_delete_chunk_size / bulk_delete_atomic: Ids per bulk_delete query, single transaction or not
+                - read_replicas: Database alias or pool of aliases list / retrieve read from, [] for the primary
+                  (default: EVO_READ_REPLICAS)
+                - primary_sticky_seconds: Seconds a client's reads stay on the primary after it wrote
+                  (default: EVO_PRIMARY_STICKY_SECONDS or 5)
+                - search_index: Answer ?search= from a full-text index (SQLite FTS5 / Postgres tsvector), True
+                  to index the search_fields or a list of fields, see search_index.py
+                - aggregate_fields: Fields the aggregate action groups on and aggregates (count / sum / avg / min /
+                  max), a list or a dict of the functions allowed per field like filterset_fields
+                - aggregate_cache_timeout / aggregate_max_groups: Seconds aggregate results are cached, groups returned
+                - changes: Serve the changes action (?since= cursor feed with delete tombstones), True to log
+                  every write in the change log or the name of an auto_now DateTimeField, see changes_feed.py
+                - changes_batch_size: Maximum changes per batch of the changes action
+                - patch_without_fetch: Write PATCH requests with one UPDATE query without loading the row, for
+                  models without save() override or pre_save / post_save receivers
+                - field_presets: Named sparse fieldsets selected with ?view=, e.g. {"summary": ["id", "name"]}
+                - async_: Generate an AsyncBaseViewSet (async ORM reads) for ASGI deployments
                 - resource_name: Custom URL resource name
                 - serializer_class: Custom serializer class (if not auto-creating)
                 - viewset_class: Custom viewset class (if not auto-creating)
+                - query_plan: Relation loading plan, True to build it from the serializer (default),
+                  False to disable it or a dict of select_related / prefetch_related lookups
+                - assert_query_plan: Fail list requests running one query per row (default: EVO_ASSERT_QUERY_PLAN)
 
         Returns:
-            The registered viewset class
+            The registered viewset class, or its ModelRegistration when registrations are lazy
+            (settings.EVO_LAZY_REGISTRATION, default: False): the serializer and viewset classes are then
+            built on first use, when the URLs or the router are loaded or by ``materialize()``
         """
         # Check if model is already registered
         if model_class in self.registry:
-            return self.registry[model_class]["viewset_class"]
-
-        # Use custom serializer class or create one
-        serializer_class = options.get("serializer_class")
-        if serializer_class is None:
-            serializer_class = self.create_serializer_class(model_class, **options)
-
-        # Use custom viewset class or create one
-        viewset_class = options.get("viewset_class")
-        if viewset_class is None:
-            print(f"Creating viewset class for {model_class.__name__}, options: {options}")
-            viewset_class = self.create_viewset_class(
-                model_class, serializer_class, abstract_viewset_class=abstract_viewset_class, mixins=mixins, **options
-            )
+            registration = self.registry[model_class]
+            return registration if not registration.is_materialized else registration.viewset_class
 
         # Get resource name for URL
         resource_name = options.get("resource_name")
         if resource_name is None:
             resource_name = self.get_resource_name(model_class)
 
-        # Register viewset with router
-        self.router.register(resource_name, viewset_class, basename=resource_name)
+        # Cached counts and responses are invalidated through the model version
+        count_strategy = options.get("count_strategy", getattr(settings, "EVO_PAGINATION_COUNT", None))
+        if count_strategy == "cached" or options.get("cache_responses"):
+            track_model_writes(model_class)
+        if options.get("cache_responses"):
+            # Cached responses are keyed by the versions of the related models they render too, their writes are
+            # tracked in every process importing the model, not only once the viewset served a request
+            track_related_writes(model_class, self.get_related_paths(options))
+        # Indexed / logged on save from now on, not once the registration is materialized
+        self.get_search_index(model_class, options)
+        self.get_change_feed(model_class, options)
 
         # Store in registry
-        self.registry[model_class] = {
-            "serializer_class": serializer_class,
-            "viewset_class": viewset_class,
-            "resource_name": resource_name,
-            "options": options,
-        }
-
-        return viewset_class
+        registration = ModelRegistration(
+            self,
+            model_class,
+            resource_name,
+            options,
+            abstract_viewset_class=abstract_viewset_class,
+            mixins=mixins,
+        )
+        self.registry[model_class] = registration
+
+        if getattr(settings, "EVO_LAZY_REGISTRATION", False):
+            logger.debug(f"Registered {model_class.__name__} as '{resource_name}', options: {options}")
+            return registration
+
+        self.route_registration(registration)
+        return registration.viewset_class
+
+    def route_registration(self, registration):
+        """Build the viewset of a registration and register it with the router"""
+        with self._materialize_lock:
+            if not registration.routed:
+                viewset_class = registration.viewset_class
+                logger.debug(f"Routing {viewset_class.__name__} as '{registration.resource_name}'")
+                self._router.register(registration.resource_name, viewset_class, basename=registration.resource_name)
+                registration.routed = True
+
+    def materialize(self):
+        """Build the serializer and viewset classes of the pending registrations, returning the router"""
+        for registration in list(self.registry.values()):
+            self.route_registration(registration)
+        return self._router
 
     def unregister_model(self, model_class):
         """Unregister a model from the REST framework"""
@@ -241,6 +385,26 @@ class RestFrameworkModuler:
         return model_class in self.registry
 
 
+@checks.register
+def check_dotted_fields(app_configs=None, **kwargs):
+    """Validate the dotted fields of every registered model at startup"""
+    errors = []
+    for model_class, registration in RestFrameworkModuler().registry.items():
+        # Read from the options so checks don't build the serializers of lazy registrations
+        serializer_class = registration.options.get("serializer_class")
+        if serializer_class is not None:
+            dotted_paths = getattr(serializer_class, "evo_dotted_fields", {}).values()
+        else:
+            fields = registration.options.get("fields", "__all__")
+            dotted_paths = [] if fields == "__all__" else [field for field in fields if "." in field]
+        for path in dotted_paths:
+            try:
+                build_dotted_field_plan(model_class, path)
+            except ImproperlyConfigured as e:
+                errors.append(checks.Error(str(e), obj=model_class, id="evo_django_kits.E001"))
+    return errors
+
+
 def register_model(model_class, abstract_viewset_class=None, mixins=None, **options):
     RestFrameworkModuler().register_model(
         model_class, abstract_viewset_class=abstract_viewset_class, mixins=mixins, **options
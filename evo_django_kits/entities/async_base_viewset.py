@@ -0,0 +1,172 @@
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from evo_django_kits.entities import bulk_write
+from evo_django_kits.entities.base_viewset import BaseViewSet
+from evo_django_kits.entities.serializers.bulk_delete_serializer import BulkDeleteSerializer
+
+
+class AsyncBaseViewSet(BaseViewSet):
+    """
+    BaseViewSet with an async dispatch for ASGI deployments.
+
+    Reads use the async ORM (``aget``, ``acount``, async iteration) and the paginators' ``apaginate_queryset``.
+    Code that may query the database without an async API (authentication, permissions and throttling,
+    filter backends, serialization of model instances, serializer validation / save, transactional bulk deletes)
+    runs in a worker thread hop each. Only fast read rows are serialized on the event loop.
+    Sync actions (export, bulk_create, bulk_update...) keep working, they run in a worker thread.
+    EVO_INSTRUMENTATION only covers sync viewsets, queries sent from worker threads can't be counted per request.
+
+    Django's async ORM still runs the queries through its thread sensitive executor: the async_views benchmark
+    shows the same throughput as BaseViewSet, with or without query latency. Measure with
+    ``python -m evo_django_kits.benchmarks.async_views`` before switching a deployment.
+    """
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        # The view returns the dispatch coroutine, Django awaits it under ASGI and wraps it with
+        # async_to_sync under WSGI
+        return markcoroutinefunction(view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def aget_object(self):
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        await sync_to_async(self.check_object_permissions)(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        if hasattr(self.paginator, "apaginate_queryset"):
+            return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+        return await sync_to_async(self.paginator.paginate_queryset)(queryset, self.request, view=self)
+
+    async def aget_cached_response(self, request, build_response):
+        """get_cached_response for async views, the cache is read and written in a worker thread"""
+        if not self.cache_responses:
+            return await build_response()
+
+        key, etag, response = await sync_to_async(self.lookup_cached_response)(request)
+        if response is None:
+            response = await sync_to_async(self.cache_response)(key, etag, await build_response())
+        return response
+
+    async def list(self, request, *args, **kwargs):
+        return await self.aget_cached_response(request, self.aget_list_response)
+
+    async def aget_list_response(self):
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        fast_reader = self.get_fast_reader()
+        if fast_reader is not None:
+            queryset = fast_reader.values(queryset)
+
+        page = await self.apaginate_queryset(queryset)
+        rows = page if page is not None else [row async for row in queryset]
+        if fast_reader is not None:
+            data = fast_reader.to_representation(rows)
+        else:
+            data = await sync_to_async(self.get_serialized_rows)(rows, queryset.db)
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    async def retrieve(self, request, *args, **kwargs):
+        instance = None
+        if self.cache_responses and self.checks_object_permissions():
+            # Cached bodies are served without aget_object(), the object permissions are checked first
+            instance = await self.aget_object()
+        return await self.aget_cached_response(request, partial(self.aget_retrieve_response, instance))
+
+    async def aget_retrieve_response(self, instance=None):
+        if instance is None:
+            instance = await self.aget_object()
+        return Response(await sync_to_async(lambda: self.get_serializer(instance).data)())
+
+    async def create(self, request, *args, **kwargs):
+        # Serializer validation and save() have no async API
+        return await sync_to_async(super().create)(request, *args, **kwargs)
+
+    async def update(self, request, *args, **kwargs):
+        return await sync_to_async(super().update)(request, *args, **kwargs)
+
+    async def partial_update(self, request, *args, **kwargs):
+        kwargs["partial"] = True
+        return await self.update(request, *args, **kwargs)
+
+    async def destroy(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        pk = instance.pk
+        deleted = await self.aperform_destroy(instance)
+        await sync_to_async(self.update_search_index)(deleted_ids=[pk])
+        await sync_to_async(self.record_changes)(deleted_ids=[pk])
+        await sync_to_async(self.invalidate_cache)(deleted=deleted)
+        return self.response(status=204, message="Deleted Successfully")
+
+    async def aperform_destroy(self, instance):
+        _, deleted = await instance.adelete()
+        return deleted
+
+    @action(
+        detail=False,
+        methods=["DELETE"],
+        url_name="bulk-delete",
+        serializer_class=BulkDeleteSerializer,
+        permission_classes=[IsAdminUser],
+    )
+    async def bulk_delete(self, request):
+        """
+        For each list end point have endpoint to bulk delete with param ids
+        example: /users/bulk_delete/?ids=21,22 or a {"ids": [21, 22]} body
+        """
+        ids = self.get_bulk_delete_ids(request)
+        # The chunks are deleted in transactions, which the async ORM can't open
+        deleted, deleted_ids = await sync_to_async(bulk_write.delete_in_chunks)(
+            self.queryset,
+            ids,
+            self.bulk_delete_chunk_size,
+            atomic=self.bulk_delete_atomic,
+            return_ids=self.search_index is not None or self.change_feed is not None,
+        )
+        await sync_to_async(self.update_search_index)(deleted_ids=deleted_ids or ())
+        await sync_to_async(self.record_changes)(deleted_ids=deleted_ids or ())
+        await sync_to_async(self.invalidate_cache)(deleted=deleted)
+        return self.get_bulk_delete_response(ids, deleted)
@@ -1,16 +1,601 @@
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Avg, Count, Max, Min, Q, Sum
+from django.db.models.constants import LOOKUP_SEP
+from django.http import Http404, StreamingHttpResponse
+from django.utils.http import parse_etags
 from rest_framework import viewsets
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAdminUser
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import SAFE_METHODS, BasePermission, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.validators import UniqueValidator
 
+from evo_django_kits.django_moduler.query_plan import get_only_fields, get_query_plan
+from evo_django_kits.entities import (
+    bulk_write,
+    changes_feed,
+    instrumentation,
+    minimal_update,
+    replica_routing,
+    response_cache,
+    streaming_export,
+)
 from evo_django_kits.entities.evo_response import EvoResponse
+from evo_django_kits.entities.model_version import (
+    bump_model_version,
+    bump_deleted_versions,
+    get_related_models,
+    is_tracked,
+    track_model_writes,
+)
+from evo_django_kits.entities.renderers import get_renderer_classes
 from evo_django_kits.entities.serializers.bulk_delete_serializer import BulkDeleteSerializer
+from evo_django_kits.entities.serializers.bulk_write_serializer import BulkWriteSerializer
+from evo_django_kits.entities.serializers.evo_model_serializer import EvoModelSerializer
+from evo_django_kits.entities.serializers.fast_read import compile_fast_reader
+
+# Functions of the aggregate action
+AGGREGATES = {"count": Count, "sum": Sum, "avg": Avg, "min": Min, "max": Max}
 
 
 class BaseViewSet(viewsets.ModelViewSet):
     response = EvoResponse
+    # orjson encoding of the JSON responses, and application/msgpack when msgpack is installed
+    renderer_classes = get_renderer_classes()
+
+    # Relation loading plan: True to build it from the serializer, a dict of lookups or a QueryPlan
+    query_plan = None
+    # Fail list requests running one query per serialized row, defaults to settings.EVO_ASSERT_QUERY_PLAN
+    assert_query_plan = None
+
+    # Render list pages from .values() rows through a compiled FastReader when the serializer allows it
+    fast_read = False
+
+    # Sparse fieldsets of read requests: ?fields=id,name / ?exclude=bio / ?view=<preset>
+    fields_query_param = "fields"
+    exclude_query_param = "exclude"
+    field_preset_query_param = "view"
+    # Named fieldsets, e.g. {"summary": ["id", "name"]}
+    field_presets = {}
+
+    # Streaming export: maximum number of rows, rows fetched and serialized per batch, and the permission
+    # classes of the export action (admin users only by default like the bulk actions, None keeps the viewset
+    # permission classes)
+    export_max_rows = 100000
+    export_chunk_size = 2000
+    export_permission_classes = [IsAdminUser]
+
+    # bulk_delete: ids per DELETE query, and whether all chunks are deleted in one transaction
+    # (False commits each chunk on its own)
+    bulk_delete_chunk_size = 500
+    bulk_delete_atomic = True
+
+    # bulk_create / bulk_update: maximum items per request, rows per INSERT / UPDATE query, and the
+    # unique fields identifying conflicting rows in upsert mode (upsert is refused when empty)
+    bulk_max_items = 1000
+    bulk_batch_size = 500
+    bulk_unique_fields = []
+
+    # Database aliases safe-method querysets read from, one is picked per request (None for
+    # settings.EVO_READ_REPLICAS, [] for the primary). After a write, the client's reads are pinned to the
+    # primary for primary_sticky_seconds (settings.EVO_PRIMARY_STICKY_SECONDS) with a cookie / header
+    # (see replica_routing.py). Responses cached with cache_responses may then hold rows of a lagging replica.
+    read_replicas = None
+    primary_sticky_seconds = None
+
+    # Full-text index answering ?search= (see search_index.py), kept up to date by the write actions
+    search_index = None
+
+    # aggregate action: the fields it can group on and aggregate, like filterset_fields a list (every function
+    # allowed) or a dict of the functions allowed per field ([] to only group on it), the seconds its results
+    # are cached (None disables the cache; writes through the API invalidate it, other writes wait for the
+    # timeout) and the maximum groups returned
+    aggregate_fields = None
+    aggregate_cache_timeout = None
+    aggregate_max_groups = 1000
+
+    # PATCH requests run one UPDATE query without loading the row, when the model has no save() override or
+    # pre_save / post_save receiver and the serializer no object level validator (see can_patch_without_fetch)
+    patch_without_fetch = False
+
+    # Incremental changes served by the changes action (see changes_feed.py), and the maximum changes per batch
+    change_feed = None
+    changes_batch_size = 500
+
+    # Record phase timings and query stats of every request, with a Server-Timing header (see instrumentation.py),
+    # defaults to settings.EVO_INSTRUMENTATION
+    instrumentation = None
+    timings = None
+
+    # Cache list / retrieve payloads in the Django cache, keyed by the model version (see response_cache.py)
+    cache_responses = False
+    cache_timeout = 60
+    # "user" caches per user, "permission" shares entries between users of the same permission level
+    cache_scope = "user"
+
+    def is_instrumented(self):
+        if self.instrumentation is not None:
+            return self.instrumentation
+        return getattr(settings, "EVO_INSTRUMENTATION", False)
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_instrumented():
+            return super().dispatch(request, *args, **kwargs)
+
+        self.timings = instrumentation.RequestTimings()
+        with self.timings.capture_queries():
+            response = super().dispatch(request, *args, **kwargs)
+        self.timings.finish()
+        if getattr(settings, "EVO_SERVER_TIMING", True):
+            response["Server-Timing"] = self.timings.get_server_timing()
+        instrumentation.record_request(f"{self.basename}.{self.action}", self.timings)
+        return response
 
     def initial(self, request, *args, **kwargs):
-        super().initial(request, *args, **kwargs)
+        with instrumentation.phase(self, "permission"):
+            super().initial(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method not in SAFE_METHODS and response.status_code < 400 and self.get_replica_aliases():
+            replica_routing.pin_to_primary(response, self.get_primary_sticky_seconds())
+        # Rendered here when instrumented, so the rendering time is part of the Server-Timing header
+        if self.timings is not None and hasattr(response, "render") and not response.is_rendered:
+            with self.timings.phase("render"):
+                response.render()
+        return response
+
+    def get_query_plan(self):
+        """Resolve the query plan once per viewset class"""
+        viewset_class = type(self)
+        if "_resolved_query_plan" not in viewset_class.__dict__:
+            viewset_class._resolved_query_plan = get_query_plan(
+                self.query_plan, getattr(self.queryset, "model", None), self.serializer_class
+            )
+        return viewset_class._resolved_query_plan
+
+    def get_replica_aliases(self):
+        """Read replicas of the viewset, resolved once per viewset class"""
+        viewset_class = type(self)
+        if "_resolved_replica_aliases" not in viewset_class.__dict__:
+            viewset_class._resolved_replica_aliases = replica_routing.get_replica_aliases(self.read_replicas)
+        return viewset_class._resolved_replica_aliases
+
+    def get_primary_sticky_seconds(self):
+        if self.primary_sticky_seconds is not None:
+            return self.primary_sticky_seconds
+        return getattr(settings, "EVO_PRIMARY_STICKY_SECONDS", 5)
+
+    def get_read_database(self):
+        """
+        Replica alias the request reads from, None for the default routing (writes, clients pinned to the
+        primary, no replica configured). Chosen once per request so pages and counts read the same replica.
+        """
+        if hasattr(self, "_read_database"):
+            return self._read_database
+        self._read_database = None
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS or not self.get_replica_aliases():
+            return None
+        if not replica_routing.is_pinned_to_primary(request):
+            self._read_database = replica_routing.choose_replica(self.get_replica_aliases())
+        return self._read_database
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        read_database = self.get_read_database()
+        if read_database is not None:
+            queryset = queryset.using(read_database)
+        sparse_fields = self.get_sparse_fields()
+        if sparse_fields is None:
+            return self.get_query_plan().apply(queryset)
+
+        # Only the relations and columns of the requested fields are loaded
+        query_plan = self.get_query_plan().narrow(sparse_fields)
+        only_fields = get_only_fields(queryset.model, self.get_serializer_class()(), sparse_fields, query_plan)
+        if only_fields is not None:
+            queryset = queryset.only(*only_fields)
+        return query_plan.apply(queryset)
+
+    def parse_field_names(self, value, param, allowed):
+        # Dotted fields are accepted as registered ("campus.name") or as rendered ("campus__name")
+        field_names = [name.strip().replace(".", "__") for name in value.split(",") if name.strip()]
+        unknown = [name for name in field_names if name not in allowed]
+        if unknown:
+            raise ValidationError({param: f"Unknown fields {unknown}, expected any of {list(allowed)}."})
+        return field_names
+
+    def get_sparse_fields(self):
+        """
+        Serializer fields selected by the ``fields`` / ``exclude`` / ``view`` query parameters of a read request,
+        None when the whole representation is requested. ``fields`` adds to the ``view`` preset.
+        """
+        if hasattr(self, "_sparse_fields"):
+            return self._sparse_fields
+        self._sparse_fields = None
+
+        request = getattr(self, "request", None)
+        serializer_class = self.get_serializer_class()
+        if (
+            request is None
+            or request.method not in SAFE_METHODS
+            or not issubclass(serializer_class, EvoModelSerializer)
+        ):
+            return None
+
+        query_params = request.query_params
+        preset = query_params.get(self.field_preset_query_param)
+        fields = query_params.get(self.fields_query_param)
+        exclude = query_params.get(self.exclude_query_param)
+        if preset is None and fields is None and exclude is None:
+            return None
+
+        allowed = serializer_class.get_readable_field_names()
+        selected = []
+        if preset is not None:
+            if preset not in self.field_presets:
+                message = f"Unknown view '{preset}', expected one of {list(self.field_presets)}."
+                raise ValidationError({self.field_preset_query_param: message})
+            selected.extend(name.replace(".", "__") for name in self.field_presets[preset])
+        if fields is not None:
+            selected.extend(self.parse_field_names(fields, self.fields_query_param, allowed))
+        if preset is None and fields is None:
+            selected = list(allowed)
+        if exclude is not None:
+            excluded = set(self.parse_field_names(exclude, self.exclude_query_param, allowed))
+            selected = [name for name in selected if name not in excluded]
+
+        selected = set(selected)
+        self._sparse_fields = tuple(name for name in allowed if name in selected)
+        return self._sparse_fields
+
+    def get_serializer(self, *args, **kwargs):
+        sparse_fields = self.get_sparse_fields()
+        if sparse_fields is not None:
+            kwargs.setdefault("fields", sparse_fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_fast_reader(self):
+        """Compile the fast read representation once per viewset class, None when disabled or not compilable"""
+        if not self.fast_read or self.get_serializer_class() is not self.serializer_class:
+            return None
+        viewset_class = type(self)
+        if "_resolved_fast_reader" not in viewset_class.__dict__:
+            viewset_class._resolved_fast_reader = compile_fast_reader(
+                self.serializer_class, self.queryset.model, self.get_query_plan()
+            )
+        fast_reader = viewset_class._resolved_fast_reader
+        sparse_fields = self.get_sparse_fields()
+        if fast_reader is not None and sparse_fields is not None:
+            fast_reader = fast_reader.narrow(sparse_fields)
+        return fast_reader
+
+    def should_assert_query_plan(self):
+        if self.assert_query_plan is not None:
+            return self.assert_query_plan
+        return getattr(settings, "EVO_ASSERT_QUERY_PLAN", False)
+
+    def get_serialized_rows(self, rows, using):
+        """Serialize a list of rows, checking the query plan when assert_query_plan is enabled"""
+        serializer = self.get_serializer(rows, many=True)
+        if not self.should_assert_query_plan():
+            return serializer.data
+
+        queries = []
+
+        def record_query(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connections[using].execute_wrapper(record_query):
+            data = serializer.data
+        # A complete plan loads every relation before serialization, a query count growing
+        # with the number of rows means a relation is lazily loaded per row (N+1)
+        if len(rows) > 1 and len(queries) >= len(rows):
+            raise AssertionError(
+                f"{len(queries)} queries while serializing {len(rows)} {self.queryset.model.__name__} rows, "
+                f"the query plan is missing relations: {queries[:3]}"
+            )
+        return data
+
+    def get_cache_scope(self, request):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return "anonymous"
+        if self.cache_scope == "permission":
+            return "superuser" if user.is_superuser else "staff" if user.is_staff else "authenticated"
+        return f"user:{user.pk}"
+
+    def get_cached_response(self, request, build_response, timeout=None):
+        """
+        Serve a read action from the response cache. Requests whose ``If-None-Match`` matches the
+        current ETag are answered with 304 without touching the database.
+        A ``timeout`` caches the action for that many seconds even without cache_responses.
+        """
+        if not self.cache_responses and timeout is None:
+            return build_response()
+
+        key, etag, response = self.lookup_cached_response(request)
+        if response is None:
+            response = self.cache_response(key, etag, build_response(), timeout)
+        return response
+
+    def get_cache_models(self):
+        """
+        The related models the serializer renders, resolved once per viewset class. Cached responses are keyed
+        by their versions too: register_model tracks their writes, viewsets routed by hand are tracked here.
+        """
+        viewset_class = type(self)
+        if "_resolved_cache_models" not in viewset_class.__dict__:
+            paths = response_cache.get_related_paths(self.serializer_class)
+            related_models = get_related_models(self.queryset.model, paths)
+            for related_model in related_models:
+                track_model_writes(related_model)
+            viewset_class._resolved_cache_models = related_models
+        return viewset_class._resolved_cache_models
+
+    def lookup_cached_response(self, request):
+        """Return ``(key, etag, response)``, the response being None on a cache miss"""
+        model_class = self.queryset.model
+        key = response_cache.get_response_cache_key(
+            model_class, self.action, self.get_cache_scope(request), request, self.kwargs, self.get_cache_models()
+        )
+        etag = response_cache.get_etag(key)
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            response_cache.record("not_modified", model_class)
+            return key, etag, Response(status=304, headers={"ETag": etag})
+
+        payload = response_cache.get_cached_payload(key)
+        if payload is None:
+            response_cache.record("misses", model_class)
+            return key, etag, None
+
+        response_cache.record("hits", model_class)
+        response = Response(payload["data"], status=payload["status"])
+        response["X-Cache"] = "HIT"
+        response["ETag"] = etag
+        response["Last-Modified"] = payload["last_modified"]
+        return key, etag, response
+
+    def cache_response(self, key, etag, response, timeout=None):
+        """Store a freshly built response, only 200 responses are cached"""
+        if response.status_code != 200:
+            return response
+        timeout = timeout if timeout is not None else self.cache_timeout
+        payload = response_cache.set_cached_payload(key, response.data, response.status_code, timeout)
+        response["X-Cache"] = "MISS"
+        response["ETag"] = etag
+        response["Last-Modified"] = payload["last_modified"]
+        return response
+
+    def update_search_index(self, instances=(), deleted_ids=()):
+        """Index the rows written by the bulk actions, which don't send post_save, and drop the deleted ones"""
+        if self.search_index is None:
+            return
+        using = router.db_for_write(self.queryset.model)
+        self.search_index.index_instances(instances, using)
+        self.search_index.delete_rows(deleted_ids, using)
+
+    def record_changes(self, instances=(), deleted_ids=()):
+        """Log the rows written by the bulk actions, which don't send post_save, and the tombstones of deleted ones"""
+        if self.change_feed is None:
+            return
+        self.change_feed.record(
+            upserted_pks=[instance.pk for instance in instances if instance.pk is not None], deleted_pks=deleted_ids
+        )
+
+    def invalidate_cache(self, deleted=None):
+        """
+        Bump the model version, invalidating cached responses and counts, and with the ``deleted`` counts
+        by label of a delete the versions of the tracked models its cascades deleted
+        """
+        model_class = self.queryset.model
+        # Bulk writes and deletes don't send the signals bumping tracked models
+        if self.cache_responses or self.aggregate_cache_timeout is not None or is_tracked(model_class):
+            bump_model_version(model_class)
+        if deleted:
+            bump_deleted_versions(deleted, exclude=model_class)
+
+    @classmethod
+    def get_cache_stats(cls):
+        return response_cache.get_response_cache_stats(cls.queryset.model)
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(request, self.get_list_response)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = None
+        if self.cache_responses and self.checks_object_permissions():
+            # Cached bodies are served without get_object(), the object permissions are checked first
+            instance = self.get_object()
+        return self.get_cached_response(request, partial(self.get_retrieve_response, instance))
+
+    def get_retrieve_response(self, instance=None):
+        if instance is None:
+            instance = self.get_object()
+        return Response(self.get_serializer(instance).data)
+
+    def checks_object_permissions(self):
+        """Whether a permission class of the view checks objects (has_object_permission)"""
+        return any(
+            type(permission).has_object_permission is not BasePermission.has_object_permission
+            for permission in self.get_permissions()
+        )
+
+    def get_list_response(self):
+        with instrumentation.phase(self, "queryset"):
+            queryset = self.filter_queryset(self.get_queryset())
+            fast_reader = self.get_fast_reader()
+            if fast_reader is not None:
+                queryset = fast_reader.values(queryset)
+
+        with instrumentation.phase(self, "query"):
+            page = self.paginate_queryset(queryset)
+            rows = page if page is not None else list(queryset)
+
+        with instrumentation.phase(self, "serialize"):
+            if fast_reader is not None:
+                data = fast_reader.to_representation(rows)
+            else:
+                data = self.get_serialized_rows(rows, queryset.db)
+        if self.timings is not None:
+            self.timings.rows = len(rows)
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def get_permissions(self):
+        if self.action == "export" and self.export_permission_classes is not None:
+            return [permission() for permission in self.export_permission_classes]
+        return super().get_permissions()
+
+    def get_limit(self, request, maximum, minimum=0):
+        """The ?limit= query param, ``maximum`` when missing"""
+        limit = request.query_params.get("limit")
+        if limit is None:
+            return maximum
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValidationError({"limit": "A valid integer is required."})
+        return max(minimum, min(limit, maximum))
+
+    def get_export_limit(self, request):
+        return self.get_limit(request, self.export_max_rows)
+
+    @action(detail=False, methods=["GET"], url_path="export", url_name="export")
+    def export(self, request):
+        """
+        Stream the filtered, searched and ordered collection as NDJSON or CSV
+        example: /users/export/?export_format=csv&limit=5000
+        """
+        export_format = request.query_params.get("export_format", "ndjson")
+        if export_format not in streaming_export.EXPORT_FORMATS:
+            raise ValidationError({"export_format": f"Expected one of {list(streaming_export.EXPORT_FORMATS)}."})
+
+        queryset = self.filter_queryset(self.get_queryset())[: self.get_export_limit(request)]
+        fast_reader = self.get_fast_reader()
+        if fast_reader is not None:
+            field_names = [key for key, _, _ in fast_reader.plan]
+            batches = streaming_export.iter_serialized_batches(
+                fast_reader.values(queryset), fast_reader.to_representation, self.export_chunk_size
+            )
+        else:
+            field_names = [field.field_name for field in self.get_serializer()._readable_fields]
+            batches = streaming_export.iter_serialized_batches(
+                queryset, lambda rows: self.get_serializer(rows, many=True).data, self.export_chunk_size
+            )
+
+        if export_format == "csv":
+            stream = streaming_export.stream_csv(field_names, batches)
+        else:
+            stream = streaming_export.stream_ndjson(batches)
+
+        content_type, extension = streaming_export.EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{self.basename or "export"}.{extension}"'
+        return response
+
+    def get_aggregate_fields(self):
+        """The aggregate_fields option as a dict of the functions allowed per field, dotted paths as lookups"""
+        fields = self.aggregate_fields
+        if not isinstance(fields, dict):
+            fields = {name: list(AGGREGATES) for name in fields}
+        return {name.replace(".", LOOKUP_SEP): functions for name, functions in fields.items()}
+
+    def get_aggregate_params(self, request):
+        """The ``(group_by, annotations)`` of ?group_by=campus,level&aggregate=count,sum:score,avg:score"""
+        allowed = self.get_aggregate_fields()
+        group_by = [
+            name.strip().replace(".", LOOKUP_SEP)
+            for name in request.query_params.get("group_by", "").split(",")
+            if name.strip()
+        ]
+        invalid = [name for name in group_by if name not in allowed]
+        if invalid:
+            raise ValidationError({"group_by": f"Can't group on {invalid}, expected some of {list(allowed)}."})
+
+        annotations = {}
+        for item in request.query_params.get("aggregate", "count").split(","):
+            function, _, field = item.strip().partition(":")
+            field = field.replace(".", LOOKUP_SEP)
+            if function not in AGGREGATES:
+                raise ValidationError(
+                    {"aggregate": f"Unknown function '{function}', expected one of {list(AGGREGATES)}."}
+                )
+            if not field and function == "count":
+                annotations["count"] = Count("pk")
+            elif function in allowed.get(field, ()):
+                annotations[f"{field}{LOOKUP_SEP}{function}"] = AGGREGATES[function](field)
+            else:
+                raise ValidationError({"aggregate": f"'{item}' is not allowed on this resource."})
+        return group_by, annotations
+
+    def get_aggregate_response(self):
+        group_by, annotations = self.get_aggregate_params(self.request)
+        queryset = self.filter_queryset(self.get_queryset())
+        # Only the grouped columns are selected, the relations of the query plan and the ordering would
+        # join tables and add columns to the GROUP BY
+        queryset = queryset.select_related(None).prefetch_related(None).defer(None).order_by()
+        if not group_by:
+            return Response({"results": [queryset.aggregate(**annotations)], "truncated": False})
+
+        rows = list(
+            queryset.values(*group_by).annotate(**annotations).order_by(*group_by)[: self.aggregate_max_groups + 1]
+        )
+        truncated = len(rows) > self.aggregate_max_groups
+        return Response({"results": rows[: self.aggregate_max_groups], "truncated": truncated})
+
+    @action(detail=False, methods=["GET"], url_path="aggregate", url_name="aggregate")
+    def aggregate(self, request):
+        """
+        Counts, sums, averages, minimums and maximums of the filtered and searched collection, by group,
+        computed by the database in one GROUP BY query
+        example: /users/aggregate/?group_by=country,level&aggregate=count,avg:age,max:score&active=true
+        """
+        if not self.aggregate_fields:
+            raise NotFound("This resource has no aggregate endpoint.")
+        return self.get_cached_response(request, self.get_aggregate_response, timeout=self.aggregate_cache_timeout)
+
+    @action(detail=False, methods=["GET"], url_path="changes", url_name="changes")
+    def changes(self, request):
+        """
+        Rows created or updated and ids deleted after a cursor, oldest first, for sync clients
+        example: /users/changes/?since=<cursor>&limit=100
+        Without since, only the current cursor is returned: get it, download the collection, then follow the
+        changes from it with the cursor of each response until has_more is false.
+        """
+        if self.change_feed is None:
+            raise NotFound("This resource has no changes feed.")
+        queryset = self.filter_queryset(self.get_queryset())
+        since = request.query_params.get("since")
+        if not since:
+            cursor = changes_feed.encode_cursor(self.change_feed.get_head(queryset))
+            return Response({"cursor": cursor, "has_more": False, "next": None, "results": [], "deleted": []})
+
+        cursor = changes_feed.decode_cursor(since)
+        if cursor is None or not self.change_feed.is_valid_cursor(cursor):
+            raise ValidationError({"since": "Invalid cursor."})
+        limit = self.get_limit(request, self.changes_batch_size, minimum=1)
+        rows, deleted, next_cursor, has_more = self.change_feed.get_changes(queryset, cursor, limit)
+        cursor = changes_feed.encode_cursor(next_cursor)
+        return Response(
+            {
+                "cursor": cursor,
+                "has_more": has_more,
+                "next": replace_query_param(request.build_absolute_uri(), "since", cursor) if has_more else None,
+                "results": self.get_serialized_rows(rows, queryset.db),
+                "deleted": deleted,
+            }
+        )
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -21,6 +606,7 @@ class BaseViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
+        self.invalidate_cache()
         headers = self.get_success_headers(serializer.data)
         return self.response(
             data=serializer.data,
@@ -30,17 +616,85 @@ class BaseViewSet(viewsets.ModelViewSet):
         )
 
     def update(self, request, *args, **kwargs):
+        partial = kwargs.get("partial", False)
+        if partial and self.can_patch_without_fetch():
+            response = self.get_patch_without_fetch_response(request)
+            if response is not None:
+                return response
+
         instance = self.get_object()
-        serializer = self.get_serializer(instance, data=request.data, partial=kwargs.get("partial", False))
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        # Nothing changed: the row wasn't written, cached responses are still valid
+        if getattr(serializer, "changed_fields", None) != []:
+            self.invalidate_cache()
         return self.response(data=serializer.data, status=200, message="Updated Successfully")
 
+    def can_patch_without_fetch(self):
+        """
+        Whether a PATCH can skip loading the row: save() and its signals don't run, the primary key is the lookup
+        and no permission checks the object
+        """
+        model_class = self.queryset.model
+        return (
+            self.patch_without_fetch
+            and self.lookup_field in ("pk", model_class._meta.pk.name)
+            and issubclass(self.get_serializer_class(), EvoModelSerializer)
+            and minimal_update.can_update_without_fetch(model_class)
+            and not self.checks_object_permissions()
+        )
+
+    def get_patch_without_fetch_response(self, request):
+        """
+        Write a PATCH with one UPDATE query filtered like get_object(), validating the payload against an instance
+        holding only the primary key. The response renders the written fields. None when the payload writes
+        more than columns (many-to-many, files...) or the serializer validates the whole object, the row is
+        then loaded and saved as usual.
+        """
+        model_class = self.queryset.model
+        pk_field = model_class._meta.pk
+        try:
+            pk = pk_field.to_python(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except DjangoValidationError:
+            raise Http404
+        instance = model_class(pk=pk)
+        serializer = self.get_serializer(instance, data=request.data, partial=True)
+        if serializer.validators:
+            return None
+        serializer.is_valid(raise_exception=True)
+        values = minimal_update.get_update_values(instance, serializer.validated_data)
+        if not values:
+            return None
+
+        queryset = self.filter_queryset(self.get_queryset()).select_related(None).prefetch_related(None)
+        updated = queryset.filter(pk=pk).order_by().update(**values)
+        if not updated:
+            raise Http404
+        self.invalidate_cache()
+        written = {model_class._meta.get_field(name).name for name in values}
+        fields = [
+            name
+            for name, field in serializer.fields.items()
+            if field.source in written or field.source in ("pk", pk_field.name)
+        ]
+        data = self.get_serializer(instance, fields=fields).data
+        return self.response(data=data, status=200, message="Updated Successfully")
+
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        self.perform_destroy(instance)
+        pk = instance.pk
+        deleted = self.perform_destroy(instance)
+        self.update_search_index(deleted_ids=[pk])
+        self.record_changes(deleted_ids=[pk])
+        self.invalidate_cache(deleted=deleted)
         return self.response(status=204, message="Deleted Successfully")
 
+    def perform_destroy(self, instance):
+        """Delete the row, returning the deleted counts by model label, cascades included"""
+        _, deleted = instance.delete()
+        return deleted
+
     @action(
         detail=False,
         methods=["DELETE"],
@@ -51,13 +705,222 @@ class BaseViewSet(viewsets.ModelViewSet):
     def bulk_delete(self, request):
         """
         For each list end point have endpoint to bulk delete with param ids
-        example: /users/bulk_delete/?ids=21,22
+        example: /users/bulk_delete/?ids=21,22 or a {"ids": [21, 22]} body
+        Models without cascades or delete receivers are deleted with one DELETE query per chunk, the model
+        versions are bumped from the deleted counts rather than by post_delete receivers for this reason.
         """
-        ids = request.query_params.get("ids", None)
-        ids = [int(_id) for _id in ids.split(",")] if ids else []
+        ids = self.get_bulk_delete_ids(request)
+        # Only the search index and the changes feed need the ids of the rows actually deleted
+        deleted, deleted_ids = bulk_write.delete_in_chunks(
+            self.queryset,
+            ids,
+            self.bulk_delete_chunk_size,
+            atomic=self.bulk_delete_atomic,
+            return_ids=self.search_index is not None or self.change_feed is not None,
+        )
+        self.update_search_index(deleted_ids=deleted_ids or ())
+        self.record_changes(deleted_ids=deleted_ids or ())
+        self.invalidate_cache(deleted=deleted)
+        return self.get_bulk_delete_response(ids, deleted)
+
+    def get_bulk_delete_ids(self, request):
+        ids = request.data.get("ids") if hasattr(request.data, "get") else None
+        if ids is None:
+            ids = request.query_params.get("ids", None)
+            ids = ids.split(",") if ids else []
         data = {"ids": ids}
         serializer = self.serializer_class(data=data)
         serializer.is_valid(raise_exception=True)
-        ids = serializer.validated_data["ids"]
-        self.queryset.filter(id__in=ids).delete()
-        return self.response(status=204, data=[ids], message=f"Delete {len(ids)} successful")
+        return list(dict.fromkeys(serializer.validated_data["ids"]))
+
+    def get_bulk_delete_response(self, ids, deleted):
+        count = deleted.get(self.queryset.model._meta.label, 0)
+        return self.response(status=204, data={"ids": ids, "deleted": deleted}, message=f"Delete {count} successful")
+
+    def get_bulk_payload(self, request):
+        serializer = BulkWriteSerializer(data=request.data, context={"max_items": self.bulk_max_items})
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def validate_bulk_items(self, items, instances=None, partial=False, upsert_fields=()):
+        """
+        Validate bulk items with the model serializer (``many=True``), against their instance when updating.
+        Returns the ``(index, validated_data, instance)`` of the valid items and the errors by item index,
+        raises ValidationError on the first invalid payload unless ``partial``.
+        """
+        model_class = self.queryset.model
+        serializer = type(self).serializer_class(
+            data=items, many=True, partial=instances is not None, context=self.get_serializer_context()
+        )
+        child = serializer.child
+        # Rows conflicting on the upsert fields are updated, their uniqueness isn't an error
+        for field_name in upsert_fields:
+            if field_name in child.fields:
+                field = child.fields[field_name]
+                field.validators = [
+                    validator for validator in field.validators if not isinstance(validator, UniqueValidator)
+                ]
+        pk_field = model_class._meta.pk
+
+        valid = []
+        errors = {}
+        for index, item in enumerate(items):
+            instance = None
+            if instances is not None:
+                try:
+                    instance = instances.get(pk_field.to_python(item.get(pk_field.name)))
+                except DjangoValidationError:
+                    pass
+                if instance is None:
+                    errors[index] = {pk_field.name: ["Not found."]}
+                    continue
+            child.instance = instance
+            child.initial_data = item
+            try:
+                valid.append((index, child.run_validation(item), instance))
+            except ValidationError as exc:
+                errors[index] = exc.detail
+
+        # Rows repeating unique values of the payload would fail the whole write with an IntegrityError
+        duplicates = bulk_write.find_duplicates(model_class, [(data, instance) for _, data, instance in valid])
+        for position, names in duplicates.items():
+            index = valid[position][0]
+            if len(names) == 1:
+                errors[index] = {names[0]: ["This value is repeated in the items."]}
+            else:
+                errors[index] = {
+                    api_settings.NON_FIELD_ERRORS_KEY: [f"The fields {', '.join(names)} are repeated in the items."]
+                }
+        if duplicates:
+            valid = [row for position, row in enumerate(valid) if position not in duplicates]
+            errors = dict(sorted(errors.items()))
+
+        if errors and not partial:
+            raise ValidationError({"items": errors})
+        return valid, errors
+
+    def get_bulk_created_rows(self, instances):
+        """The bulk created rows with their primary key, ignore_conflicts inserts don't return it"""
+        missing = [instance for instance in instances if instance.pk is None]
+        if not missing or (self.search_index is None and self.change_feed is None) or not self.bulk_unique_fields:
+            return instances
+        if len(self.bulk_unique_fields) == 1:
+            name = self.bulk_unique_fields[0]
+            lookups = Q(**{f"{name}__in": [getattr(instance, name) for instance in missing]})
+        else:
+            lookups = Q()
+            for instance in missing:
+                lookups |= Q(**{name: getattr(instance, name) for name in self.bulk_unique_fields})
+        return [instance for instance in instances if instance.pk is not None] + list(self.queryset.filter(lookups))
+
+    def get_bulk_response(self, instances, errors, status, verb):
+        data = {"ids": [instance.pk for instance in instances]}
+        if errors:
+            data["errors"] = errors
+        if not instances:
+            status = 400
+        return self.response(status=status, data=data, message=f"{verb} {len(instances)} successful")
+
+    @action(
+        detail=False,
+        methods=["POST"],
+        url_name="bulk-create",
+        serializer_class=BulkWriteSerializer,
+        permission_classes=[IsAdminUser],
+    )
+    def bulk_create(self, request):
+        """
+        Create many rows with batched INSERT queries in one transaction
+        example: POST /users/bulk_create/ {"items": [{"name": "a"}, {"name": "b"}], "partial": true}
+        """
+        payload = self.get_bulk_payload(request)
+        model_class = self.queryset.model
+        if payload["upsert"] and not self.bulk_unique_fields:
+            raise ValidationError({"upsert": "Upsert is not enabled for this resource."})
+
+        upsert_fields = self.bulk_unique_fields if payload["upsert"] else ()
+        valid, errors = self.validate_bulk_items(
+            payload["items"], partial=payload["partial"], upsert_fields=upsert_fields
+        )
+        many_to_many = [bulk_write.pop_many_to_many(model_class, data) for _, data, _ in valid]
+        instances = [model_class(**data) for _, data, _ in valid]
+
+        options = {"batch_size": self.bulk_batch_size}
+        if payload["upsert"]:
+            written_fields = {name for _, data, _ in valid for name in data}
+            # Conflicting rows are updated, their auto_now fields too
+            written_fields.update(field.name for field in minimal_update.get_auto_now_fields(model_class))
+            update_fields = [name for name in written_fields if name not in self.bulk_unique_fields]
+            if update_fields:
+                options.update(
+                    update_conflicts=True, unique_fields=self.bulk_unique_fields, update_fields=update_fields
+                )
+            else:
+                # Nothing to update besides the unique fields, conflicting rows are kept as they are
+                options["ignore_conflicts"] = True
+        if instances:
+            try:
+                with transaction.atomic(using=router.db_for_write(model_class)):
+                    instances = self.queryset.bulk_create(instances, **options)
+                    bulk_write.set_many_to_many(model_class, instances, many_to_many, self.bulk_batch_size)
+                    rows = self.get_bulk_created_rows(instances)
+                    self.update_search_index(rows)
+                    self.record_changes(rows)
+            except IntegrityError:
+                # A row written concurrently since validation
+                raise ValidationError({"items": "The items conflict with existing rows."})
+            self.invalidate_cache()
+        return self.get_bulk_response(instances, errors, 201, "Create")
+
+    @action(
+        detail=False,
+        methods=["PATCH"],
+        url_name="bulk-update",
+        serializer_class=BulkWriteSerializer,
+        permission_classes=[IsAdminUser],
+    )
+    def bulk_update(self, request):
+        """
+        Update many rows with batched UPDATE queries in one transaction, each item holds its id and the fields to change
+        example: PATCH /users/bulk_update/ {"items": [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]}
+        """
+        payload = self.get_bulk_payload(request)
+        model_class = self.queryset.model
+        pk_field = model_class._meta.pk
+        ids = []
+        for item in payload["items"]:
+            try:
+                ids.append(pk_field.to_python(item.get(pk_field.name)))
+            except DjangoValidationError:
+                pass
+        instances = self.queryset.in_bulk([pk for pk in ids if pk is not None])
+
+        valid, errors = self.validate_bulk_items(payload["items"], instances=instances, partial=payload["partial"])
+        updated = []
+        many_to_many = []
+        fields = set()
+        for _, data, instance in valid:
+            many_to_many.append(bulk_write.pop_many_to_many(model_class, data))
+            for name, value in data.items():
+                setattr(instance, name, value)
+                fields.add(name)
+            updated.append(instance)
+        # bulk_update doesn't call pre_save, refresh the auto_now fields like save() does
+        for field in minimal_update.get_auto_now_fields(model_class):
+            for instance in updated:
+                field.pre_save(instance, add=False)
+            fields.add(field.name)
+
+        if updated:
+            try:
+                with transaction.atomic(using=router.db_for_write(model_class)):
+                    if fields:
+                        self.queryset.bulk_update(updated, list(fields), batch_size=self.bulk_batch_size)
+                    bulk_write.set_many_to_many(model_class, updated, many_to_many, self.bulk_batch_size)
+                    if self.search_index is not None and fields & set(self.search_index.fields):
+                        self.update_search_index(updated)
+                    self.record_changes(updated)
+            except IntegrityError:
+                raise ValidationError({"items": "The items conflict with existing rows."})
+            self.invalidate_cache()
+        return self.get_bulk_response(updated, errors, 200, "Update")
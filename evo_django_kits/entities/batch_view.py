@@ -0,0 +1,244 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+from io import BytesIO
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections, transaction
+from django.urls import Resolver404
+from loguru import logger
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.views import APIView
+
+from evo_django_kits.entities.evo_response import EvoResponse
+from evo_django_kits.entities.renderers import get_renderer_classes
+from evo_django_kits.entities.serializers.batch_serializer import BatchSerializer
+
+# Headers of the batch request that describe its own body or URL, replaced for each sub-request
+REQUEST_META_OVERRIDES = ("CONTENT_TYPE", "CONTENT_LENGTH", "QUERY_STRING", "PATH_INFO", "REQUEST_METHOD")
+
+TIMEOUT_DETAIL = "Batch time budget exceeded"
+
+
+class BatchView(APIView):
+    """
+    ``POST /batch/`` runs many API calls in one round-trip:
+    ``{"requests": [{"method": "GET", "path": "students/", "query": {"page": 2}}, ...], "atomic": false}``
+
+    Sub-requests are resolved against the router's URLs and dispatched in-process with the batch's
+    authenticated user, skipping HTTP, middleware and authentication. Consecutive reads run concurrently
+    (async viewsets on the event loop, the others in a bounded thread pool), writes run one at a time in order.
+    ``atomic`` runs everything in one transaction, rolled back at the first failing sub-request.
+
+    Limits: ``max_requests`` per batch (settings.EVO_BATCH_MAX_REQUESTS, 20), ``max_workers`` threads
+    (EVO_BATCH_MAX_WORKERS, 4) and a ``timeout`` in seconds (EVO_BATCH_TIMEOUT, 10) after which the remaining
+    sub-requests, those of a concurrent group still waiting for a thread included, are answered with 503
+    instead of being run.
+    """
+
+    renderer_classes = get_renderer_classes()
+
+    # Set by EvoRouter.get_paths: the resolver of the URLs sub-requests are run against and their mount point
+    resolver = None
+    prefix = ""
+
+    max_requests = None
+    max_workers = None
+    timeout = None
+
+    def get_limit(self, name, setting, default):
+        value = getattr(self, name)
+        return value if value is not None else getattr(settings, setting, default)
+
+    def post(self, request, *args, **kwargs):
+        max_requests = self.get_limit("max_requests", "EVO_BATCH_MAX_REQUESTS", 20)
+        serializer = BatchSerializer(data=request.data, context={"max_requests": max_requests})
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data["requests"]
+        message = f"Batch of {len(items)} requests"
+
+        if not serializer.validated_data["atomic"]:
+            results, cookies = self.run_requests(request, items)
+            return self.get_batch_response({"responses": results}, cookies, message)
+
+        with transaction.atomic():
+            results, cookies = self.run_requests(request, items, stop_on_error=True)
+            committed = all(result["status"] < 400 for result in results)
+            if not committed:
+                transaction.set_rollback(True)
+        return self.get_batch_response({"responses": results, "committed": committed}, cookies, message)
+
+    def get_batch_response(self, data, cookies, message):
+        response = EvoResponse(data=data, message=message)
+        # The cookies set by the sub-responses reach the client
+        response.cookies.update(cookies)
+        return response
+
+    def run_requests(self, request, items, stop_on_error=False):
+        """
+        Run the sub-requests, by groups of consecutive reads (one request per group with ``stop_on_error``).
+        Returns their results and the cookies the sub-responses set.
+        """
+        deadline = time.monotonic() + self.get_limit("timeout", "EVO_BATCH_TIMEOUT", 10)
+        cookies = SimpleCookie()
+        results = [None] * len(items)
+        for group in get_request_groups(items, concurrent=not stop_on_error and self.can_run_concurrently()):
+            failed = stop_on_error and any(result is not None and result["status"] >= 400 for result in results)
+            if failed or time.monotonic() > deadline:
+                status, detail = (
+                    (424, "Not run, an earlier request of the atomic batch failed") if failed else (503, TIMEOUT_DETAIL)
+                )
+                for index in group:
+                    results[index] = {"id": items[index].get("id"), "status": status, "body": {"detail": detail}}
+                continue
+
+            # Cookies set by earlier sub-responses (read replica pinning...) are sent with the following ones
+            sub_cookies = {**request.COOKIES, **{key: morsel.value for key, morsel in cookies.items()}}
+            sub_requests = [self.build_request(request, items[index], sub_cookies) for index in group]
+            for index, response in zip(group, self.run_group(sub_requests, deadline)):
+                results[index] = {"id": items[index].get("id"), **get_result(response)}
+                cookies.update(response.cookies)
+        return results, cookies
+
+    def can_run_concurrently(self):
+        # Other connections can't see the writes of an open transaction (ATOMIC_REQUESTS, tests...)
+        if self.get_limit("max_workers", "EVO_BATCH_MAX_WORKERS", 4) <= 1:
+            return False
+        return not any(connections[alias].in_atomic_block for alias in connections)
+
+    def build_request(self, request, item, cookies):
+        """A WSGIRequest of the sub-request carrying the batch request's headers and authentication"""
+        url = urlsplit(item["path"])
+        path = url.path.lstrip("/")
+        prefix = self.prefix.lstrip("/")
+        if prefix:
+            path = path.removeprefix(prefix)
+        query = parse_qsl(url.query, keep_blank_values=True)
+        for key, values in item["query"].items():
+            query.extend((key, value) for value in (values if isinstance(values, list) else [values]))
+        body = b"" if item["body"] is None else json.dumps(item["body"], cls=JSONEncoder).encode()
+
+        environ = {key: value for key, value in request.META.items() if key not in REQUEST_META_OVERRIDES}
+        environ.update(
+            {
+                "REQUEST_METHOD": item["method"],
+                "PATH_INFO": f"/{prefix}{path}",
+                "QUERY_STRING": urlencode(query),
+                "CONTENT_TYPE": "application/json",
+                "CONTENT_LENGTH": str(len(body)),
+                "wsgi.input": BytesIO(body),
+            }
+        )
+        sub_request = WSGIRequest(environ)
+        sub_request.COOKIES = cookies
+        # Authenticated once for the whole batch
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+        sub_request.evo_batch_path = path
+        return sub_request
+
+    def run_group(self, sub_requests, deadline=None):
+        """
+        Responses of a group of sub-requests, async views gathered on the event loop, the others in threads.
+        Sub-requests starting past the ``deadline`` (a time.monotonic() value) are answered with 503.
+        """
+        if len(sub_requests) == 1:
+            return [self.call_view(sub_requests[0], deadline)]
+
+        matches = [self.resolve(sub_request) for sub_request in sub_requests]
+        responses = [None] * len(sub_requests)
+        async_indexes = [index for index, match in enumerate(matches) if match and iscoroutinefunction(match.func)]
+        sync_indexes = [index for index in range(len(sub_requests)) if index not in async_indexes]
+
+        max_workers = min(self.get_limit("max_workers", "EVO_BATCH_MAX_WORKERS", 4), len(sync_indexes) or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                index: executor.submit(self.call_view_in_thread, sub_requests[index], deadline)
+                for index in sync_indexes
+            }
+            if async_indexes:
+
+                async def gather():
+                    return await asyncio.gather(
+                        *(self.acall_view(sub_requests[index], deadline) for index in async_indexes)
+                    )
+
+                for index, response in zip(async_indexes, async_to_sync(gather)()):
+                    responses[index] = response
+            for index, future in futures.items():
+                responses[index] = future.result()
+        return responses
+
+    def resolve(self, sub_request):
+        try:
+            return self.resolver.resolve(sub_request.evo_batch_path)
+        except Resolver404:
+            return None
+
+    def call_view(self, sub_request, deadline=None):
+        if deadline is not None and time.monotonic() > deadline:
+            return get_error_response(503, TIMEOUT_DETAIL)
+        match = self.resolve(sub_request)
+        if match is None:
+            return get_error_response(404, "Not found.")
+        try:
+            if iscoroutinefunction(match.func):
+                return async_to_sync(match.func)(sub_request, *match.args, **match.kwargs)
+            return match.func(sub_request, *match.args, **match.kwargs)
+        except Exception:
+            logger.exception(f"Batch sub-request {sub_request.method} {sub_request.path} failed")
+            return get_error_response(500, "Server error.")
+
+    async def acall_view(self, sub_request, deadline=None):
+        if deadline is not None and time.monotonic() > deadline:
+            return get_error_response(503, TIMEOUT_DETAIL)
+        match = self.resolve(sub_request)
+        try:
+            return await match.func(sub_request, *match.args, **match.kwargs)
+        except Exception:
+            logger.exception(f"Batch sub-request {sub_request.method} {sub_request.path} failed")
+            return get_error_response(500, "Server error.")
+
+    def call_view_in_thread(self, sub_request, deadline=None):
+        try:
+            return self.call_view(sub_request, deadline)
+        finally:
+            # The pool's threads are discarded with their connections
+            connections.close_all()
+
+
+def get_request_groups(items, concurrent=True):
+    """Indexes of the sub-requests run together: consecutive reads when ``concurrent``, each write on its own"""
+    groups = []
+    for index, item in enumerate(items):
+        is_read = item["method"] in SAFE_METHODS
+        if concurrent and is_read and groups and groups[-1][1]:
+            groups[-1][0].append(index)
+        else:
+            groups.append(([index], concurrent and is_read))
+    return [indexes for indexes, _ in groups]
+
+
+def get_error_response(status, detail):
+    return Response({"detail": detail}, status=status)
+
+
+def get_result(response):
+    """Status, headers and body of a sub-response"""
+    if response.streaming:
+        return {"status": 400, "body": {"detail": "Streaming responses can't be batched."}}
+    if hasattr(response, "data"):
+        body = response.data
+    elif response.get("Content-Type", "").startswith("application/json"):
+        body = json.loads(response.content or b"null")
+    else:
+        body = response.content.decode(response.charset)
+    headers = {key: value for key, value in response.items() if key != "Content-Length"}
+    return {"status": response.status_code, "headers": headers, "body": body}
@@ -0,0 +1,115 @@
+from collections import Counter
+from contextlib import nullcontext
+
+from django.db import router, transaction
+
+
+def pop_many_to_many(model_class, validated_data):
+    """Remove the many-to-many values of validated data, bulk_create / bulk_update can't write them"""
+    return {
+        field.name: validated_data.pop(field.name)
+        for field in model_class._meta.many_to_many
+        if field.name in validated_data
+    }
+
+
+def set_many_to_many(model_class, instances, many_to_many, batch_size=None):
+    """
+    Replace the many-to-many relations of saved instances like ``RelatedManager.set()``, with one delete
+    and one bulk insert on the through table per relation instead of queries per instance.
+    ``many_to_many`` holds the values popped by ``pop_many_to_many``, aligned with ``instances``.
+    """
+    for field in model_class._meta.many_to_many:
+        rows = [
+            (instance, values[field.name]) for instance, values in zip(instances, many_to_many) if field.name in values
+        ]
+        if not rows:
+            continue
+        through = field.remote_field.through
+        source = through._meta.get_field(field.m2m_field_name()).attname
+        target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+        through._default_manager.filter(**{f"{source}__in": [instance.pk for instance, _ in rows]}).delete()
+        through._default_manager.bulk_create(
+            [
+                through(**{source: instance.pk, target: getattr(value, "pk", value)})
+                for instance, values in rows
+                for value in values
+            ],
+            batch_size=batch_size,
+        )
+
+
+def get_unique_field_sets(model_class):
+    """The sets of field names the database keeps unique: unique fields, unique_together and total UniqueConstraints"""
+    opts = model_class._meta
+    field_sets = [(field.name,) for field in opts.concrete_fields if field.unique]
+    field_sets.extend(tuple(names) for names in opts.unique_together)
+    field_sets.extend(tuple(constraint.fields) for constraint in opts.total_unique_constraints)
+    return list(dict.fromkeys(field_sets))
+
+
+def get_unique_value(model_class, name, data, instance=None):
+    """The value a row will hold in a unique field, related rows by primary key, None when unknown"""
+    field = model_class._meta.get_field(name)
+    if name in data:
+        value = data[name]
+        return getattr(value, "pk", value) if field.is_relation else value
+    if instance is None:
+        return None
+    return getattr(instance, field.attname)
+
+
+def find_duplicates(model_class, rows):
+    """
+    Find the rows repeating the unique values of an earlier row, ``rows`` holds ``(validated_data, instance)``
+    pairs, the instance being None for new rows. Returns the duplicated field names by row position.
+    """
+    duplicates = {}
+    for names in get_unique_field_sets(model_class):
+        seen = set()
+        for position, (data, instance) in enumerate(rows):
+            if position in duplicates:
+                continue
+            key = tuple(get_unique_value(model_class, name, data, instance) for name in names)
+            if None in key:
+                # NULLs never conflict, unknown values are left to the database
+                continue
+            if key in seen:
+                duplicates[position] = names
+            else:
+                seen.add(key)
+    return duplicates
+
+
+def delete_chunk(queryset):
+    """
+    Delete the rows of a queryset, returning the deleted counts per model label. QuerySet.delete() runs a
+    single DELETE query, without loading the objects, for models without cascades, signal receivers or
+    generic relations (Collector.can_fast_delete).
+    """
+    _, counts = queryset.delete()
+    return counts
+
+
+def delete_in_chunks(queryset, ids, chunk_size, atomic=True, return_ids=False):
+    """
+    Delete the rows of ``queryset`` with the given primary keys ``chunk_size`` at a time, keeping ``IN`` lists
+    under the database variable limits. With ``atomic`` all the chunks are deleted in one transaction,
+    otherwise each chunk is committed on its own and locks are released between chunks.
+    Returns the deleted counts per model label, cascades included, and with ``return_ids`` the primary keys
+    of the rows deleted (None otherwise), which costs a SELECT per chunk.
+    """
+    using = router.db_for_write(queryset.model)
+    counts = Counter()
+    deleted_ids = [] if return_ids else None
+    with transaction.atomic(using=using) if atomic else nullcontext():
+        for start in range(0, len(ids), chunk_size):
+            chunk_queryset = queryset.filter(pk__in=ids[start : start + chunk_size])
+            with nullcontext() if atomic else transaction.atomic(using=using):
+                if return_ids:
+                    # Ids that don't exist or are filtered out of the queryset aren't deleted
+                    chunk_ids = list(chunk_queryset.values_list("pk", flat=True))
+                    deleted_ids.extend(chunk_ids)
+                    chunk_queryset = queryset.filter(pk__in=chunk_ids)
+                counts.update(delete_chunk(chunk_queryset))
+    return {label: count for label, count in counts.items() if count}, deleted_ids
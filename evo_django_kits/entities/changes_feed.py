@@ -0,0 +1,188 @@
+import base64
+import json
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ValidationError
+from django.db import models, router
+from django.db.models import Max, Q
+from django.db.models.signals import post_save
+
+_change_feeds = {}
+
+# Log ids are BigAutoField values
+MAX_LOG_ID = 2**63
+
+
+class ChangeFeed:
+    """
+    Incremental changes of a model for sync clients: the rows created or updated and the primary keys of the
+    rows deleted after a cursor, in ordered batches.
+
+    Upserts are read from the model table by ``field`` (an auto_now DateTimeField, ordered by field then pk)
+    or, without a field, from the change log (``evo_django_kits.ChangeLogEntry``, written on post_save and by
+    the bulk actions of BaseViewSet). Tombstones are logged by the destroy and bulk_delete actions, rows
+    removed by cascades or outside the API leave none.
+
+    Log ids and timestamps are allocated before the transaction commits: a long transaction can commit
+    changes behind a cursor already handed out. Clients catch up on them with the next full sync.
+    """
+
+    def __init__(self, model_class, field=None):
+        self.model_class = model_class
+        self.label = model_class._meta.label_lower
+        self.field = field
+        if field is not None:
+            try:
+                model_field = model_class._meta.get_field(field)
+            except FieldDoesNotExist:
+                model_field = None
+            if not isinstance(model_field, models.DateTimeField):
+                raise ImproperlyConfigured(
+                    f"The changes field of {model_class.__name__} must be a DateTimeField, got '{field}'"
+                )
+
+    def is_valid_cursor(self, cursor):
+        """Whether a decoded cursor holds a position of this feed, positions of another feed can't be queried"""
+        if not 0 <= cursor["log"] < MAX_LOG_ID:
+            return False
+        if self.field is None or cursor.get("at") is None:
+            return True
+        try:
+            at = self.model_class._meta.get_field(self.field).to_python(cursor["at"])
+            pk = self.model_class._meta.pk.to_python(cursor.get("pk"))
+        except (TypeError, ValueError, ValidationError):
+            return False
+        return at is not None and pk is not None
+
+    @property
+    def log(self):
+        return get_change_log_model().objects
+
+    def record(self, upserted_pks=(), deleted_pks=(), using=None):
+        """Log the upserted rows (only read from the log without a field) and the tombstones of the deleted ones"""
+        ChangeLogEntry = get_change_log_model()
+        entries = [ChangeLogEntry(model=self.label, object_pk=str(pk), deleted=True) for pk in deleted_pks]
+        if self.field is None:
+            entries = [ChangeLogEntry(model=self.label, object_pk=str(pk)) for pk in upserted_pks] + entries
+        if entries:
+            self.log.using(using or router.db_for_write(self.model_class)).bulk_create(entries)
+
+    def get_head(self, queryset):
+        """The cursor of the latest change, where a client that just downloaded the collection starts from"""
+        entries = self.log.using(queryset.db).filter(model=self.label)
+        if self.field is None:
+            return {"log": entries.aggregate(last=Max("id"))["last"] or 0}
+        last_row = queryset.order_by(f"-{self.field}", "-pk").values_list(self.field, "pk").first()
+        return {
+            "log": entries.filter(deleted=True).aggregate(last=Max("id"))["last"] or 0,
+            "at": last_row[0].isoformat() if last_row else None,
+            "pk": last_row[1] if last_row else None,
+        }
+
+    def get_changes(self, queryset, cursor, limit):
+        """``(rows, deleted_pks, next_cursor, has_more)`` of the changes after the cursor, at most ``limit`` each"""
+        if self.field is None:
+            return self.get_logged_changes(queryset, cursor, limit)
+
+        rows = queryset.order_by(self.field, "pk")
+        if cursor.get("at") is not None:
+            rows = rows.filter(
+                Q(**{f"{self.field}__gt": cursor["at"]}) | Q(**{self.field: cursor["at"], "pk__gt": cursor["pk"]})
+            )
+        rows = list(rows[: limit + 1])
+        tombstones = list(
+            self.log.using(queryset.db)
+            .filter(model=self.label, deleted=True, id__gt=cursor["log"])
+            .order_by("id")
+            .values_list("id", "object_pk")[: limit + 1]
+        )
+        has_more = len(rows) > limit or len(tombstones) > limit
+        rows, tombstones = rows[:limit], tombstones[:limit]
+
+        next_cursor = dict(cursor)
+        if rows:
+            next_cursor.update(at=getattr(rows[-1], self.field).isoformat(), pk=rows[-1].pk)
+        if tombstones:
+            next_cursor["log"] = tombstones[-1][0]
+        return rows, self.to_pks(object_pk for _, object_pk in tombstones), next_cursor, has_more
+
+    def get_logged_changes(self, queryset, cursor, limit):
+        entries = list(
+            self.log.using(queryset.db)
+            .filter(model=self.label, id__gt=cursor["log"])
+            .order_by("id")
+            .values_list("id", "object_pk", "deleted")[: limit + 1]
+        )
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+
+        # The last entry of a row wins, rows are returned in the order of their last change
+        latest = {}
+        for _, object_pk, deleted in entries:
+            latest.pop(object_pk, None)
+            latest[object_pk] = deleted
+        upserted = self.to_pks(object_pk for object_pk, deleted in latest.items() if not deleted)
+        positions = {pk: position for position, pk in enumerate(upserted)}
+        # Rows deleted since, or filtered out of the client's queryset, are skipped
+        rows = sorted(queryset.filter(pk__in=upserted).order_by(), key=lambda row: positions[row.pk])
+
+        next_cursor = {"log": entries[-1][0] if entries else cursor["log"]}
+        return rows, self.to_pks(object_pk for object_pk, deleted in latest.items() if deleted), next_cursor, has_more
+
+    def to_pks(self, object_pks):
+        pk_field = self.model_class._meta.pk
+        return [pk_field.to_python(object_pk) for object_pk in object_pks]
+
+    def prune(self, before, using=None):
+        """
+        Delete the log entries written before a datetime. Clients holding an older cursor miss the pruned
+        tombstones and must download the collection again.
+        """
+        using = using or router.db_for_write(self.model_class)
+        return self.log.using(using).filter(model=self.label, created_at__lt=before).delete()[0]
+
+
+def get_change_log_model():
+    # The models of evo_django_kits can't be imported before the apps registry is ready
+    from evo_django_kits.models import ChangeLogEntry
+
+    return ChangeLogEntry
+
+
+def encode_cursor(cursor):
+    return base64.urlsafe_b64encode(json.dumps(cursor, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(value):
+    """The cursor of a ``since`` parameter, None when it isn't a cursor issued by the feed"""
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(value.encode()))
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(cursor, dict) or not isinstance(cursor.get("log"), int) or isinstance(cursor["log"], bool):
+        return None
+    return cursor
+
+
+def get_change_feed(model_class):
+    return _change_feeds.get(model_class)
+
+
+def register_change_feed(model_class, changes):
+    """The changes feed of the ``changes`` option (True for the change log, or a timestamp field), once per model"""
+    if model_class not in _change_feeds:
+        if not apps.is_installed("evo_django_kits"):
+            raise ImproperlyConfigured(
+                f"The changes feed of {model_class.__name__} needs 'evo_django_kits' in INSTALLED_APPS"
+            )
+        feed = ChangeFeed(model_class, field=None if changes is True else changes)
+        _change_feeds[model_class] = feed
+        if feed.field is None:
+            label = model_class._meta.label_lower
+            post_save.connect(_log_saved_instance, sender=model_class, dispatch_uid=f"evo-changes-save-{label}")
+    return _change_feeds[model_class]
+
+
+def _log_saved_instance(sender, instance, using, raw=False, **kwargs):
+    if not raw:
+        _change_feeds[sender].record(upserted_pks=[instance.pk], using=using)
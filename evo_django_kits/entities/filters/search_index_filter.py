@@ -0,0 +1,23 @@
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+
+class SearchIndexFilter(SearchFilter):
+    """
+    ``?search=`` answered by the view's full-text ``search_index`` (see search_index.py), ranked by relevance
+    unless the request asks for an ordering. Falls back to SearchFilter's ``icontains`` lookups on databases
+    without full-text support.
+
+    Must run after OrderingFilter, so the relevance is the first ordering.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_index = getattr(view, "search_index", None)
+        if search_index is None or not search_index.is_supported(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        ordering_param = getattr(view, "ordering_param", api_settings.ORDERING_PARAM)
+        return search_index.search(queryset, terms, rank=not request.query_params.get(ordering_param))
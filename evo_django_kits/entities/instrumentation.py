@@ -0,0 +1,233 @@
+import importlib
+import threading
+import time
+from contextlib import ExitStack, nullcontext
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+PHASES = ("permission", "queryset", "count", "query", "serialize", "render")
+
+# Aggregates of each process by resource, the number of process slots handed out, and the generation the
+# aggregates belong to (replaced by a reset)
+PROCESS_KEY = "evo:perf:process:{slot}"
+PROCESSES_KEY = "evo:perf:processes"
+GENERATION_KEY = "evo:perf:generation"
+
+_disabled = nullcontext()
+_aggregates_lock = threading.Lock()
+# This process' aggregates, only written by this process so no sample is lost to concurrent writers
+_process = {"generation": None, "slot": None, "aggregates": {}}
+
+
+class RequestTimings:
+    """
+    Phase timings and database query stats of one request.
+
+    Phases are exclusive: the time spent in a nested phase (the COUNT query run while paginating)
+    is not counted in the enclosing one.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seconds = None
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.queries = 0
+        self.query_seconds = 0.0
+        # Rows serialized by a list request, to relate the query count to the page size
+        self.rows = None
+        self._stack = []
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_seconds += time.perf_counter() - start
+
+    def capture_queries(self):
+        """Count the queries of every configured database while the context is active"""
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(self.execute_wrapper))
+        return stack
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+
+    def get_server_timing(self):
+        metrics = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items() if seconds]
+        metrics.append(f'db;dur={self.query_seconds * 1000:.2f};desc="{self.queries} queries"')
+        if self.seconds is not None:
+            metrics.append(f"total;dur={self.seconds * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+class _Phase:
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.nested = 0.0
+        self.timings._stack.append(self)
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        stack = self.timings._stack
+        stack.pop()
+        self.timings.phases[self.name] = self.timings.phases.get(self.name, 0.0) + elapsed - self.nested
+        if stack:
+            stack[-1].nested += elapsed
+
+
+def phase(view, name):
+    """Time a phase of the view's request, a no-op when the view isn't instrumented"""
+    timings = getattr(view, "timings", None)
+    if timings is None:
+        return _disabled
+    return timings.phase(name)
+
+
+def empty_aggregate():
+    return {
+        "requests": 0,
+        "seconds": 0.0,
+        "max_seconds": 0.0,
+        "phases": dict.fromkeys(PHASES, 0.0),
+        "queries": 0,
+        "query_seconds": 0.0,
+        # Sums of the (rows, queries) pairs of list requests, for the least squares slope
+        "samples": {"n": 0, "x": 0, "y": 0, "xy": 0, "xx": 0},
+    }
+
+
+def merge_timings(aggregate, timings):
+    aggregate["requests"] += 1
+    aggregate["seconds"] += timings.seconds
+    aggregate["max_seconds"] = max(aggregate["max_seconds"], timings.seconds)
+    for name, seconds in timings.phases.items():
+        aggregate["phases"][name] = aggregate["phases"].get(name, 0.0) + seconds
+    aggregate["queries"] += timings.queries
+    aggregate["query_seconds"] += timings.query_seconds
+    if timings.rows is not None:
+        samples = aggregate["samples"]
+        samples["n"] += 1
+        samples["x"] += timings.rows
+        samples["y"] += timings.queries
+        samples["xy"] += timings.rows * timings.queries
+        samples["xx"] += timings.rows * timings.rows
+    return aggregate
+
+
+def get_queries_per_row(aggregate):
+    """Slope of the query count over the number of rows, None without at least two different page sizes"""
+    samples = aggregate["samples"]
+    denominator = samples["n"] * samples["xx"] - samples["x"] ** 2
+    if samples["n"] < 2 or not denominator:
+        return None
+    return (samples["n"] * samples["xy"] - samples["x"] * samples["y"]) / denominator
+
+
+def merge_aggregates(aggregate, other):
+    aggregate["requests"] += other["requests"]
+    aggregate["seconds"] += other["seconds"]
+    aggregate["max_seconds"] = max(aggregate["max_seconds"], other["max_seconds"])
+    for name, seconds in other["phases"].items():
+        aggregate["phases"][name] = aggregate["phases"].get(name, 0.0) + seconds
+    aggregate["queries"] += other["queries"]
+    aggregate["query_seconds"] += other["query_seconds"]
+    for name, value in other["samples"].items():
+        aggregate["samples"][name] += value
+    return aggregate
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Start from a timestamp so a generation lost to eviction never matches an older one
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def allocate_slot():
+    cache.add(PROCESSES_KEY, 0, timeout=None)
+    try:
+        return cache.incr(PROCESSES_KEY)
+    except ValueError:
+        # Evicted or reset in between
+        cache.add(PROCESSES_KEY, 0, timeout=None)
+        return cache.incr(PROCESSES_KEY)
+
+
+def record_request(resource, timings):
+    """
+    Merge the timings of a request into the aggregate of its resource, then hand them to the configured sink
+    with this process' aggregate. Each process keeps its aggregates and publishes them under its own key of
+    the Django cache, ``get_aggregates`` merges the processes so the ``evo_perf_report`` command sees them
+    all (use a shared cache backend in production).
+    """
+    with _aggregates_lock:
+        generation = get_generation()
+        if _process["generation"] != generation:
+            # First request of the process or the aggregates were reset
+            _process.update(generation=generation, slot=allocate_slot(), aggregates={})
+        aggregates = _process["aggregates"]
+        aggregate = merge_timings(aggregates.setdefault(resource, empty_aggregate()), timings)
+        cache.set(PROCESS_KEY.format(slot=_process["slot"]), aggregates, timeout=None)
+
+    sink = get_sink()
+    if sink is not None:
+        sink(resource, timings, aggregate)
+    return aggregate
+
+
+def get_process_keys():
+    return [PROCESS_KEY.format(slot=slot) for slot in range(1, (cache.get(PROCESSES_KEY) or 0) + 1)]
+
+
+def get_aggregates():
+    """The aggregates of every process merged by resource"""
+    merged = {}
+    for aggregates in cache.get_many(get_process_keys()).values():
+        for resource, aggregate in aggregates.items():
+            merge_aggregates(merged.setdefault(resource, empty_aggregate()), aggregate)
+    return merged
+
+
+def reset_aggregates():
+    # Processes start new aggregates when they see the generation changed
+    cache.delete_many([*get_process_keys(), PROCESSES_KEY, GENERATION_KEY])
+
+
+def get_sink():
+    """
+    ``settings.EVO_INSTRUMENTATION_SINK``: a callable ``(resource, timings, aggregate)``, a logger
+    (anything with an ``info`` method, e.g. loguru's), or the dotted path of either.
+    """
+    sink = getattr(settings, "EVO_INSTRUMENTATION_SINK", None)
+    if isinstance(sink, str):
+        module_name, _, attr = sink.rpartition(".")
+        sink = getattr(importlib.import_module(module_name), attr)
+    if sink is not None and hasattr(sink, "info"):
+        return _LoggerSink(sink)
+    return sink
+
+
+class _LoggerSink:
+    def __init__(self, logger):
+        self.logger = logger
+
+    def __call__(self, resource, timings, aggregate):
+        self.logger.info(
+            f"{resource} {timings.seconds * 1000:.1f}ms {timings.queries} queries "
+            f"({timings.get_server_timing()}), {aggregate['requests']} requests "
+            f"avg {aggregate['seconds'] / aggregate['requests'] * 1000:.1f}ms"
+        )
@@ -0,0 +1,73 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models.signals import post_save, pre_save
+
+
+def get_auto_now_fields(model_class):
+    return [field for field in model_class._meta.concrete_fields if getattr(field, "auto_now", False)]
+
+
+def get_column_field(model_class, name):
+    """The model field of a column a value can be compared and written with an UPDATE, None for anything else"""
+    try:
+        field = model_class._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    # Uploaded files are stored by save(), their names can't tell whether the file changed
+    if not field.concrete or field.many_to_many or isinstance(field, models.FileField):
+        return None
+    return field
+
+
+def has_custom_save(model_class):
+    return model_class.save is not models.Model.save
+
+
+def can_update_without_fetch(model_class):
+    """Whether a row can be updated without calling save(): no save() override, no pre_save / post_save receiver"""
+    return (
+        not has_custom_save(model_class)
+        and not pre_save.has_listeners(model_class)
+        and not post_save.has_listeners(model_class)
+    )
+
+
+def set_changed_fields(instance, validated_data):
+    """
+    Set validated data on an instance, returning the names of the fields whose value changed, or None when
+    a value isn't a column (a property, a file...) and the instance must be saved whole.
+    """
+    model_class = type(instance)
+    changed = []
+    comparable = True
+    for name, value in validated_data.items():
+        field = get_column_field(model_class, name)
+        if field is None:
+            setattr(instance, name, value)
+            comparable = False
+            continue
+        # Compared by attname: a foreign key changes when the related row does, not the related instance
+        previous = getattr(instance, field.attname)
+        setattr(instance, name, value)
+        if getattr(instance, field.attname) != previous:
+            changed.append(field.name)
+    return changed if comparable else None
+
+
+def get_update_values(instance, validated_data):
+    """
+    The column values of an UPDATE writing validated data, auto_now fields included, set on the instance too.
+    None when a value isn't a column.
+    """
+    model_class = type(instance)
+    values = {}
+    for name, value in validated_data.items():
+        field = get_column_field(model_class, name)
+        if field is None:
+            return None
+        setattr(instance, name, value)
+        values[field.attname] = getattr(instance, field.attname)
+    if values:
+        for field in get_auto_now_fields(model_class):
+            values[field.attname] = field.pre_save(instance, add=False)
+    return values
@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import Counter
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.fields.related import lazy_related_operation
+from django.db.models.signals import m2m_changed, post_save
+
+VERSION_KEY = "evo:model-version:{label}"
+
+# Number of version bumps per model label in this process
+version_bumps = Counter()
+_version_bumps_lock = threading.Lock()
+
+
+def get_model_version(model_class):
+    """
+    Current version of a model's data, shared by all processes through the Django cache.
+    Cache entries keyed with it are invalidated by bumping the version.
+    """
+    key = VERSION_KEY.format(label=model_class._meta.label_lower)
+    version = cache.get(key)
+    if version is None:
+        # Start from a timestamp so a version lost to eviction never matches older entries again
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_model_version(model_class):
+    label = model_class._meta.label_lower
+    with _version_bumps_lock:
+        version_bumps[label] += 1
+
+    key = VERSION_KEY.format(label=label)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+# Models whose versions are bumped by the signal receivers below
+_tracked_models = set()
+
+
+def _bump_sender_version(sender, **kwargs):
+    bump_model_version(sender)
+
+
+def _bump_m2m_versions(sender, instance, action, model, **kwargs):
+    # Both sides of the relation render it, the through model isn't known before the apps are ready
+    if action.startswith("post_"):
+        for model_class in {type(instance), model}:
+            if model_class in _tracked_models:
+                bump_model_version(model_class)
+
+
+def is_tracked(model_class):
+    return model_class in _tracked_models
+
+
+def track_model_writes(model_class):
+    """
+    Bump the model version whenever a row is saved or one of its many-to-many relations is written.
+    Deletes aren't tracked with a post_delete receiver, which would make QuerySet.delete() load every row
+    (no fast delete): the viewsets bump the versions of the models they delete, cascades included
+    (see bump_deleted_versions), deletes outside them must call bump_model_version.
+    """
+    label = model_class._meta.label_lower
+    _tracked_models.add(model_class)
+    post_save.connect(_bump_sender_version, sender=model_class, dispatch_uid=f"evo-model-version-save-{label}")
+    m2m_changed.connect(_bump_m2m_versions, dispatch_uid="evo-model-version-m2m")
+
+
+def bump_deleted_versions(deleted, exclude=None):
+    """Bump the versions of the tracked models in the deleted counts by label of QuerySet.delete()"""
+    for label, count in deleted.items():
+        model_class = apps.get_model(label)
+        if count and model_class is not exclude and is_tracked(model_class):
+            bump_model_version(model_class)
+
+
+def on_related_models(model_class, path, function):
+    """
+    Call ``function`` with each model a dotted path goes through, once its class is loaded:
+    Campus then University for ``"campus.university.name"`` on Student
+    """
+    name, _, rest = path.partition(".")
+    try:
+        field = model_class._meta.get_field(name)
+    except FieldDoesNotExist:
+        # Reverse relations aren't known before the app registry is ready
+        return
+    # A generic foreign key has no remote field, related_model needs the app registry ready
+    if not field.is_relation or field.remote_field is None:
+        return
+
+    def on_model(model_class, related_model):
+        function(related_model)
+        if rest:
+            on_related_models(related_model, rest, function)
+
+    lazy_related_operation(on_model, model_class, field.remote_field.model)
+
+
+def track_related_writes(model_class, paths):
+    """Track the writes of the related models read through dotted paths, their versions key cached responses"""
+    for path in paths:
+        on_related_models(model_class, path, track_model_writes)
+
+
+def get_related_models(model_class, paths):
+    """The related models read through dotted paths, once the models are loaded (the callbacks then run at once)"""
+    models = []
+    for path in paths:
+        on_related_models(model_class, path, lambda related_model: models.append(related_model))
+    return list(dict.fromkeys(model for model in models if model is not model_class))
@@ -1 +1,8 @@
+from .evo_cursor_pagination import EvoCursorPagination
 from .evo_page_number_pagination import EvoPageNumberPagination
+
+# Pagination classes selectable with @rest_api(pagination=...)
+PAGINATION_CLASSES = {
+    "page": EvoPageNumberPagination,
+    "cursor": EvoCursorPagination,
+}
@@ -0,0 +1,79 @@
+import hashlib
+
+from django.core.cache import cache
+from django.db import connections
+
+from evo_django_kits.entities.model_version import get_model_version
+
+COUNT_STRATEGIES = ("exact", "cached", "estimated", "none")
+
+COUNT_CACHE_KEY = "evo:count:{label}:{version}:{params}"
+
+
+def get_exact_count(queryset):
+    """Return ``(count, exact)``"""
+    return queryset.count(), True
+
+
+def get_count_cache_key(queryset, query_params, ignored_params=()):
+    """Key a count by model, model version and the normalized filter / search query string"""
+    params = sorted(
+        (key, sorted(query_params.getlist(key))) for key in query_params.keys() if key not in ignored_params
+    )
+    params_hash = hashlib.md5(repr(params).encode(), usedforsecurity=False).hexdigest()
+    return COUNT_CACHE_KEY.format(
+        label=queryset.model._meta.label_lower, version=get_model_version(queryset.model), params=params_hash
+    )
+
+
+def get_cached_count(queryset, query_params, timeout, ignored_params=()):
+    """
+    Count stored in the Django cache, invalidated through the model version when the model is written
+    (see ``model_version.track_model_writes``). Counts served from the cache are reported as not exact.
+    """
+    key = get_count_cache_key(queryset, query_params, ignored_params)
+    count = cache.get(key)
+    if count is not None:
+        return count, False
+    count = queryset.count()
+    cache.set(key, count, timeout)
+    return count, True
+
+
+def is_unfiltered(queryset):
+    query = queryset.query
+    return not (query.where or query.distinct or query.combinator or query.is_sliced)
+
+
+def estimate_table_rows(model_class, using):
+    """Row count estimate from the database statistics, None when the backend has none"""
+    connection = connections[using]
+    table = model_class._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+        elif connection.vendor == "mysql":
+            cursor.execute(
+                "SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+                [table],
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    # Tables never analyzed report -1 (or 0 before Postgres 14)
+    if row is None or row[0] is None or row[0] <= 0:
+        return None
+    return int(row[0])
+
+
+def get_estimated_count(queryset, exact_threshold=1000):
+    """
+    Database statistics estimate for unfiltered querysets, exact count for filtered ones,
+    small tables and backends without statistics (SQLite).
+    """
+    if not is_unfiltered(queryset):
+        return get_exact_count(queryset)
+    estimate = estimate_table_rows(queryset.model, queryset.db)
+    if estimate is None or estimate < exact_threshold:
+        return get_exact_count(queryset)
+    return estimate, False
@@ -0,0 +1,239 @@
+import base64
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder keeping the microseconds of datetimes and times, a position rounded down repeats rows"""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class EvoCursorPagination(BasePagination):
+    """
+    Keyset pagination: pages are located with a WHERE clause on the ordering columns instead of an OFFSET,
+    so page 10,000 costs the same as page 1, and no COUNT(*) is run.
+
+    The ordering comes from the view (``?ordering=`` when the view uses OrderingFilter, then ``view.ordering``)
+    and the primary key is appended as tie-breaker. Ordering fields are expected to be non nullable.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    # Used when the view doesn't declare any ordering
+    ordering = ("-pk",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset for async views, the page is fetched with the async ORM"""
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view):
+        """Queryset of the requested page plus one row telling whether there is a next page"""
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.request = request
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.position, self.reverse = self.decode_cursor(request)
+        if self.position is not None:
+            self.position = self.clean_position(self.position, queryset.model)
+
+        if queryset._fields is not None:
+            # values() rows (fast read) need the ordering columns to build the cursors
+            missing = [field.lstrip("-") for field in self.ordering if field.lstrip("-") not in queryset._fields]
+            queryset = queryset.values(*queryset._fields, *missing)
+
+        queryset = queryset.order_by(*(self.invert_ordering(self.ordering) if self.reverse else self.ordering))
+        if self.position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(self.position, self.reverse))
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if self.reverse:
+            rows.reverse()
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": None,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "page_size": self.page_size,
+                "results": data,
+            }
+        )
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param], strict=True, cutoff=self.max_page_size
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_ordering(self, request, queryset, view):
+        """Resolve the view ordering and append the primary key as tie-breaker"""
+        ordering = None
+        for backend in getattr(view, "filter_backends", []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        if not ordering:
+            ordering = getattr(view, "ordering", None) or self.ordering
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+
+        for field in ordering:
+            if not isinstance(field, str):
+                raise ImproperlyConfigured(
+                    f"{self.__class__.__name__} only supports field name orderings, got {field!r}"
+                )
+
+        pk_names = ("pk", queryset.model._meta.pk.name)
+        ordering = list(ordering)
+        if not any(field.lstrip("-") in pk_names for field in ordering):
+            ordering.append("pk")
+        return ordering
+
+    @staticmethod
+    def invert_ordering(ordering):
+        return [field[1:] if field.startswith("-") else f"-{field}" for field in ordering]
+
+    def get_keyset_filter(self, position, reverse):
+        """
+        Rows strictly after (or before, when reverse) the position in the ordering:
+        ``a > x OR (a = x AND b > y) OR ...``, with a leading ``a >= x`` bound so the first
+        ordering column can be used for an index range scan.
+        """
+        keyset = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            descending = field.startswith("-") != reverse
+            keyset |= equal & Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+            equal &= Q(**{name: value})
+
+        first = self.ordering[0]
+        first_descending = first.startswith("-") != reverse
+        return Q(**{f"{first.lstrip('-')}__{'lte' if first_descending else 'gte'}": position[0]}) & keyset
+
+    def get_position(self, row):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            if isinstance(row, dict):
+                position.append(row[name])
+                continue
+            value = row
+            for attr in name.split(LOOKUP_SEP):
+                value = getattr(value, attr)
+            position.append(value)
+        return position
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps([position, reverse], cls=CursorEncoder, separators=(",", ":"))
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """Return the ``(position, reverse)`` of the requested cursor"""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            position, reverse = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(reverse)
+
+    def get_ordering_field(self, model, name):
+        """Model field of an ordering, following relations (``campus__name``), None when it isn't a field"""
+        field = None
+        for attr in name.split(LOOKUP_SEP):
+            if field is not None:
+                model = field.related_model
+                if model is None:
+                    return None
+            try:
+                field = model._meta.pk if attr == "pk" else model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                return None
+        if field.is_relation and field.related_model is not None and not field.many_to_many:
+            # Ordering on a foreign key orders on the related primary key
+            field = field.target_field
+        return field
+
+    def clean_position(self, position, model):
+        """Convert the values of a decoded position to their fields' types, a tampered cursor is a 404"""
+        cleaned = []
+        for ordering, value in zip(self.ordering, position):
+            if isinstance(value, (list, dict)):
+                # CharField.to_python() would turn any JSON value into a string
+                raise NotFound(self.invalid_cursor_message)
+            field = self.get_ordering_field(model, ordering.lstrip("-"))
+            if field is None:
+                cleaned.append(value)
+                continue
+            try:
+                value = field.to_python(value)
+            except (TypeError, ValueError, DjangoValidationError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                # Ordering fields are expected to be non nullable, the keyset filter can't compare None
+                raise NotFound(self.invalid_cursor_message)
+            cleaned.append(value)
+        return cleaned
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
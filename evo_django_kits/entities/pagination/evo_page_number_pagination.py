@@ -1,5 +1,15 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import InvalidPage, Page
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from evo_django_kits.entities import instrumentation
+
+from .count_strategies import COUNT_STRATEGIES, get_cached_count, get_estimated_count, get_exact_count
 
 
 class EvoPageNumberPagination(PageNumberPagination):
@@ -9,14 +19,162 @@ class EvoPageNumberPagination(PageNumberPagination):
     max_page_size = 100
     last_page_strings = ("last",)
 
-    def get_paginated_response(self, data):
-        return Response(
-            {
-                "count": self.page.paginator.count,
-                "next": self.get_next_link(),
-                "previous": self.get_previous_link(),
-                "page": self.page.number,
-                "page_size": self.page_size,
-                "results": data,
-            }
+    # "exact", "cached", "estimated" or "none", defaults to the view's count_strategy
+    # then settings.EVO_PAGINATION_COUNT
+    count_strategy = None
+    # Seconds a cached count is kept, the view's count_cache_timeout takes precedence
+    count_cache_timeout = 60
+    # Tables with fewer estimated rows are counted exactly
+    estimated_count_threshold = 1000
+
+    def get_count_strategy(self, view):
+        strategy = (
+            getattr(view, "count_strategy", None)
+            or self.count_strategy
+            or getattr(settings, "EVO_PAGINATION_COUNT", "exact")
+        )
+        if strategy not in COUNT_STRATEGIES:
+            raise ImproperlyConfigured(f"Unknown count strategy '{strategy}', expected one of {COUNT_STRATEGIES}")
+        return strategy
+
+    def get_count(self, queryset, strategy):
+        """Return ``(count, exact)`` with the given strategy"""
+        if strategy == "cached":
+            ignored_params = (self.page_query_param, self.page_size_query_param)
+            timeout = getattr(self.view, "count_cache_timeout", None) or self.count_cache_timeout
+            return get_cached_count(queryset, self.request.query_params, timeout, ignored_params)
+        if strategy == "estimated":
+            return get_estimated_count(queryset, self.estimated_count_threshold)
+        return get_exact_count(queryset)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.strategy = self.get_count_strategy(view)
+        with instrumentation.phase(view, "count"):
+            self.count, self.count_exact = (
+                (None, False) if self.strategy == "none" else self.get_count(queryset, self.strategy)
+            )
+
+        paginator = self.get_paginator(queryset, page_size)
+        if self.count_exact:
+            page_number = self.get_exact_page_number(request, paginator)
+            self.page = paginator.page(page_number)
+            self.has_next_page = self.page.has_next()
+        else:
+            page_number = self.get_window_page_number(request, paginator)
+            bottom = (page_number - 1) * page_size
+            rows = list(queryset[bottom : bottom + page_size + 1])
+            self.page = self.get_page_window(rows, page_number, paginator, page_size)
+
+        return self.get_page_rows()
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset for async views, the count and the page are fetched with the async ORM"""
+        self.request = request
+        self.view = view
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.strategy = self.get_count_strategy(view)
+        if self.strategy == "none":
+            self.count, self.count_exact = None, False
+        elif self.strategy == "exact":
+            self.count, self.count_exact = await queryset.acount(), True
+        else:
+            # Cached counts and estimates also read the cache / database statistics
+            self.count, self.count_exact = await sync_to_async(self.get_count)(queryset, self.strategy)
+
+        paginator = self.get_paginator(queryset, page_size)
+        page_number = (
+            self.get_exact_page_number(request, paginator)
+            if self.count_exact
+            else self.get_window_page_number(request, paginator)
         )
+        bottom = (page_number - 1) * page_size
+        if self.count_exact:
+            rows = [row async for row in queryset[bottom : bottom + page_size]]
+            self.page = Page(rows, page_number, paginator)
+            self.has_next_page = self.page.has_next()
+        else:
+            rows = [row async for row in queryset[bottom : bottom + page_size + 1]]
+            self.page = self.get_page_window(rows, page_number, paginator, page_size)
+
+        return self.get_page_rows()
+
+    def get_paginator(self, queryset, page_size):
+        paginator = self.django_paginator_class(queryset, page_size)
+        if self.count is not None:
+            paginator.count = self.count
+        return paginator
+
+    def get_page_rows(self):
+        if self.template is not None and (self.has_next_page or self.page.number > 1):
+            self.display_page_controls = True
+        return list(self.page)
+
+    def get_exact_page_number(self, request, paginator):
+        page_number = self.get_page_number(request, paginator)
+        try:
+            return paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+    def get_window_page_number(self, request, paginator):
+        """Validate the page number without relying on the count, which is approximate or unknown"""
+        page_number = request.query_params.get(self.page_query_param) or 1
+        if page_number in self.last_page_strings:
+            if self.count is None:
+                raise NotFound(self.invalid_page_message.format(page_number=page_number, message="Unknown count"))
+            page_number = paginator.num_pages
+        try:
+            page_number = int(page_number)
+            if page_number < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message="Invalid page"))
+        return page_number
+
+    def get_page_window(self, rows, page_number, paginator, page_size):
+        """
+        Build a page without relying on the count: page_size + 1 rows are read to tell whether there is a next page.
+        """
+        if not rows and page_number > 1:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message="That page is empty"))
+
+        self.has_next_page = len(rows) > page_size
+        return Page(rows[:page_size], page_number, paginator)
+
+    def get_next_link(self):
+        if not self.has_next_page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page.number + 1)
+
+    def get_previous_link(self):
+        if self.page.number <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page.number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page.number - 1)
+
+    def get_paginated_response(self, data):
+        response = {
+            "count": self.count,
+            "count_exact": self.count_exact,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "page": self.page.number,
+            "page_size": self.page_size,
+            "results": data,
+        }
+        if self.strategy == "none":
+            del response["count"]
+        return Response(response)
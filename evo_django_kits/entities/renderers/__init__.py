@@ -0,0 +1,19 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from .evo_json_renderer import EvoJSONRenderer
+from .evo_msgpack_renderer import EvoMessagePackRenderer, msgpack
+
+
+def get_renderer_classes():
+    """
+    The default renderers of DRF with EvoJSONRenderer in place of JSONRenderer,
+    and EvoMessagePackRenderer when msgpack is installed
+    """
+    renderer_classes = [
+        EvoJSONRenderer if renderer_class is JSONRenderer else renderer_class
+        for renderer_class in api_settings.DEFAULT_RENDERER_CLASSES
+    ]
+    if msgpack is not None:
+        renderer_classes.append(EvoMessagePackRenderer)
+    return renderer_classes
@@ -0,0 +1,8 @@
+from rest_framework.utils.encoders import JSONEncoder
+
+_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    """Representation of the values the encoders don't support natively, the same as DRF's JSONEncoder"""
+    return _encoder.default(obj)
@@ -0,0 +1,55 @@
+import math
+
+from rest_framework.renderers import JSONRenderer
+
+from .encoding import encode_default
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Escaped like JSONRenderer does, the output stays a strict JavaScript subset
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+def has_non_finite_float(data):
+    """Whether a payload holds a NaN or infinite float, which orjson renders as null"""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(has_non_finite_float(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(has_non_finite_float(value) for value in data)
+    return False
+
+
+class EvoJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson, which serializes datetimes, UUIDs and dataclasses natively, falling back
+    to the stdlib encoder of JSONRenderer when orjson isn't installed.
+
+    The output is JSON equivalent to that of JSONRenderer with the default settings (compact, UNICODE_JSON),
+    some floats are written differently (1e+16 for 1e16). Indented output, ASCII output, integers over 64 bits
+    and NaN / infinite floats go through JSONRenderer, which fails on the latter with STRICT_JSON where orjson
+    would write null.
+    """
+
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=encode_default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b"null" in ret and has_non_finite_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+        return ret
@@ -0,0 +1,25 @@
+from rest_framework.renderers import BaseRenderer
+
+from .encoding import encode_default
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+class EvoMessagePackRenderer(BaseRenderer):
+    """
+    MessagePack rendering of the JSON payloads, selected with ``Accept: application/msgpack`` or ``?format=msgpack``.
+    Decimals, datetimes and UUIDs have their JSON representation. Needs the msgpack package.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
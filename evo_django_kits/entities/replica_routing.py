@@ -0,0 +1,50 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+
+PRIMARY_UNTIL_COOKIE = "evo_primary_until"
+PRIMARY_UNTIL_HEADER = "X-Evo-Primary-Until"
+
+
+def get_replica_aliases(read_replicas):
+    """
+    Database aliases of a ``read_replicas`` option: an alias, a list of aliases (a pool, one is picked
+    per request) or None for ``settings.EVO_READ_REPLICAS``. An empty list reads from the primary.
+    """
+    if read_replicas is None:
+        read_replicas = getattr(settings, "EVO_READ_REPLICAS", [])
+    if isinstance(read_replicas, str):
+        read_replicas = [read_replicas]
+    unknown = [alias for alias in read_replicas if alias not in connections]
+    if unknown:
+        raise ImproperlyConfigured(f"Unknown read replica databases {unknown}, expected some of {list(connections)}")
+    return list(read_replicas)
+
+
+def choose_replica(aliases):
+    return aliases[0] if len(aliases) == 1 else random.choice(aliases)
+
+
+def get_primary_until(request):
+    """Timestamp until which the client's reads go to the primary, from the cookie or the header it echoes"""
+    value = request.COOKIES.get(PRIMARY_UNTIL_COOKIE) or request.headers.get(PRIMARY_UNTIL_HEADER)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def is_pinned_to_primary(request):
+    primary_until = get_primary_until(request)
+    return primary_until is not None and primary_until > time.time()
+
+
+def pin_to_primary(response, seconds):
+    """Send the client's reads of the next ``seconds`` to the primary, the time its writes take to replicate"""
+    primary_until = f"{time.time() + seconds:.3f}"
+    response.set_cookie(PRIMARY_UNTIL_COOKIE, primary_until, max_age=seconds, httponly=True, samesite="Lax")
+    response[PRIMARY_UNTIL_HEADER] = primary_until
+    return response
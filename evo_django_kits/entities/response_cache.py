@@ -0,0 +1,110 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import cache
+from django.utils.http import http_date
+from rest_framework import serializers
+
+from evo_django_kits.entities.model_version import get_model_version, version_bumps
+from evo_django_kits.entities.serializers.dotted_path_field import DottedPathField
+
+RESPONSE_CACHE_KEY = "evo:response:{label}:{version}:{action}:{scope}:{params}"
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def record(event, model_class):
+    with _stats_lock:
+        _stats[(event, model_class._meta.label_lower)] += 1
+
+
+def get_response_cache_stats(model_class=None):
+    """
+    Hit, miss, not modified (304) and invalidation counters of this process,
+    for one model or summed over every model
+    """
+    label = model_class._meta.label_lower if model_class is not None else None
+    stats = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0}
+    with _stats_lock:
+        for (event, event_label), count in _stats.items():
+            if label is None or event_label == label:
+                stats[event] += count
+    for bump_label, count in version_bumps.items():
+        if label is None or bump_label == label:
+            stats["invalidations"] += count
+    return stats
+
+
+def reset_response_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+    version_bumps.clear()
+
+
+def get_related_paths(serializer):
+    """
+    Dotted paths of the relations whose rows a serializer (class or instance) renders: dotted fields, nested
+    serializers and related fields rendering more than the primary key. Their models' versions key the cached
+    responses. Read from the declared fields, the fields ModelSerializer generates render related rows by
+    primary key, so the paths are known before the app registry is ready.
+    """
+    return get_fields_related_paths(serializer._declared_fields)
+
+
+def get_fields_related_paths(fields):
+    """Dotted paths of the relations rendered by serializer fields by name, see get_related_paths"""
+    paths = []
+    for name, field in fields.items():
+        if isinstance(field, DottedPathField):
+            paths.append(field.path)
+            continue
+        source = field.source or name
+        if source == "*":
+            continue
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        elif isinstance(field, serializers.ManyRelatedField):
+            field = field.child_relation
+        if isinstance(field, serializers.BaseSerializer):
+            paths.append(source)
+            paths.extend(f"{source}.{path}" for path in get_related_paths(field))
+        elif isinstance(field, serializers.RelatedField) and not field.use_pk_only_optimization():
+            paths.append(source)
+    return paths
+
+
+def get_response_cache_key(model_class, action, scope, request, view_kwargs, related_models=()):
+    """
+    Key a response by the versions of the model and the related models it renders, action, user / permission
+    scope, query params and URL kwargs
+    """
+    params = sorted((key, sorted(request.query_params.getlist(key))) for key in request.query_params.keys())
+    accepted_format = getattr(getattr(request, "accepted_renderer", None), "format", None)
+    params_hash = hashlib.md5(
+        repr((params, sorted(view_kwargs.items()), accepted_format)).encode(), usedforsecurity=False
+    ).hexdigest()
+    return RESPONSE_CACHE_KEY.format(
+        label=model_class._meta.label_lower,
+        version="-".join(str(get_model_version(model)) for model in (model_class, *related_models)),
+        action=action,
+        scope=scope,
+        params=params_hash,
+    )
+
+
+def get_etag(key):
+    # The key contains the model version, so the ETag changes whenever the model is written
+    return '"{}"'.format(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
+
+def get_cached_payload(key):
+    return cache.get(key)
+
+
+def set_cached_payload(key, data, status, timeout):
+    payload = {"data": data, "status": status, "last_modified": http_date(time.time())}
+    cache.set(key, payload, timeout)
+    return payload
@@ -0,0 +1,208 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+from django.db.backends.utils import truncate_name
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_migrate, post_save
+
+SEARCH_TABLE = "evo_search_{db_table}"
+SEARCH_RANK = "search_rank"
+
+# Field weights by position, the first search field weighs the most (Postgres' ts_rank weights)
+WEIGHTS = (("A", 1.0), ("B", 0.4), ("C", 0.2), ("D", 0.1))
+
+_search_indexes = {}
+
+
+def get_batch_size(connection):
+    """Primary keys per ``IN`` list, under the query parameters limit of the database (65535 on Postgres)"""
+    return connection.features.max_query_params or 65535
+
+
+def get_search_tokens(terms):
+    """Words of the search terms, punctuation is dropped like the full-text tokenizers do"""
+    return [token for term in terms for token in re.findall(r"\w+", term)]
+
+
+class SearchIndex:
+    """
+    Full-text index of a model's text fields, kept in a side table of the model's database:
+    an FTS5 virtual table on SQLite, a ``tsvector`` column with a GIN index on Postgres.
+
+    Rows are indexed on save (post_save) and by the bulk actions of BaseViewSet. Deleted rows can stay in the
+    index, searches only return rows of the model table, until ``evo_rebuild_search_index`` drops them.
+    """
+
+    def __init__(self, model_class, fields):
+        self.model_class = model_class
+        self.fields = list(fields)
+        for name in self.fields:
+            field = model_class._meta.get_field(name) if "." not in name and "__" not in name else None
+            if field is None or not field.concrete or field.is_relation:
+                raise ImproperlyConfigured(
+                    f"Search index fields of {model_class.__name__} must be concrete local fields, got '{name}'"
+                )
+        self.columns = [model_class._meta.get_field(name).column for name in self.fields]
+        self.weights = [WEIGHTS[min(index, len(WEIGHTS) - 1)] for index in range(len(self.fields))]
+        self.config = getattr(settings, "EVO_SEARCH_CONFIG", "simple")
+
+    def is_supported(self, using):
+        return connections[using].vendor in ("sqlite", "postgresql")
+
+    def get_table(self, connection):
+        return truncate_name(
+            SEARCH_TABLE.format(db_table=self.model_class._meta.db_table), connection.ops.max_name_length()
+        )
+
+    def get_pk_column(self, connection):
+        # FTS5 rows are keyed by their row id
+        return "rowid" if connection.vendor == "sqlite" else '"pk"'
+
+    def create_table(self, using):
+        connection = connections[using]
+        table = connection.ops.quote_name(self.get_table(connection))
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                if self.model_class._meta.pk.get_internal_type() not in ("AutoField", "BigAutoField", "IntegerField"):
+                    raise ImproperlyConfigured(f"FTS5 search indexes need an integer primary key on {self.model_class}")
+                columns = ", ".join(connection.ops.quote_name(column) for column in self.columns)
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5({columns}, "
+                    f"tokenize='unicode61 remove_diacritics 2')"
+                )
+            else:
+                pk_type = self.model_class._meta.pk.rel_db_type(connection)
+                cursor.execute(f'CREATE TABLE IF NOT EXISTS {table} ("pk" {pk_type} PRIMARY KEY, "document" tsvector)')
+                index = connection.ops.quote_name(truncate_name(f"{self.get_table(connection)}_document", 63))
+                cursor.execute(f'CREATE INDEX IF NOT EXISTS {index} ON {table} USING GIN ("document")')
+
+    def drop_table(self, using):
+        connection = connections[using]
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {connection.ops.quote_name(self.get_table(connection))}")
+
+    def index_rows(self, rows, using):
+        """Write ``(pk, *field values)`` rows to the index, replacing their previous entries"""
+        if not rows or not self.is_supported(using):
+            return
+        connection = connections[using]
+        table = connection.ops.quote_name(self.get_table(connection))
+        rows = [(row[0], *("" if value is None else str(value) for value in row[1:])) for row in rows]
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                # FTS5 tables have no upsert
+                self.delete_rows([row[0] for row in rows], using)
+                columns = ", ".join(connection.ops.quote_name(column) for column in self.columns)
+                placeholders = ", ".join(["%s"] * (len(self.columns) + 1))
+                cursor.executemany(f"INSERT INTO {table} (rowid, {columns}) VALUES ({placeholders})", rows)
+            else:
+                document = " || ".join(f"setweight(to_tsvector(%s, %s), '{weight}')" for weight, _ in self.weights)
+                cursor.executemany(
+                    f'INSERT INTO {table} ("pk", "document") VALUES (%s, {document}) '
+                    f'ON CONFLICT ("pk") DO UPDATE SET "document" = EXCLUDED."document"',
+                    [(row[0], *(param for value in row[1:] for param in (self.config, value))) for row in rows],
+                )
+
+    def index_instances(self, instances, using):
+        rows = [(instance.pk, *(getattr(instance, name) for name in self.fields)) for instance in instances]
+        self.index_rows([row for row in rows if row[0] is not None], using)
+
+    def delete_rows(self, pks, using):
+        if not pks or not self.is_supported(using):
+            return
+        connection = connections[using]
+        table = connection.ops.quote_name(self.get_table(connection))
+        pks = list(pks)
+        batch_size = get_batch_size(connection)
+        with connection.cursor() as cursor:
+            for start in range(0, len(pks), batch_size):
+                batch = pks[start : start + batch_size]
+                placeholders = ", ".join(["%s"] * len(batch))
+                cursor.execute(f"DELETE FROM {table} WHERE {self.get_pk_column(connection)} IN ({placeholders})", batch)
+
+    def rebuild(self, using, batch_size=1000):
+        """Recreate the index from the model table, reading it in primary key order by batches"""
+        self.drop_table(using)
+        self.create_table(using)
+        queryset = self.model_class._base_manager.using(using).order_by("pk").values_list("pk", *self.fields)
+        count = 0
+        last_pk = None
+        while True:
+            batch = list((queryset if last_pk is None else queryset.filter(pk__gt=last_pk))[:batch_size])
+            if not batch:
+                return count
+            self.index_rows(batch, using)
+            count += len(batch)
+            last_pk = batch[-1][0]
+
+    def get_match(self, connection, tokens):
+        """WHERE clause and params selecting the index rows matching every token, by prefix"""
+        table = connection.ops.quote_name(self.get_table(connection))
+        if connection.vendor == "sqlite":
+            return f"{table} MATCH %s", [" ".join(f'"{token}"*' for token in tokens)]
+        return '"document" @@ to_tsquery(%s, %s)', [self.config, " & ".join(f"{token}:*" for token in tokens)]
+
+    def search(self, queryset, terms, rank=True):
+        """
+        Filter the queryset on the rows matching every search term in any indexed field. With ``rank``, the rows
+        are ordered by relevance first, the queryset ordering breaking the ties.
+        """
+        tokens = get_search_tokens(terms)
+        if not tokens:
+            return queryset.none()
+
+        connection = connections[queryset.db]
+        table = connection.ops.quote_name(self.get_table(connection))
+        match, params = self.get_match(connection, tokens)
+        pk_column = self.get_pk_column(connection)
+        queryset = queryset.filter(pk__in=RawSQL(f"SELECT {pk_column} FROM {table} WHERE {match}", params))
+        if not rank:
+            return queryset
+
+        if connection.vendor == "sqlite":
+            weights = ", ".join(str(weight) for _, weight in self.weights)
+            # bm25() is lower for better matches
+            score = f"-bm25({table}, {weights})"
+        else:
+            score = 'ts_rank("document", to_tsquery(%s, %s))'
+            params = params + params
+        # The model table isn't aliased in the list queries, the rank is computed for the row of the outer query
+        opts = self.model_class._meta
+        outer_pk = f"{connection.ops.quote_name(opts.db_table)}.{connection.ops.quote_name(opts.pk.column)}"
+        rank_sql = f"SELECT {score} FROM {table} WHERE {match} AND {table}.{pk_column} = {outer_pk}"
+        ordering = queryset.query.order_by or self.model_class._meta.ordering or ["pk"]
+        return queryset.annotate(**{SEARCH_RANK: RawSQL(rank_sql, params)}).order_by(f"-{SEARCH_RANK}", *ordering)
+
+
+def get_search_index(model_class):
+    return _search_indexes.get(model_class)
+
+
+def get_search_indexes():
+    return list(_search_indexes.values())
+
+
+def register_search_index(model_class, fields):
+    """Create the search index of a model and keep it in sync with saves, once per model"""
+    if model_class not in _search_indexes:
+        _search_indexes[model_class] = SearchIndex(model_class, fields)
+        label = model_class._meta.label_lower
+        post_save.connect(_index_saved_instance, sender=model_class, dispatch_uid=f"evo-search-index-save-{label}")
+        post_migrate.connect(_create_search_tables, dispatch_uid="evo-search-index-migrate")
+    return _search_indexes[model_class]
+
+
+def _index_saved_instance(sender, instance, using, raw=False, update_fields=None, **kwargs):
+    search_index = _search_indexes[sender]
+    if raw or (update_fields is not None and not set(update_fields) & set(search_index.fields)):
+        return
+    search_index.index_instances([instance], using)
+
+
+def _create_search_tables(sender, using="default", **kwargs):
+    # Sent once per migrated app
+    for search_index in get_search_indexes():
+        if search_index.model_class._meta.app_label == sender.label and search_index.is_supported(using):
+            search_index.create_table(using)
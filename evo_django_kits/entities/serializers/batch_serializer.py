@@ -0,0 +1,37 @@
+from rest_framework import serializers
+
+BATCH_METHODS = ("GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE")
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    """One sub-request of a batch, ``path`` relative to the API root or absolute ("/api/students/")"""
+
+    id = serializers.CharField(required=False)
+    method = serializers.CharField(default="GET")
+    path = serializers.CharField()
+    query = serializers.DictField(required=False, default=dict)
+    body = serializers.JSONField(required=False, default=None)
+
+    def validate_method(self, method):
+        method = method.upper()
+        if method not in BATCH_METHODS:
+            raise serializers.ValidationError(f"Unsupported method, expected one of {list(BATCH_METHODS)}")
+        return method
+
+
+class BatchSerializer(serializers.Serializer):
+    """
+    Payload of the batch endpoint, ``atomic`` runs the sub-requests in one transaction rolled back
+    at the first failing one.
+    """
+
+    requests = BatchRequestSerializer(many=True)
+    atomic = serializers.BooleanField(default=False)
+
+    def validate_requests(self, requests):
+        if not requests:
+            raise serializers.ValidationError("requests is required")
+        max_requests = self.context.get("max_requests")
+        if max_requests is not None and len(requests) > max_requests:
+            raise serializers.ValidationError(f"Ensure this field has no more than {max_requests} items.")
+        return requests
@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+
+class BulkWriteSerializer(serializers.Serializer):
+    """
+    Payload of the bulk_create / bulk_update actions: the items are validated by the model serializer,
+    ``partial`` writes the valid items and reports the others instead of rejecting the whole payload,
+    ``upsert`` (bulk_create only) updates the rows conflicting on the registered ``bulk_unique_fields``.
+    """
+
+    items = serializers.ListField(child=serializers.DictField(), required=True)
+    partial = serializers.BooleanField(default=False)
+    upsert = serializers.BooleanField(default=False)
+
+    def validate_items(self, items):
+        if not items:
+            raise serializers.ValidationError("items is required")
+        max_items = self.context.get("max_items")
+        if max_items is not None and len(items) > max_items:
+            raise serializers.ValidationError(f"Ensure this field has no more than {max_items} items.")
+        return items
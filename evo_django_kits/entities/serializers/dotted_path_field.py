@@ -0,0 +1,29 @@
+from django.db.models import Manager
+from rest_framework import serializers
+
+
+class DottedPathField(serializers.ReadOnlyField):
+    """
+    Read only field rendering a dotted attribute path of any depth, e.g. ``campus.university.country.code``.
+
+    Querysets planned by the viewset annotate the value under the field name so no related instance is built,
+    instances coming from elsewhere (create / update responses) fall back to walking the path.
+    """
+
+    def __init__(self, path, **kwargs):
+        self.path = path
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        if self.field_name in instance.__dict__:
+            return instance.__dict__[self.field_name]
+        return self.get_path_value(instance, self.path.split("."))
+
+    def get_path_value(self, obj, attrs):
+        for index, attr in enumerate(attrs):
+            obj = getattr(obj, attr, None)
+            if obj is None:
+                return None
+            if isinstance(obj, Manager):
+                return [self.get_path_value(item, attrs[index + 1 :]) for item in obj.all()]
+        return obj
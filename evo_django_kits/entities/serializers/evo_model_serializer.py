@@ -0,0 +1,62 @@
+from rest_framework import serializers
+from rest_framework.serializers import raise_errors_on_nested_writes
+from rest_framework.utils import model_meta
+
+from evo_django_kits.entities import minimal_update
+
+
+class EvoModelSerializer(serializers.ModelSerializer):
+    """
+    Base class of the generated serializers, accepting a ``fields`` argument to render a subset of
+    its readable fields (sparse fieldsets, see ``BaseViewSet.get_sparse_fields``).
+
+    Updates only write the fields whose value changed, ``changed_fields`` holds their names after ``save()``
+    (None when the instance was saved whole).
+    """
+
+    changed_fields = None
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            selected = set(fields)
+            for field_name in list(self.fields):
+                if field_name not in selected:
+                    self.fields.pop(field_name)
+
+    @classmethod
+    def get_readable_field_names(cls):
+        """Names of the readable fields, computed once per serializer class"""
+        if "_readable_field_names" not in cls.__dict__:
+            cls._readable_field_names = tuple(field.field_name for field in cls()._readable_fields)
+        return cls._readable_field_names
+
+    def update(self, instance, validated_data):
+        """
+        ModelSerializer.update saving the changed fields only (``save(update_fields=...)``), without any query
+        when nothing changed. Instances of models overriding save() are saved whole, their save() may write
+        other fields.
+        """
+        raise_errors_on_nested_writes("update", self, validated_data)
+        info = model_meta.get_field_info(instance)
+        many_to_many = {
+            name: validated_data.pop(name)
+            for name in list(validated_data)
+            if name in info.relations and info.relations[name].to_many
+        }
+
+        model_class = type(instance)
+        changed_fields = minimal_update.set_changed_fields(instance, validated_data)
+        if changed_fields is None or minimal_update.has_custom_save(model_class):
+            instance.save()
+            changed_fields = None
+        elif changed_fields:
+            auto_now_fields = [field.name for field in minimal_update.get_auto_now_fields(model_class)]
+            instance.save(update_fields=[*changed_fields, *auto_now_fields])
+
+        for name, value in many_to_many.items():
+            getattr(instance, name).set(value)
+        if changed_fields is not None:
+            changed_fields.extend(many_to_many)
+        self.changed_fields = changed_fields
+        return instance
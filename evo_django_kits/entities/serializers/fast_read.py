@@ -0,0 +1,104 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import PKOnlyObject, PrimaryKeyRelatedField
+
+from evo_django_kits.entities.serializers.dotted_path_field import DottedPathField
+
+# Fields whose representation only depends on the column value, matched on the exact class so
+# subclasses overriding to_representation / get_attribute fall back to the serializer
+COMPILABLE_FIELD_CLASSES = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.DateField,
+    serializers.DateTimeField,
+    serializers.DecimalField,
+    serializers.DurationField,
+    serializers.EmailField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.IPAddressField,
+    serializers.JSONField,
+    serializers.ReadOnlyField,
+    serializers.SlugField,
+    serializers.TimeField,
+    serializers.URLField,
+    serializers.UUIDField,
+)
+
+
+class FastReader:
+    """
+    Compiled read only representation of a model serializer.
+
+    Rows are fetched with ``.values()`` and turned into plain dicts through a flat list of
+    ``(output key, column, converter)`` built once per serializer class, skipping model instances
+    and the per field dispatch of ``Serializer.to_representation``. The output matches the serializer's.
+    """
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.columns = list(dict.fromkeys(column for _, column, _ in plan))
+
+    def narrow(self, field_names):
+        """Reader rendering a subset of the fields, fetching only their columns"""
+        selected = set(field_names)
+        return FastReader([item for item in self.plan if item[0] in selected])
+
+    def values(self, queryset):
+        # select_related is ignored by values(), prefetches can't be applied to dicts
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def to_representation(self, rows):
+        plan = self.plan
+        return [
+            {key: None if row[column] is None else convert(row[column]) for key, column, convert in plan}
+            for row in rows
+        ]
+
+
+def compile_field(model_class, field, query_plan):
+    """Return the ``(column, converter)`` of a bound serializer field, None when it can't be compiled"""
+    if isinstance(field, DottedPathField):
+        # Only single valued paths annotated by the query plan can be read from the row
+        field_plan = query_plan.fields.get(field.field_name)
+        if field_plan is None or field.field_name not in field_plan.annotations:
+            return None
+        return field.field_name, field.to_representation
+
+    if len(field.source_attrs) != 1:
+        return None
+    try:
+        model_field = model_class._meta.get_field(field.source_attrs[0])
+    except FieldDoesNotExist:
+        return None
+    if not model_field.concrete or model_field.many_to_many:
+        return None
+
+    if type(field) is PrimaryKeyRelatedField:
+        if not model_field.many_to_one and not model_field.one_to_one:
+            return None
+        return model_field.name, lambda value: field.to_representation(PKOnlyObject(pk=value))
+
+    if type(field) not in COMPILABLE_FIELD_CLASSES or model_field.is_relation:
+        return None
+    return model_field.name, field.to_representation
+
+
+def compile_fast_reader(serializer_class, model_class, query_plan):
+    """
+    Compile a FastReader for a model serializer, None when any readable field can't be compiled
+    (method fields, nested serializers, many-to-many, file fields, custom serializer_fields...)
+    so the caller falls back to the serializer.
+    """
+    if serializer_class.to_representation is not serializers.ModelSerializer.to_representation:
+        return None
+
+    plan = []
+    for field in serializer_class()._readable_fields:
+        compiled = compile_field(model_class, field, query_plan)
+        if compiled is None:
+            return None
+        column, converter = compiled
+        plan.append((field.field_name, column, converter))
+    return FastReader(plan)
@@ -0,0 +1,68 @@
+import csv
+import json
+from itertools import islice
+
+from rest_framework.utils.encoders import JSONEncoder
+
+# format -> (content type, file extension)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+}
+
+# Rows of the first serialized batch of an export
+FIRST_BATCH_SIZE = 50
+
+
+def iter_batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_serialized_batches(queryset, serialize, chunk_size):
+    """
+    Serialize a queryset in batches of ``chunk_size`` rows. Rows are streamed from the database with
+    ``iterator()`` so memory stays flat whatever the number of rows. The first batch holds at most
+    ``FIRST_BATCH_SIZE`` rows, so the first bytes go out once the query returned rather than once a whole
+    chunk was serialized.
+    """
+    rows = queryset.iterator(chunk_size=chunk_size)
+    first_batch = list(islice(rows, min(FIRST_BATCH_SIZE, chunk_size)))
+    if not first_batch:
+        return
+    yield serialize(first_batch)
+    for batch in iter_batches(rows, chunk_size):
+        yield serialize(batch)
+
+
+def stream_ndjson(batches):
+    encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    for batch in batches:
+        yield "".join(encoder.encode(row) + "\n" for row in batch)
+
+
+class _Echo:
+    """File-like object handing back what csv.writer writes"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=JSONEncoder, ensure_ascii=False)
+    return value
+
+
+def stream_csv(field_names, batches):
+    writer = csv.writer(_Echo())
+    # The header goes out before the query runs
+    yield writer.writerow(field_names)
+    for batch in batches:
+        yield "".join(writer.writerow([_csv_value(row.get(name)) for name in field_names]) for row in batch)
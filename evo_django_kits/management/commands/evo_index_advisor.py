@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.migrations import AddIndex
+from django.db.migrations.writer import OperationWriter
+
+from evo_django_kits.django_moduler import index_advisor
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the ordering, filters and searches declared with @rest_api with the indexes of the models' tables "
+        "and EXPLAIN the generated list queries"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("models", nargs="*", help="Model labels (app_label.ModelName), all registered by default")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Database to introspect and EXPLAIN on")
+        parser.add_argument("--no-explain", action="store_true", help="Only compare the declarations and indexes")
+        parser.add_argument(
+            "--operations", action="store_true", help="Print the migration operations adding the missing indexes"
+        )
+
+    def handle(self, *args, **options):
+        registry = {
+            model_class._meta.label_lower: item for model_class, item in RestFrameworkModuler().registry.items()
+        }
+        labels = [label.lower() for label in options["models"]] or sorted(registry)
+        unknown = [label for label in labels if label not in registry]
+        if unknown:
+            raise CommandError(f"{unknown} are not registered with @rest_api")
+
+        using = options["database"]
+        # app_label -> AddIndex operations, each block goes in a migration of its app
+        operations = {}
+        for label in labels:
+            registration = registry[label]
+            model_class = registration.model_class
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{model_class._meta.label} (/{registration.resource_name}/)"))
+
+            patterns = index_advisor.get_access_patterns(model_class, registration.options)
+            index_advisor.check_patterns(model_class, patterns, using)
+            for pattern in patterns:
+                line = f"  {pattern.kind:<9} {pattern.name:<30} "
+                if pattern.note is not None:
+                    self.stdout.write(line + pattern.note)
+                elif pattern.covered_by is not None:
+                    self.stdout.write(line + f"ok ({pattern.covered_by})")
+                else:
+                    self.stdout.write(self.style.WARNING(line + f"missing index on {pattern.fields}"))
+
+            missing = index_advisor.get_missing_indexes(model_class, patterns)
+            if missing:
+                operations.setdefault(model_class._meta.app_label, []).extend(
+                    AddIndex(model_class._meta.model_name, index) for index in missing
+                )
+
+            if not options["no_explain"]:
+                for query_label, plan, warnings in index_advisor.explain_queries(
+                    model_class, registration.options, using
+                ):
+                    if warnings:
+                        self.stdout.write(self.style.WARNING(f"  EXPLAIN {query_label}  [{', '.join(warnings)}]"))
+                    else:
+                        self.stdout.write(f"  EXPLAIN {query_label}")
+                    for plan_line in plan.splitlines():
+                        self.stdout.write(f"    {plan_line}")
+
+        if options["operations"]:
+            for app_label, app_operations in sorted(operations.items()):
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n{app_label}"))
+                self.stdout.write("operations = [")
+                for operation in app_operations:
+                    self.stdout.write(OperationWriter(operation, indentation=1).serialize()[0])
+                self.stdout.write("]")
+        elif operations:
+            count = sum(len(app_operations) for app_operations in operations.values())
+            self.stdout.write(f"\n{count} missing indexes, --operations prints their migration operations by app")
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from evo_django_kits.entities import instrumentation
+
+
+class Command(BaseCommand):
+    help = "Print the slowest API resources recorded with EVO_INSTRUMENTATION and flag likely N+1 query patterns"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20, help="Number of resources to print")
+        parser.add_argument(
+            "--n-plus-one-threshold",
+            type=float,
+            default=0.5,
+            help="Queries per serialized row above which a list resource is flagged as N+1",
+        )
+        parser.add_argument("--reset", action="store_true", help="Clear the recorded timings after printing them")
+
+    def handle(self, *args, **options):
+        aggregates = instrumentation.get_aggregates()
+        if not aggregates:
+            self.stdout.write("No requests recorded, enable settings.EVO_INSTRUMENTATION first")
+            return
+
+        rows = sorted(aggregates.items(), key=lambda item: item[1]["seconds"] / item[1]["requests"], reverse=True)
+        self.stdout.write(f"{'resource':<40} {'requests':>8} {'avg ms':>9} {'max ms':>9} {'queries':>8} slowest phase")
+        for resource, aggregate in rows[: options["limit"]]:
+            requests = aggregate["requests"]
+            phase_name, phase_seconds = max(aggregate["phases"].items(), key=lambda item: item[1])
+            line = (
+                f"{resource:<40} {requests:>8} {aggregate['seconds'] / requests * 1000:>9.1f} "
+                f"{aggregate['max_seconds'] * 1000:>9.1f} {aggregate['queries'] / requests:>8.1f} "
+                f"{phase_name} ({phase_seconds / requests * 1000:.1f}ms)"
+            )
+            queries_per_row = instrumentation.get_queries_per_row(aggregate)
+            if queries_per_row is not None and queries_per_row >= options["n_plus_one_threshold"]:
+                line += f"  N+1: {queries_per_row:.1f} queries per row"
+                self.stdout.write(self.style.WARNING(line))
+            else:
+                self.stdout.write(line)
+
+        if options["reset"]:
+            instrumentation.reset_aggregates()
+            self.stdout.write("Recorded timings cleared")
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from evo_django_kits.entities.search_index import get_search_indexes
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search indexes of the models registered with @rest_api(search_index=...)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models", nargs="*", help="Model labels (app_label.ModelName), all indexed models by default"
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows read and indexed per query")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Database holding the indexes")
+
+    def handle(self, *args, **options):
+        search_indexes = {
+            search_index.model_class._meta.label_lower: search_index for search_index in get_search_indexes()
+        }
+        labels = [label.lower() for label in options["models"]] or list(search_indexes)
+        unknown = [label for label in labels if label not in search_indexes]
+        if unknown:
+            raise CommandError(f"No search index for {unknown}, indexed models: {list(search_indexes)}")
+
+        for label in labels:
+            search_index = search_indexes[label]
+            if not search_index.is_supported(options["database"]):
+                self.stdout.write(f"{label}: skipped, the database has no full-text search support")
+                continue
+            started = time.perf_counter()
+            count = search_index.rebuild(options["database"], batch_size=options["batch_size"])
+            self.stdout.write(f"{label}: {count} rows indexed in {time.perf_counter() - started:.1f}s")
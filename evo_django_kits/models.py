@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class ChangeLogEntry(models.Model):
+    """
+    A write of a model with a changes feed (see entities/changes_feed.py): an upserted row, or the tombstone
+    of a deleted one. Entries are read in id order, the id is the cursor of the feed.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    # label_lower of the model
+    model = models.CharField(max_length=150)
+    object_pk = models.CharField(max_length=255)
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["model", "id"], name="evo_changelog_model_id")]
+
+    def __str__(self):
+        return f"{self.model} {self.object_pk} {'deleted' if self.deleted else 'upserted'}"
@@ -38,5 +38,5 @@ setup(
     packages=find_packages(exclude=["tests", ".github"]),
     install_requires=read_requirements("requirements.txt"),
     entry_points={"console_scripts": ["evo_django_kits = evo_django_kits.__main__:main"]},
-    extras_require={"test": read_requirements("requirements-test.txt")},
+    extras_require={"test": read_requirements("requirements-test.txt"), "fast": ["orjson", "msgpack"]},
 )
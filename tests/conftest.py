@@ -1,6 +1,74 @@
 import sys
 
+import django
 import pytest
+from django.conf import settings
+
+
+def pytest_configure():
+    settings.configure(
+        DEBUG=False,
+        ALLOWED_HOSTS=["testserver"],
+        SECRET_KEY="evo-django-kits-tests",
+        USE_TZ=True,
+        DEFAULT_AUTO_FIELD="django.db.models.AutoField",
+        DATABASES={
+            "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+            "replica": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+        },
+        INSTALLED_APPS=[
+            "django.contrib.contenttypes",
+            "django.contrib.auth",
+            "rest_framework",
+            "django_filters",
+            "evo_django_kits",
+            "tests.testapp",
+        ],
+        MIDDLEWARE=[],
+        ROOT_URLCONF="tests.urls",
+        REST_FRAMEWORK={
+            "DEFAULT_PAGINATION_CLASS": "evo_django_kits.entities.pagination.EvoPageNumberPagination",
+            "DEFAULT_FILTER_BACKENDS": [
+                "django_filters.rest_framework.DjangoFilterBackend",
+                "rest_framework.filters.SearchFilter",
+                "rest_framework.filters.OrderingFilter",
+            ],
+        },
+    )
+    django.setup()
+
+
+@pytest.fixture(scope="session")
+def django_db_setup():
+    from django.core.management import call_command
+
+    call_command("migrate", run_syncdb=True, verbosity=0)
+    call_command("migrate", database="replica", run_syncdb=True, verbosity=0)
+
+
+# each test using the database runs inside a rolled back transaction
+@pytest.fixture
+def db(django_db_setup):
+    from django.db import transaction
+
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+@pytest.fixture
+def api_client():
+    from rest_framework.test import APIClient
+
+    return APIClient()
+
+
+@pytest.fixture
+def admin_client(db, api_client):
+    from django.contrib.auth.models import User
+
+    api_client.force_authenticate(User.objects.create(username="admin", is_staff=True))
+    return api_client
 
 
 # each test runs on cwd to its temp dir
@@ -0,0 +1,81 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+from tests.testapp.models import Campus, Country, Profile, Student, University
+
+
+def seed_profiles():
+    vietnam = Country.objects.create(code="VN", name="Vietnam")
+    japan = Country.objects.create(code="JP", name="Japan")
+    rows = [("a", 20, "low", vietnam, True), ("b", 30, "high", vietnam, True), ("c", 40, "high", japan, False)]
+    for name, age, level, country, active in rows:
+        Profile.objects.create(name=name, age=age, level=level, country=country, active=active, score=age / 10)
+
+
+def test_aggregate_groups(db):
+    seed_profiles()
+    client = APIClient()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/profiles/aggregate/", {"group_by": "level", "aggregate": "count,sum:age,max:age"})
+    assert response.status_code == 200
+    assert response.data["results"] == [
+        {"level": "high", "count": 2, "age__sum": 70, "age__max": 40},
+        {"level": "low", "count": 1, "age__sum": 20, "age__max": 20},
+    ]
+    assert response.data["truncated"] is False
+    assert len([query for query in queries if "GROUP BY" in query["sql"]]) == 1
+
+    # filters apply, relations are grouped on through their lookups
+    response = client.get("/profiles/aggregate/", {"group_by": "country.code", "aggregate": "avg:age", "active": True})
+    assert response.data["results"] == [{"country__code": "VN", "age__avg": 25}]
+
+    response = client.get("/profiles/aggregate/", {"aggregate": "count,min:age"})
+    assert response.data["results"] == [{"count": 3, "age__min": 20}]
+
+
+def test_aggregate_whitelist(db):
+    client = APIClient()
+    assert client.get("/profiles/aggregate/", {"group_by": "name"}).status_code == 400
+    assert client.get("/profiles/aggregate/", {"aggregate": "sum:score"}).status_code == 400
+    assert client.get("/profiles/aggregate/", {"aggregate": "median:age"}).status_code == 400
+    assert client.get("/countries/aggregate/").status_code == 404
+
+
+def test_aggregate_with_query_plan_and_search(db):
+    country = Country.objects.create(code="VN", name="Vietnam")
+    university = University.objects.create(name="HUST", country=country)
+    campuses = [Campus.objects.create(name=name, university=university) for name in ("north", "south")]
+    for index in range(5):
+        Student.objects.create(name=f"student-{index % 2}", campus=campuses[index % 2])
+
+    viewset_class = RestFrameworkModuler().registry[Student]["viewset_class"]
+    viewset_class.aggregate_fields = ["campus.name"]
+    try:
+        response = APIClient().get(
+            "/students/aggregate/", {"group_by": "campus.name", "search": "student-0", "ordering": "-name"}
+        )
+    finally:
+        del viewset_class.aggregate_fields
+    assert response.data["results"] == [{"campus__name": "north", "count": 3}]
+
+
+def test_aggregate_cache(admin_client):
+    seed_profiles()
+    viewset_class = RestFrameworkModuler().registry[Profile]["viewset_class"]
+    viewset_class.aggregate_cache_timeout = 60
+    params = {"group_by": "level", "aggregate": "count"}
+    try:
+        assert admin_client.get("/profiles/aggregate/", params)["X-Cache"] == "MISS"
+        response = admin_client.get("/profiles/aggregate/", params)
+        assert response["X-Cache"] == "HIT"
+        assert [row["count"] for row in response.data["results"]] == [2, 1]
+
+        # writes through the API bump the model version
+        assert admin_client.post("/profiles/", {"name": "d", "level": "low"}, format="json").status_code == 201
+        response = admin_client.get("/profiles/aggregate/", params)
+    finally:
+        del viewset_class.aggregate_cache_timeout
+    assert response["X-Cache"] == "MISS"
+    assert [row["count"] for row in response.data["results"]] == [2, 2]
@@ -0,0 +1,71 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+from evo_django_kits.entities.async_base_viewset import AsyncBaseViewSet
+from evo_django_kits.entities.permissions.is_staff_or_read_only import IsStaffOrReadOnly
+from tests.testapp.models import Campus, Country, Course, Tag, University
+
+
+@pytest.fixture
+def courses(db):
+    country = Country.objects.create(code="VN", name="Vietnam")
+    campus = Campus.objects.create(name="Bach Khoa", university=University.objects.create(name="HUST", country=country))
+    tag = Tag.objects.create(name="tag")
+    for i in range(15):
+        Course.objects.create(name=f"course-{i:02}", campus=campus).tags.add(tag)
+    return campus
+
+
+def test_async_viewset_class():
+    viewset_class = RestFrameworkModuler().registry[Course]["viewset_class"]
+    assert issubclass(viewset_class, AsyncBaseViewSet)
+
+
+def test_async_list_and_retrieve(api_client, courses):
+    response = api_client.get("/courses/", {"search": "course-1", "page_size": 3})
+    assert response.status_code == 200
+    assert response.data["count"] == 5
+    assert response.data["results"][0] == {
+        "id": 11,
+        "name": "course-10",
+        "campus": courses.id,
+        "tags": [1],
+        "campus__name": "Bach Khoa",
+    }
+    assert response.data["next"].endswith("page=2&page_size=3&search=course-1")
+
+    assert api_client.get("/courses/2/").data["name"] == "course-01"
+    assert api_client.get("/courses/999/").status_code == 404
+    assert api_client.get("/courses/", {"page": 9}).status_code == 404
+
+
+def test_async_client(courses):
+    client = AsyncClient()
+    response = async_to_sync(client.get)("/courses/", {"fields": "id,name", "page_size": 2})
+    assert response.status_code == 200
+    assert response.json()["results"] == [{"id": 1, "name": "course-00"}, {"id": 2, "name": "course-01"}]
+
+
+def test_async_writes(admin_client, courses):
+    viewset_class = RestFrameworkModuler().registry[Course]["viewset_class"]
+    viewset_class.permission_classes = [IsStaffOrReadOnly]
+    try:
+        assert APIClient().post("/courses/", {"name": "new", "campus": courses.id}).status_code == 403
+        assert APIClient().get("/courses/").status_code == 200
+
+        response = admin_client.post("/courses/", {"name": "new", "campus": courses.id}, format="json")
+        assert response.status_code == 201
+        course_id = response.data["data"]["id"]
+        response = admin_client.patch(f"/courses/{course_id}/", {"name": "renamed"}, format="json")
+        assert response.data["data"]["name"] == "renamed"
+        assert admin_client.delete(f"/courses/{course_id}/").status_code == 204
+        assert not Course.objects.filter(id=course_id).exists()
+
+        response = admin_client.delete("/courses/bulk_delete/", {"ids": [1, 2, 3]}, format="json")
+        assert response.data["data"]["deleted"]["testapp.Course"] == 3
+        assert Course.objects.count() == 12
+    finally:
+        del viewset_class.permission_classes
@@ -0,0 +1,116 @@
+import time
+from types import SimpleNamespace
+
+from django.http import HttpRequest
+from django.test import override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from evo_django_kits.entities.batch_view import BatchView, get_request_groups
+from tests.testapp.models import Campus, Country, Course, Student, University
+
+
+def seed():
+    country = Country.objects.create(code="VN", name="Vietnam")
+    university = University.objects.create(name="HCMUS", country=country)
+    campus = Campus.objects.create(name="Main", university=university)
+    for i in range(3):
+        Student.objects.create(name=f"student-{i}", campus=campus)
+    Course.objects.create(name="course", campus=campus)
+    return country
+
+
+def test_batch_runs_reads(db):
+    country = seed()
+    response = APIClient().post(
+        "/batch/",
+        {
+            "requests": [
+                {"id": "students", "path": "/students/", "query": {"page_size": 2}},
+                {"id": "country", "path": f"countries/{country.pk}/"},
+                {"id": "courses", "path": "courses/?search=course"},
+                {"id": "missing", "path": "nowhere/"},
+            ]
+        },
+        format="json",
+    )
+    assert response.status_code == 200
+    students, country_result, courses, missing = response.data["data"]["responses"]
+    assert students["id"] == "students" and students["status"] == 200
+    assert students["body"]["count"] == 3 and len(students["body"]["results"]) == 2
+    assert country_result["body"]["code"] == "VN"
+    # async viewsets run on the event loop
+    assert courses["status"] == 200 and [row["name"] for row in courses["body"]["results"]] == ["course"]
+    assert missing["status"] == 404
+
+
+def test_batch_forwards_the_authenticated_user(admin_client):
+    country = seed()
+    request = {"method": "delete", "path": "countries/bulk_delete/", "body": {"ids": [country.pk]}}
+    response = APIClient().post("/batch/", {"requests": [request]}, format="json")
+    assert response.data["data"]["responses"][0]["status"] == 403
+
+    response = admin_client.post("/batch/", {"requests": [request]}, format="json")
+    assert response.data["data"]["responses"][0]["status"] < 300
+    assert not Country.objects.filter(pk=country.pk).exists()
+
+
+def test_atomic_batch_rolls_back(db):
+    seed()
+    response = APIClient().post(
+        "/batch/",
+        {
+            "atomic": True,
+            "requests": [
+                {"method": "POST", "path": "tags/", "body": {"name": "rolled back"}},
+                {"method": "POST", "path": "tags/", "body": {}},
+                {"method": "GET", "path": "tags/"},
+            ],
+        },
+        format="json",
+    )
+    assert response.status_code == 200
+    assert response.data["data"]["committed"] is False
+    assert [result["status"] for result in response.data["data"]["responses"]] == [201, 400, 424]
+    assert not APIClient().get("/tags/").data["results"]
+
+    response = APIClient().post(
+        "/batch/",
+        {"atomic": True, "requests": [{"method": "POST", "path": "tags/", "body": {"name": "kept"}}]},
+        format="json",
+    )
+    assert response.data["data"]["committed"] is True
+    assert [row["name"] for row in APIClient().get("/tags/").data["results"]] == ["kept"]
+
+
+def test_batch_limits(db):
+    requests = [{"path": "countries/"}] * 3
+    with override_settings(EVO_BATCH_MAX_REQUESTS=2):
+        assert APIClient().post("/batch/", {"requests": requests}, format="json").status_code == 400
+    assert APIClient().post("/batch/", {"requests": []}, format="json").status_code == 400
+    assert (
+        APIClient().post("/batch/", {"requests": [{"method": "TRACE", "path": "x/"}]}, format="json").status_code == 400
+    )
+
+    with override_settings(EVO_BATCH_TIMEOUT=-1):
+        response = APIClient().post("/batch/", {"requests": requests}, format="json")
+    assert [result["status"] for result in response.data["data"]["responses"]] == [503] * 3
+
+
+def test_batch_deadline_inside_a_group(monkeypatch):
+    def slow_view(sub_request):
+        time.sleep(0.2)
+        return Response({"ok": True})
+
+    view = BatchView()
+    view.max_workers = 1
+    monkeypatch.setattr(view, "resolve", lambda sub_request: SimpleNamespace(func=slow_view, args=(), kwargs={}))
+    # The second read of the group waits for the thread of the first one, it starts past the deadline
+    responses = view.run_group([HttpRequest(), HttpRequest()], deadline=time.monotonic() + 0.1)
+    assert [response.status_code for response in responses] == [200, 503]
+
+
+def test_request_groups():
+    items = [{"method": method} for method in ("GET", "GET", "POST", "GET", "HEAD", "DELETE")]
+    assert get_request_groups(items) == [[0, 1], [2], [3, 4], [5]]
+    assert get_request_groups(items, concurrent=False) == [[index] for index in range(6)]
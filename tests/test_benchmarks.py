@@ -0,0 +1,48 @@
+import json
+
+from evo_django_kits import cli
+from evo_django_kits.benchmarks import suite
+
+
+def make_results(list_seconds, register_seconds):
+    return {
+        "version": suite.RESULTS_VERSION,
+        "quick": True,
+        "suites": {
+            "list_views": {"params": {}, "seconds": 1.0, "results": {"flat.page_size_10": list_seconds}},
+            "registration": {"params": {}, "seconds": 1.0, "results": {"lazy.register_seconds": register_seconds}},
+        },
+    }
+
+
+def test_flatten_metrics():
+    assert suite.flatten_metrics({"a": {"seconds": 1.5, "label": "x"}, "b": 2}, "suite.") == {
+        "suite.a.seconds": 1.5,
+        "suite.b": 2,
+    }
+
+
+def test_compare_flags_timings_slower_than_the_threshold():
+    baseline = make_results({"seconds": 0.010, "rows_per_second": 1000}, 0.5)
+    current = make_results({"seconds": 0.012, "rows_per_second": 833}, 0.52)
+    rows, regressions = suite.compare(current, baseline, threshold=0.1)
+    assert regressions == ["list_views.flat.page_size_10.seconds"]
+    # only timings are compared, throughputs mirror them
+    assert [row[0] for row in rows] == ["list_views.flat.page_size_10.seconds", "registration.lazy.register_seconds"]
+
+    _, regressions = suite.compare(current, baseline, threshold=0.25)
+    assert regressions == []
+
+
+def test_bench_command_exits_with_1_on_regression(monkeypatch, tmpdir, capsys):
+    baseline_path = str(tmpdir / "baseline.json")
+    output_path = str(tmpdir / "results.json")
+    suite.save_results(baseline_path, make_results({"seconds": 0.010}, 0.5))
+    monkeypatch.setattr(suite, "run_suites", lambda names, quick: make_results({"seconds": 0.020}, 0.5))
+
+    assert cli.main(["bench", "--quick", "--baseline", baseline_path, "--output", output_path]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
+    with open(output_path) as results_file:
+        assert json.load(results_file)["suites"]["list_views"]["results"]["flat.page_size_10"]["seconds"] == 0.020
+
+    assert cli.main(["bench", "--quick", "--baseline", baseline_path, "--threshold", "1.5"]) == 0
@@ -0,0 +1,59 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+from evo_django_kits.entities.model_version import get_model_version
+from tests.testapp.models import Campus, Country, Faculty, Profile, Student, University
+
+
+def test_bulk_delete_fast_path(admin_client):
+    profiles = [Profile.objects.create(name=f"profile-{i}") for i in range(25)]
+    ids = [profile.id for profile in profiles[:21]]
+
+    viewset_class = RestFrameworkModuler().registry[Profile]["viewset_class"]
+    viewset_class.bulk_delete_chunk_size = 10
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.delete("/profiles/bulk_delete/", {"ids": ids + [999]}, format="json")
+    finally:
+        del viewset_class.bulk_delete_chunk_size
+    assert response.status_code == 204
+    assert response.data["data"]["deleted"] == {"testapp.Profile": 21}
+    assert response.data["message"] == "Delete 21 successful"
+    # No collector: one DELETE per chunk and no SELECT
+    assert [query["sql"].split()[0] for query in queries] == ["SAVEPOINT", "DELETE", "DELETE", "DELETE", "RELEASE"]
+    assert Profile.objects.count() == 4
+
+
+def test_bulk_delete_fast_path_of_cached_models(admin_client):
+    university = University.objects.create(name="HUST", country=Country.objects.create(code="VN", name="Vietnam"))
+    ids = [Faculty.objects.create(name=f"faculty-{i}", university=university).id for i in range(3)]
+    version = get_model_version(Faculty)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.delete("/faculties/bulk_delete/", {"ids": ids}, format="json")
+    assert response.data["data"]["deleted"] == {"testapp.Faculty": 3}
+    # The cached responses are invalidated without a post_delete receiver loading the rows
+    assert [query["sql"].split()[0] for query in queries] == ["SAVEPOINT", "DELETE", "RELEASE"]
+    assert get_model_version(Faculty) != version
+
+
+def test_bulk_delete_cascades(admin_client):
+    country = Country.objects.create(code="VN", name="Vietnam")
+    campus = Campus.objects.create(name="Bach Khoa", university=University.objects.create(name="HUST", country=country))
+    Student.objects.create(name="student", campus=campus)
+
+    version = get_model_version(Campus)
+
+    response = admin_client.delete(f"/countries/bulk_delete/?ids={country.id}")
+    assert response.data["data"]["deleted"] == {
+        "testapp.Country": 1,
+        "testapp.University": 1,
+        "testapp.Campus": 1,
+        "testapp.Student": 1,
+    }
+    assert not Student.objects.exists()
+    # Tracked models deleted by the cascades are invalidated too
+    assert get_model_version(Campus) != version
+
+    assert admin_client.delete("/countries/bulk_delete/?ids=a,b").status_code == 400
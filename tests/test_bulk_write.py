@@ -0,0 +1,98 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+from tests.testapp.models import Campus, Country, Student, Tag, University
+
+
+def test_bulk_create(admin_client):
+    assert admin_client.get("/countries/").data["count"] == 0
+    items = [{"code": f"{i:02d}", "name": f"country-{i}"} for i in range(25)]
+
+    viewset_class = RestFrameworkModuler().registry[Country]["viewset_class"]
+    viewset_class.bulk_batch_size = 10
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.post("/countries/bulk_create/", {"items": items}, format="json")
+    finally:
+        del viewset_class.bulk_batch_size
+    assert response.status_code == 201
+    assert len(response.data["data"]["ids"]) == 25
+    assert len([query for query in queries if query["sql"].startswith("INSERT")]) == 3
+    # Bulk writes bump the model version of the cached count
+    assert admin_client.get("/countries/").data["count"] == 25
+
+
+def test_bulk_create_validation(admin_client):
+    Country.objects.create(code="VN", name="Vietnam")
+    items = [{"code": "LA", "name": "Laos"}, {"code": "VN", "name": "Viet Nam"}, {"code": "TOOLONG"}]
+
+    response = admin_client.post("/countries/bulk_create/", {"items": items}, format="json")
+    assert response.status_code == 400
+    assert set(response.data["items"]) == {1, 2}
+    assert Country.objects.count() == 1
+
+    response = admin_client.post("/countries/bulk_create/", {"items": items, "partial": True}, format="json")
+    assert response.status_code == 201
+    assert set(response.data["data"]["errors"]) == {1, 2}
+    assert list(Country.objects.order_by("id").values_list("code", flat=True)) == ["VN", "LA"]
+
+    response = admin_client.post("/countries/bulk_create/", {"items": [{}] * 1001}, format="json")
+    assert response.status_code == 400 and "items" in response.data
+
+
+def test_bulk_write_duplicates(admin_client):
+    items = [{"code": "VN", "name": "Vietnam"}, {"code": "LA", "name": "Laos"}, {"code": "VN", "name": "Viet Nam"}]
+    response = admin_client.post("/countries/bulk_create/", {"items": items}, format="json")
+    assert response.status_code == 400 and set(response.data["items"]) == {2}
+
+    response = admin_client.post("/countries/bulk_create/", {"items": items, "partial": True}, format="json")
+    assert response.status_code == 201 and set(response.data["data"]["errors"][2]) == {"code"}
+    assert dict(Country.objects.values_list("code", "name")) == {"VN": "Vietnam", "LA": "Laos"}
+
+    country = Country.objects.get(code="LA")
+    items = [{"id": country.id, "name": "a"}, {"id": country.id, "name": "b"}]
+    response = admin_client.patch("/countries/bulk_update/", {"items": items, "partial": True}, format="json")
+    assert response.data["data"]["ids"] == [country.id] and set(response.data["data"]["errors"]) == {1}
+    assert Country.objects.get(id=country.id).name == "a"
+
+
+def test_bulk_create_upsert(admin_client):
+    Country.objects.create(code="VN", name="Vietnam")
+    items = [{"code": "VN", "name": "Viet Nam"}, {"code": "LA", "name": "Laos"}]
+    assert admin_client.post("/countries/bulk_create/", {"items": items}, format="json").status_code == 400
+
+    response = admin_client.post("/countries/bulk_create/", {"items": items, "upsert": True}, format="json")
+    assert response.status_code == 201
+    assert dict(Country.objects.values_list("code", "name")) == {"VN": "Viet Nam", "LA": "Laos"}
+
+    response = admin_client.post("/tags/bulk_create/", {"items": [{"name": "a"}], "upsert": True}, format="json")
+    assert response.status_code == 400 and "upsert" in response.data
+
+
+def test_bulk_update(admin_client):
+    country = Country.objects.create(code="VN", name="Vietnam")
+    campus = Campus.objects.create(name="Bach Khoa", university=University.objects.create(name="HUST", country=country))
+    tags = [Tag.objects.create(name=f"tag-{i}") for i in range(2)]
+    students = [Student.objects.create(name=f"student-{i}", campus=campus) for i in range(3)]
+
+    items = [{"id": student.id, "name": f"renamed-{student.id}", "tags": [tags[1].id]} for student in students]
+    items.append({"id": 999, "name": "missing"})
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.patch("/students/bulk_update/", {"items": items, "partial": True}, format="json")
+    assert response.status_code == 200
+    assert response.data["data"] == {"ids": [s.id for s in students], "errors": {3: {"id": ["Not found."]}}}
+    assert len([query for query in queries if query["sql"].startswith("UPDATE")]) == 1
+
+    assert list(Student.objects.order_by("id").values_list("name", flat=True)) == [
+        f"renamed-{student.id}" for student in students
+    ]
+    assert list(students[0].tags.all()) == [tags[1]]
+
+    response = admin_client.patch("/students/bulk_update/", {"items": items}, format="json")
+    assert response.status_code == 400
+
+
+def test_bulk_write_permission(api_client, db):
+    response = api_client.post("/countries/bulk_create/", {"items": [{"code": "VN", "name": "Vietnam"}]}, format="json")
+    assert response.status_code == 403
@@ -0,0 +1,97 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.test import APIClient
+
+from evo_django_kits.entities.changes_feed import ChangeFeed, decode_cursor, encode_cursor
+from evo_django_kits.models import ChangeLogEntry
+from tests.testapp.models import Country, Note, Task
+
+
+def follow(client, url, cursor, **params):
+    """Every batch of changes after a cursor, the last cursor"""
+    batches = []
+    while True:
+        response = client.get(url, {"since": cursor, **params})
+        assert response.status_code == 200, response.data
+        batches.append(response.data)
+        cursor = response.data["cursor"]
+        if not response.data["has_more"]:
+            return batches, cursor
+
+
+def test_logged_changes(admin_client):
+    Task.objects.create(code="old", title="before the sync")
+    head = admin_client.get("/tasks/changes/").data
+    assert head["results"] == [] and head["has_more"] is False
+
+    first = Task.objects.create(code="a", title="a")
+    second = Task.objects.create(code="b", title="b")
+    first.title = "a2"
+    first.save()
+    response = admin_client.post(
+        "/tasks/bulk_create/", {"items": [{"code": "c", "title": "c"}, {"code": "d", "title": "d"}]}, format="json"
+    )
+    assert response.status_code == 201
+    admin_client.patch("/tasks/bulk_update/", {"items": [{"id": second.pk, "title": "b2"}]}, format="json")
+    deleted = Task.objects.get(code="d")
+    assert admin_client.delete(f"/tasks/{deleted.pk}/").status_code == 204
+
+    batches, cursor = follow(admin_client, "/tasks/changes/", head["cursor"])
+    assert len(batches) == 1
+    # rows in the order of their last change, once each
+    assert [row["title"] for row in batches[0]["results"]] == ["a2", "c", "b2"]
+    assert batches[0]["deleted"] == [deleted.pk]
+
+    # resumed from the last cursor
+    assert admin_client.get("/tasks/changes/", {"since": cursor}).data["results"] == []
+    admin_client.delete("/tasks/bulk_delete/", {"ids": [first.pk]}, format="json")
+    response = admin_client.get("/tasks/changes/", {"since": cursor})
+    assert response.data["results"] == [] and response.data["deleted"] == [first.pk]
+
+
+def test_logged_changes_in_batches(db):
+    client = APIClient()
+    head = client.get("/tasks/changes/").data["cursor"]
+    for index in range(5):
+        Task.objects.create(code=str(index), title=str(index))
+    batches, _ = follow(client, "/tasks/changes/", head, limit=2)
+    assert [[row["code"] for row in batch["results"]] for batch in batches] == [["0", "1"], ["2", "3"], ["4"]]
+    assert batches[0]["next"].startswith("http://testserver/tasks/changes/?")
+
+
+def test_updated_at_changes(admin_client):
+    head = admin_client.get("/notes/changes/").data["cursor"]
+    notes = [Note.objects.create(text=str(index)) for index in range(3)]
+    notes[0].text = "0b"
+    notes[0].save()
+    # only the rows deleted get a tombstone
+    admin_client.delete("/notes/bulk_delete/", {"ids": [notes[1].pk, 999]}, format="json")
+
+    # changes_batch_size=2
+    batches, cursor = follow(admin_client, "/notes/changes/", head)
+    assert [[row["text"] for row in batch["results"]] for batch in batches] == [["2", "0b"]]
+    assert batches[0]["deleted"] == [notes[1].pk]
+    # upserts are read from the table, only the tombstones are logged
+    assert list(ChangeLogEntry.objects.filter(model="testapp.note").values_list("deleted", flat=True)) == [True]
+
+    Note.objects.create(text="3")
+    response = admin_client.get("/notes/changes/", {"since": cursor})
+    assert [row["text"] for row in response.data["results"]] == ["3"]
+
+
+def test_changes_errors(db):
+    client = APIClient()
+    assert client.get("/countries/changes/").status_code == 404
+    assert client.get("/tasks/changes/", {"since": "nope"}).status_code == 400
+    for cursor in (
+        {"log": True},
+        {"log": 2**63},
+        {"log": 1, "at": "nope", "pk": 1},
+        {"log": 1, "at": [1], "pk": 1},
+        {"log": 1, "at": "2024-01-01T00:00:00+00:00"},
+        {"log": 1, "at": "2024-01-01T00:00:00+00:00", "pk": "x"},
+    ):
+        assert client.get("/notes/changes/", {"since": encode_cursor(cursor)}).status_code == 400, cursor
+    assert decode_cursor(encode_cursor({"log": 3})) == {"log": 3}
+    with pytest.raises(ImproperlyConfigured):
+        ChangeFeed(Country, field="name")
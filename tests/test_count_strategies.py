@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from tests.testapp.models import Country, University
+
+
+@pytest.fixture
+def countries(db):
+    return [Country.objects.create(code=f"{i:02d}", name=f"country-{i}") for i in range(15)]
+
+
+def count_queries(captured):
+    return len([query for query in captured if "COUNT(" in query["sql"]])
+
+
+def test_cached_count_is_invalidated_on_write(countries, api_client):
+    assert api_client.get("/countries/").data["count_exact"] is True
+
+    with CaptureQueriesContext(connection) as captured:
+        response = api_client.get("/countries/", {"page": 2})
+    assert (response.data["count"], response.data["count_exact"]) == (15, False)
+    assert count_queries(captured) == 0
+    assert response.data["next"] is None and response.data["previous"] is not None
+
+    # filters are part of the cache key
+    assert api_client.get("/countries/", {"ordering": "-id"}).data["count_exact"] is True
+
+    Country.objects.create(code="XX", name="new")
+    response = api_client.get("/countries/")
+    assert (response.data["count"], response.data["count_exact"]) == (16, True)
+
+
+@pytest.fixture
+def universities(countries):
+    return [University.objects.create(name=f"university-{i}", country=countries[0]) for i in range(15)]
+
+
+@override_settings(EVO_PAGINATION_COUNT="none")
+def test_no_count(universities, api_client):
+    with CaptureQueriesContext(connection) as captured:
+        response = api_client.get("/universities/", {"page_size": 10, "page": 1})
+    assert "count" not in response.data and response.data["count_exact"] is False
+    assert count_queries(captured) == 0
+    assert len(response.data["results"]) == 10
+
+    last = api_client.get(response.data["next"]).data
+    assert len(last["results"]) == 5 and last["next"] is None
+    assert api_client.get("/universities/", {"page_size": 10, "page": 3}).status_code == 404
+
+
+@override_settings(EVO_PAGINATION_COUNT="estimated")
+def test_estimated_count_falls_back_to_exact_on_sqlite(universities, api_client):
+    response = api_client.get("/universities/")
+    assert (response.data["count"], response.data["count_exact"]) == (15, True)
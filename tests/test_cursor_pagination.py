@@ -0,0 +1,81 @@
+import base64
+import datetime
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+from evo_django_kits.entities.pagination import EvoCursorPagination
+from tests.testapp.models import Profile, Tag
+
+
+@pytest.fixture
+def tags(db):
+    # duplicated names exercise the primary key tie-breaker
+    return [Tag.objects.create(name=f"tag-{i // 3:02d}") for i in range(25)]
+
+
+def walk(api_client, url, key="next"):
+    pages = []
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == 200
+        pages.append([row["id"] for row in response.data["results"]])
+        url = response.data[key]
+        # a cursor repeating the current page never ends the walk
+        assert len(pages) < 50
+    return pages
+
+
+def test_cursor_pagination_walks_both_directions(tags, api_client):
+    pages = walk(api_client, "/tags/?page_size=10")
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert sum(pages, []) == [tag.id for tag in sorted(tags, key=lambda tag: (tag.name, tag.id))]
+
+    last = api_client.get("/tags/?page_size=10").data
+    last = api_client.get(api_client.get(last["next"]).data["next"]).data
+    assert last["next"] is None
+    assert set(last) == {"count", "next", "previous", "page_size", "results"}
+    assert walk(api_client, last["previous"], key="previous") == pages[1::-1]
+
+
+def test_cursor_pagination_follows_requested_ordering(tags, api_client):
+    pages = walk(api_client, "/tags/?page_size=7&ordering=-name")
+    assert sum(pages, []) == [tag.id for tag in sorted(tags, key=lambda tag: (tag.name, -tag.id), reverse=True)]
+
+
+def test_cursor_pagination_is_a_single_keyset_query(tags, api_client):
+    second = api_client.get("/tags/?page_size=10").data["next"]
+    with CaptureQueriesContext(connection) as captured:
+        api_client.get(second)
+    assert len(captured) == 1
+    assert "OFFSET" not in captured[0]["sql"] and "COUNT" not in captured[0]["sql"]
+
+
+def test_invalid_cursor(tags, api_client):
+    assert api_client.get("/tags/?cursor=nope").status_code == 404
+
+
+def test_cursor_keeps_sub_millisecond_positions(admin_client):
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    profiles = [
+        Profile.objects.create(name=f"profile-{i}", joined_at=start + datetime.timedelta(microseconds=100 + i))
+        for i in range(6)
+    ]
+    viewset_class = RestFrameworkModuler().registry[Profile]["viewset_class"]
+    pagination_class, ordering = viewset_class.pagination_class, viewset_class.ordering
+    viewset_class.pagination_class = EvoCursorPagination
+    viewset_class.ordering = ["joined_at"]
+    try:
+        pages = walk(admin_client, "/profiles/?page_size=2")
+    finally:
+        viewset_class.pagination_class, viewset_class.ordering = pagination_class, ordering
+    assert pages == [[profile.id for profile in profiles[i : i + 2]] for i in (0, 2, 4)]
+
+
+@pytest.mark.parametrize("position", [["a", "notint"], [None, None], [["a"], 1], [{"name": "a"}, 1]])
+def test_tampered_cursor(tags, api_client, position):
+    cursor = base64.urlsafe_b64encode(json.dumps([position, False]).encode()).decode()
+    assert api_client.get("/tags/", {"cursor": cursor}).status_code == 404
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from django.test import override_settings
+from rest_framework.routers import DefaultRouter
+
+from evo_django_kits.django_moduler.evo_router import EvoRouter
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+
+
+@pytest.fixture
+def route_apps(tmpdir):
+    """Two apps on the temp dir (on sys.path): one declaring its routes, one with a plain urls module"""
+    routed = tmpdir.mkdir("routed_app")
+    routed.join("__init__.py").write("evo_routes = '.api'\n")
+    routed.join("api.py").write(
+        "from rest_framework.routers import DefaultRouter\n"
+        "from tests.testapp.models import Country\n"
+        "from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler\n"
+        "router = DefaultRouter()\n"
+        "router.register('things', RestFrameworkModuler().registry[Country]['viewset_class'], basename='things')\n"
+        "# The same router under another name is only registered once\n"
+        "api_router = router\n"
+    )
+    plain = tmpdir.mkdir("plain_app")
+    plain.join("__init__.py").write("")
+    plain.join("urls.py").write(
+        "from rest_framework.routers import DefaultRouter\n"
+        "from tests.testapp.models import Tag\n"
+        "from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler\n"
+        "router = DefaultRouter()\n"
+        "router.register('plain', RestFrameworkModuler().registry[Tag]['viewset_class'], basename='plain')\n"
+    )
+    installed_apps = ["django.contrib.contenttypes", "django.contrib.auth", "tests.testapp", "routed_app", "plain_app"]
+    with override_settings(INSTALLED_APPS=installed_apps):
+        yield tmpdir
+
+
+def prefixes(router):
+    return {prefix for prefix, _, _ in router.registry}
+
+
+def test_scan_discovery(route_apps):
+    evo_router = EvoRouter(router=DefaultRouter())
+    router = evo_router.auto_router()
+    model_prefixes = prefixes(RestFrameworkModuler().router)
+    assert prefixes(router) == model_prefixes | {"things", "plain"}
+
+    # Running discovery again doesn't register anything twice
+    count = len(router.registry)
+    evo_router.auto_router()
+    assert len(router.registry) == count
+
+
+@override_settings(EVO_ROUTE_DISCOVERY="marker")
+def test_marker_discovery(route_apps):
+    entries = EvoRouter(router=DefaultRouter()).discover_routes()
+    assert entries == [{"app": "routed_app", "module": "routed_app.api", "routers": ["router", "api_router"]}]
+
+
+def test_route_manifest(route_apps, monkeypatch):
+    manifest_path = str(route_apps.join("routes.json"))
+    with override_settings(EVO_ROUTE_MANIFEST=manifest_path):
+        EvoRouter(router=DefaultRouter()).auto_router()
+        with open(manifest_path) as manifest_file:
+            assert [entry["module"] for entry in json.load(manifest_file)["routes"]] == [
+                "routed_app.api",
+                "plain_app.urls",
+            ]
+
+        # Later workers register the manifest routes without discovery
+        monkeypatch.setattr(EvoRouter, "discover_routes", lambda self: pytest.fail("discovery ran"))
+        assert {"things", "plain"} <= prefixes(EvoRouter(router=DefaultRouter()).auto_router())
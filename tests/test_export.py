@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+from evo_django_kits.entities import streaming_export
+from tests.testapp.models import Campus, Country, Profile, Student, Tag, University
+
+
+@pytest.fixture
+def students(db):
+    country = Country.objects.create(code="VN", name="Vietnam")
+    university = University.objects.create(name="HUST", country=country)
+    campus = Campus.objects.create(name="Bach Khoa", university=university)
+    tags = [Tag.objects.create(name=f"tag-{i}") for i in range(2)]
+    for i in range(25):
+        student = Student.objects.create(name=f"student-{i:02}", campus=campus)
+        student.tags.set(tags)
+
+
+def read_stream(response):
+    return b"".join(response.streaming_content).decode()
+
+
+def test_export_ndjson(admin_client, students):
+    viewset_class = RestFrameworkModuler().registry[Student]["viewset_class"]
+    viewset_class.export_chunk_size = 4
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get("/students/export/", {"search": "student-1", "ordering": "-name"})
+            rows = [json.loads(line) for line in read_stream(response).splitlines()]
+    finally:
+        del viewset_class.export_chunk_size
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert [row["name"] for row in rows] == [f"student-{i}" for i in range(19, 9, -1)]
+    assert rows[0]["campus__name"] == "Bach Khoa"
+    assert rows[0]["tags__name"] == ["tag-0", "tag-1"]
+    # The rows are read by one query, the tags are prefetched once per batch of 4
+    assert len(queries) == 4
+
+
+def test_export_first_rows_are_sent_first(admin_client, students, monkeypatch):
+    monkeypatch.setattr(streaming_export, "FIRST_BATCH_SIZE", 2)
+    response = admin_client.get("/students/export/", {"ordering": "name"})
+    first_chunk = next(iter(response.streaming_content)).decode()
+    assert [json.loads(line)["name"] for line in first_chunk.splitlines()] == ["student-00", "student-01"]
+    assert len(read_stream(response).splitlines()) == 23
+
+
+def test_export_csv_and_limit(admin_client, students):
+    response = admin_client.get("/students/export/", {"export_format": "csv", "limit": 3, "ordering": "name"})
+    assert response["Content-Type"] == "text/csv"
+    assert 'filename="students.csv"' in response["Content-Disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+    assert [row["name"] for row in rows] == ["student-00", "student-01", "student-02"]
+    assert rows[0]["tags__name"] == '["tag-0", "tag-1"]'
+
+    assert admin_client.get("/students/export/", {"export_format": "xml"}).status_code == 400
+
+
+def test_export_fast_read(admin_client, db):
+    Profile.objects.create(name="a")
+    response = admin_client.get("/profiles/export/")
+    assert json.loads(read_stream(response))["name"] == "a"
+
+
+def test_export_permission(api_client, students):
+    # admin users only by default
+    assert api_client.get("/students/export/").status_code == 403
+    assert api_client.get("/students/").status_code == 200
+
+    viewset_class = RestFrameworkModuler().registry[Student]["viewset_class"]
+    viewset_class.export_permission_classes = None
+    try:
+        assert api_client.get("/students/export/").status_code == 200
+    finally:
+        del viewset_class.export_permission_classes
@@ -0,0 +1,81 @@
+import datetime
+import decimal
+import uuid
+
+import pytest
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from evo_django_kits.django_moduler.query_plan import build_query_plan
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+from evo_django_kits.entities.serializers.fast_read import compile_fast_reader
+from tests.testapp.models import Country, Profile, University
+
+
+@pytest.fixture
+def profiles(db):
+    country = Country.objects.create(code="VN", name="Vietnam")
+    University.objects.create(name="HUST", country=country)
+    Profile.objects.create(name="empty")
+    Profile.objects.create(
+        name='Nguyễn   "quoted"',
+        bio="line\nbreak",
+        age=42,
+        score=decimal.Decimal("12.345"),
+        ratio=0.1,
+        verified=False,
+        birthday=datetime.date(1990, 1, 31),
+        joined_at=datetime.datetime(2024, 2, 29, 23, 59, 59, 123456, tzinfo=datetime.timezone.utc),
+        wake_up=datetime.time(6, 30, 0, 5),
+        session=datetime.timedelta(days=1, seconds=5),
+        uuid=uuid.uuid4(),
+        settings={"theme": "dark", "sizes": [1, 2.5, None]},
+        email="a@b.co",
+        slug="a-b",
+        website="https://example.com",
+        level="high",
+        ip="::1",
+        country=country,
+    )
+
+
+def profile_serializer_class(**options):
+    registration = RestFrameworkModuler().registry[Profile]
+    return RestFrameworkModuler().create_serializer_class(Profile, **{**registration["options"], **options})
+
+
+def test_fast_read_matches_serializer_output(profiles):
+    serializer_class = profile_serializer_class()
+    plan = build_query_plan(Profile, serializer_class)
+    reader = compile_fast_reader(serializer_class, Profile, plan)
+    assert reader is not None
+
+    queryset = plan.apply(Profile.objects.order_by("id"))
+    expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+    assert JSONRenderer().render(reader.to_representation(reader.values(queryset))) == expected
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        # dotted path crossing a reverse foreign key
+        {"fields": ["id", "country.universities.name"]},
+        # custom serializer fields
+        {"fields": ["id", "upper"], "serializer_fields": {"upper": serializers.SerializerMethodField()}},
+        {"fields": ["id", "label"], "serializer_fields": {"label": serializers.CharField(source="get_level_display")}},
+    ],
+)
+def test_fast_read_falls_back_for_uncompilable_fields(options):
+    serializer_class = profile_serializer_class(**options)
+    assert compile_fast_reader(serializer_class, Profile, build_query_plan(Profile, serializer_class)) is None
+
+
+def test_fast_read_endpoint(profiles, api_client):
+    registration = RestFrameworkModuler().registry[Profile]
+    assert registration["viewset_class"]().get_fast_reader() is not None
+
+    response = api_client.get("/profiles/")
+    assert response.status_code == 200
+    queryset = Profile.objects.order_by("id")
+    expected = JSONRenderer().render(registration["serializer_class"](queryset, many=True).data)
+    assert JSONRenderer().render(response.data["results"]) == expected
@@ -0,0 +1,105 @@
+import pytest
+from django.contrib.auth.models import Permission
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from evo_django_kits.django_moduler import index_advisor
+from evo_django_kits.django_moduler.model_registration import ModelRegistration
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+from tests.testapp.models import Campus, Country, Note, Student, University
+
+OPTIONS = {
+    "ordering": ["name", "id"],
+    "filterset_fields": ["campus", "name", "campus__name"],
+    "search_fields": ["^name"],
+}
+
+
+@pytest.fixture
+def students(db):
+    country = Country.objects.create(code="VN", name="Vietnam")
+    university = University.objects.create(name="HUST", country=country)
+    campus = Campus.objects.create(name="campus", university=university)
+    for i in range(5):
+        Student.objects.create(name=f"student-{i}", campus=campus)
+
+
+def get_report(options):
+    patterns = index_advisor.check_patterns(Student, index_advisor.get_access_patterns(Student, options), "default")
+    return {(pattern.kind, pattern.name): pattern for pattern in patterns}
+
+
+def test_declarations_are_compared_with_the_table_indexes(students):
+    report = get_report(OPTIONS)
+    # the primary key tie-breaker is dropped, filters are composed with the default ordering
+    assert report[("ordering", "name,id")].fields == ["name"]
+    assert report[("filter", "campus")].fields == ["campus", "name"]
+    assert report[("filter", "campus__name")].note == "filters on a related table"
+    assert all(pattern.covered_by is None for key, pattern in report.items() if key[1] != "campus__name")
+
+    indexes = index_advisor.get_missing_indexes(Student, report.values())
+    # ["name"] is served by the index on (name), (campus) by the index on (campus, name)
+    assert sorted(index.fields for index in indexes) == [["campus", "name"], ["name"]]
+    assert all(len(index.name) <= 30 for index in indexes)
+
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE INDEX student_campus_name ON testapp_student (campus_id, name)")
+    report = get_report(OPTIONS)
+    assert report[("filter", "campus")].covered_by == "student_campus_name"
+    assert report[("ordering", "name,id")].covered_by is None
+
+    # filtered on the foreign key index, sorted by the primary key
+    assert get_report({"ordering": ["id"], "filterset_fields": ["campus"]})[("filter", "campus")].covered_by
+
+
+def test_icontains_searches_are_reported(db):
+    report = get_report({"search_fields": ["name", "=name"]})
+    assert "search_index" in report[("search", "name")].note
+    assert report[("search", "=name")].fields == ["name"]
+
+
+def test_explain_flags_sorts_and_scans(students):
+    plans = {label: warnings for label, _, warnings in index_advisor.explain_queries(Student, OPTIONS, "default")}
+    assert set(plans) == {"list", "filter campus", "filter name"}
+    assert plans["list"] == ["full scan", "sort"]
+    assert "full scan" in plans["filter name"]
+    # the rows come from the foreign key index
+    assert "full scan" not in plans["filter campus"]
+
+    plans = {
+        label: warnings
+        for label, _, warnings in index_advisor.explain_queries(Student, {"ordering": ["id"]}, "default")
+    }
+    assert plans["list"] == []
+
+
+def test_index_advisor_command(students, capsys):
+    call_command("evo_index_advisor", "testapp.tag", "testapp.student", "--operations")
+    output = capsys.readouterr().out
+    assert "missing index on ['name']" in output
+    assert "EXPLAIN order name  [full scan, sort]" in output
+    assert "migrations.AddIndex(" in output and "model_name='tag'" in output
+
+    call_command("evo_index_advisor", "testapp.country", "--no-explain")
+    output = capsys.readouterr().out
+    assert "ok (primary key)" in output and "EXPLAIN" not in output
+
+    with pytest.raises(CommandError):
+        call_command("evo_index_advisor", "testapp.missing")
+
+
+def test_index_advisor_operations_by_app(students, capsys, monkeypatch):
+    registry = RestFrameworkModuler().registry
+    registration = ModelRegistration(RestFrameworkModuler(), Permission, "permissions", {"ordering": ["name"]})
+    monkeypatch.setitem(registry, Permission, registration)
+
+    call_command("evo_index_advisor", "auth.permission", "testapp.tag", "--operations", "--no-explain")
+    output = capsys.readouterr().out
+    auth_block, testapp_block = output.split("\nauth\n")[1].split("\ntestapp\n")
+    assert auth_block.count("migrations.AddIndex(") == 1 and "model_name='permission'" in auth_block
+    assert testapp_block.count("migrations.AddIndex(") == 1 and "model_name='tag'" in testapp_block
+
+
+def test_changes_field_pattern():
+    patterns = index_advisor.get_access_patterns(Note, {"changes": "updated_at", "ordering": ["id"]})
+    assert [(pattern.kind, pattern.fields) for pattern in patterns] == [("ordering", []), ("changes", ["updated_at"])]
@@ -0,0 +1,101 @@
+import types
+
+import pytest
+from django.test import override_settings
+from django.urls import URLResolver, path, re_path, reverse
+from django.urls.resolvers import RoutePattern
+from rest_framework.test import APIClient
+
+from evo_django_kits.django_moduler.indexed_resolver import IndexedURLResolver, get_pattern_segment
+from tests.testapp.models import Country
+from tests.urls import router
+
+PATHS = [
+    "",
+    ".json",
+    "students/",
+    "students.json",
+    "students/1/",
+    "students/1.json",
+    "students/export/",
+    "unplanned-students/",
+    "countries/bulk_delete/",
+    "nowhere/",
+    "students/1/nowhere/",
+]
+
+
+def view(request):
+    pass
+
+
+def test_pattern_segments():
+    patterns = {
+        "^students/$": "students",
+        "^students\\.(?P<format>[a-z0-9]+)/?$": "students",
+        "^students/(?P<pk>[^/.]+)/$": "students",
+        "^students/?$": "students",
+        "^unplanned-students/$": "unplanned-students",
+        "^$": None,
+        "^\\.(?P<format>[a-z0-9]+)/?$": None,
+        "^students?/$": None,
+        "^students/?(?P<pk>\\w+)$": None,
+        "^(?:students|courses)/$": None,
+        "students/$": None,
+        "^stud(?P<pk>\\w+)/$": None,
+    }
+    for regex, segment in patterns.items():
+        assert get_pattern_segment(re_path(regex, view)) == segment, regex
+    assert get_pattern_segment(path("unplanned-students/<int:pk>/", view)) == "unplanned-students"
+    assert get_pattern_segment(path("students", view)) == "students"
+    # an include of "api" also matches "apiv2/..."
+    assert get_pattern_segment(URLResolver(RoutePattern("api"), [])) is None
+    assert get_pattern_segment(URLResolver(RoutePattern("api/"), [])) == "api"
+
+
+def test_indexed_resolver_matches_like_the_url_resolver():
+    urlpatterns = router.main_router.urls
+    linear = URLResolver(RoutePattern("api/"), urlpatterns)
+    indexed = IndexedURLResolver(RoutePattern("api/"), urlpatterns)
+    for url in PATHS:
+        try:
+            expected = linear.resolve(f"api/{url}")
+        except Exception as e:
+            with pytest.raises(type(e)):
+                indexed.resolve(f"api/{url}")
+            continue
+        match = indexed.resolve(f"api/{url}")
+        assert (match.func, match.args, match.kwargs, match.url_name, match.route) == (
+            expected.func,
+            expected.args,
+            expected.kwargs,
+            expected.url_name,
+            expected.route,
+        ), url
+    assert indexed.reverse("students-detail", pk=1) == linear.reverse("students-detail", pk=1) == "students/1/"
+
+
+@override_settings(EVO_URL_DISPATCH="indexed")
+def test_indexed_dispatch(db):
+    country = Country.objects.create(code="VN", name="Vietnam")
+    urlconf = types.ModuleType("indexed_urls")
+    urlconf.urlpatterns = router.get_paths("api/", batch=True)
+    assert isinstance(urlconf.urlpatterns[-1], IndexedURLResolver)
+
+    with override_settings(ROOT_URLCONF=urlconf):
+        assert reverse("countries-detail", kwargs={"pk": country.pk}) == f"/api/countries/{country.pk}/"
+        client = APIClient()
+        assert client.get(f"/api/countries/{country.pk}/").data["code"] == "VN"
+        assert client.get("/api/nowhere/").status_code == 404
+        # the API root reverses every route
+        assert client.get("/api/").data["countries"] == "http://testserver/api/countries/"
+        response = client.post("/api/batch/", {"requests": [{"path": "/api/countries/"}]}, format="json")
+        assert response.data["data"]["responses"][0]["body"]["count"] == 1
+
+
+@override_settings(EVO_URL_DISPATCH="binary")
+def test_unknown_dispatch():
+    from django.core.exceptions import ImproperlyConfigured
+
+    with pytest.raises(ImproperlyConfigured):
+        router.get_paths()
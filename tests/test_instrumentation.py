@@ -0,0 +1,104 @@
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+
+from evo_django_kits.entities import instrumentation
+from tests.testapp.models import Campus, Country, Student, University, UnplannedStudent
+
+sink_calls = []
+
+
+def record_sink(resource, timings, aggregate):
+    sink_calls.append((resource, timings.queries, aggregate["requests"]))
+
+
+@pytest.fixture
+def campus(db):
+    cache.clear()
+    country = Country.objects.create(code="VN", name="Vietnam")
+    university = University.objects.create(name="HUST", country=country)
+    campus = Campus.objects.create(name="campus", university=university)
+    for i in range(10):
+        Student.objects.create(name=f"student-{i}", campus=campus)
+        UnplannedStudent.objects.create(name=f"unplanned-{i}", campus=campus)
+    return campus
+
+
+def test_disabled_by_default(campus, api_client):
+    response = api_client.get("/students/")
+    assert "Server-Timing" not in response
+    assert instrumentation.get_aggregates() == {}
+
+
+@override_settings(EVO_INSTRUMENTATION=True)
+def test_server_timing_header_and_aggregates(campus, api_client):
+    response = api_client.get("/students/")
+    assert response.status_code == 200
+
+    metrics = dict(metric.split(";", 1) for metric in response["Server-Timing"].split(", "))
+    assert {"queryset", "query", "serialize", "render", "db", "total"} <= set(metrics)
+    assert 'desc="' in metrics["db"]
+
+    aggregate = instrumentation.get_aggregates()["students.list"]
+    assert aggregate["requests"] == 1 and aggregate["queries"] > 0
+    assert aggregate["samples"]["x"] == 10
+
+
+@override_settings(EVO_INSTRUMENTATION=True, EVO_SERVER_TIMING=False)
+def test_server_timing_header_can_be_disabled(campus, api_client):
+    response = api_client.get("/students/")
+    assert "Server-Timing" not in response
+    assert instrumentation.get_aggregates()["students.list"]["requests"] == 1
+
+
+@override_settings(EVO_INSTRUMENTATION=True)
+def test_queries_per_row_flags_n_plus_one(campus, api_client):
+    for page_size in (2, 5, 10):
+        api_client.get(f"/students/?page_size={page_size}")
+        api_client.get(f"/unplanned-students/?page_size={page_size}")
+
+    aggregates = instrumentation.get_aggregates()
+    assert instrumentation.get_queries_per_row(aggregates["students.list"]) == pytest.approx(0)
+    assert instrumentation.get_queries_per_row(aggregates["unplanned-students.list"]) == pytest.approx(1)
+
+
+@override_settings(EVO_INSTRUMENTATION=True)
+def test_aggregates_of_processes_are_merged(campus, api_client, monkeypatch):
+    api_client.get("/students/?page_size=2")
+    # another process keeps its own aggregates, writers never overwrite each other's samples
+    monkeypatch.setattr(instrumentation, "_process", {"generation": None, "slot": None, "aggregates": {}})
+    api_client.get("/students/?page_size=5")
+    api_client.get(f"/students/{Student.objects.first().pk}/")
+
+    assert len(instrumentation.get_process_keys()) == 2
+    aggregates = instrumentation.get_aggregates()
+    assert aggregates["students.list"]["requests"] == 2
+    assert aggregates["students.list"]["samples"]["x"] == 7
+    assert aggregates["students.retrieve"]["requests"] == 1
+
+
+@override_settings(EVO_INSTRUMENTATION=True, EVO_INSTRUMENTATION_SINK="tests.test_instrumentation.record_sink")
+def test_sink_receives_every_request(campus, api_client):
+    sink_calls.clear()
+    api_client.get("/students/")
+    api_client.get(f"/students/{Student.objects.first().pk}/")
+    assert [(resource, requests) for resource, _, requests in sink_calls] == [
+        ("students.list", 1),
+        ("students.retrieve", 1),
+    ]
+
+
+@override_settings(EVO_INSTRUMENTATION=True)
+def test_perf_report_command(campus, api_client, capsys):
+    for page_size in (2, 10):
+        api_client.get(f"/students/?page_size={page_size}")
+        api_client.get(f"/unplanned-students/?page_size={page_size}")
+
+    call_command("evo_perf_report", "--reset")
+    output = capsys.readouterr().out
+    lines = {line.split()[0]: line for line in output.splitlines()[1:] if line.strip()}
+    assert "N+1" in lines["unplanned-students.list"]
+    assert "N+1" not in lines["students.list"]
+    assert "cleared" in output
+    assert instrumentation.get_aggregates() == {}
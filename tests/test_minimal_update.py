@@ -0,0 +1,78 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+from evo_django_kits.entities.changes_feed import get_change_feed
+from tests.testapp.models import Country, Note, Profile, Task
+
+
+def get_writes(queries):
+    return [query["sql"] for query in queries if query["sql"].startswith(("UPDATE", "INSERT"))]
+
+
+def test_update_writes_the_changed_fields(admin_client):
+    country = Country.objects.create(code="VN", name="Vietnam")
+    profile = Profile.objects.create(name="a", bio="long bio", age=20)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.patch(f"/profiles/{profile.pk}/", {"age": 21, "name": "a"}, format="json")
+    assert response.status_code == 200 and response.data["data"]["age"] == 21
+    (update,) = get_writes(queries)
+    assert '"age" = ' in update and '"name"' not in update and '"bio"' not in update
+
+    with CaptureQueriesContext(connection) as queries:
+        admin_client.patch(f"/profiles/{profile.pk}/", {"country": country.pk}, format="json")
+    assert '"country_id" = ' in get_writes(queries)[0]
+    profile.refresh_from_db()
+    assert (profile.age, profile.country_id, profile.bio) == (21, country.pk, "long bio")
+
+
+def test_unchanged_update_skips_the_write(admin_client):
+    profile = Profile.objects.create(name="a", age=20)
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.put(f"/profiles/{profile.pk}/", {"name": "a", "age": 20}, format="json")
+    assert response.status_code == 200 and response.data["data"]["name"] == "a"
+    assert not get_writes(queries)
+
+    # auto_now fields are written with the changed fields, and only then
+    note = Note.objects.create(text="a")
+    admin_client.patch(f"/notes/{note.pk}/", {"text": "a"}, format="json")
+    assert Note.objects.get().updated_at == note.updated_at
+    admin_client.patch(f"/notes/{note.pk}/", {"text": "b"}, format="json")
+    assert Note.objects.get().updated_at > note.updated_at
+
+
+def test_patch_without_fetch(admin_client):
+    profile = Profile.objects.create(name="a", bio="long bio", age=20)
+    viewset_class = RestFrameworkModuler().registry[Profile]["viewset_class"]
+    viewset_class.patch_without_fetch = True
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.patch(f"/profiles/{profile.pk}/", {"age": 30}, format="json")
+        statements = [query["sql"].split()[0] for query in queries]
+        missing = admin_client.patch("/profiles/999/", {"age": 30}, format="json")
+        invalid = admin_client.patch(f"/profiles/{profile.pk}/", {"age": "old"}, format="json")
+        # an empty payload loads the row
+        empty = admin_client.patch(f"/profiles/{profile.pk}/", {}, format="json")
+    finally:
+        del viewset_class.patch_without_fetch
+    assert statements == ["UPDATE"]
+    assert response.status_code == 200 and response.data["data"] == {"id": profile.pk, "age": 30}
+    assert missing.status_code == 404 and invalid.status_code == 400
+    assert empty.data["data"]["bio"] == "long bio"
+    profile.refresh_from_db()
+    assert (profile.age, profile.bio) == (30, "long bio")
+
+
+def test_patch_without_fetch_keeps_save_receivers(admin_client):
+    task = Task.objects.create(code="t-1", title="a")
+    viewset_class = RestFrameworkModuler().registry[Task]["viewset_class"]
+    viewset_class.patch_without_fetch = True
+    try:
+        response = admin_client.patch(f"/tasks/{task.pk}/", {"title": "b"}, format="json")
+    finally:
+        del viewset_class.patch_without_fetch
+    # The change log is written on post_save, the row is loaded and saved
+    assert response.data["data"]["code"] == "t-1"
+    feed = get_change_feed(Task)
+    assert feed.log.filter(model=feed.label, object_pk=str(task.pk)).count() == 2
@@ -0,0 +1,65 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from evo_django_kits.django_moduler.query_plan import QueryPlan, build_dotted_field_plan, build_query_plan
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler, check_dotted_fields
+from tests.testapp.models import Campus, Country, Student, Tag, University, UnplannedStudent
+
+
+@pytest.fixture
+def students(db):
+    country = Country.objects.create(code="VN", name="Vietnam")
+    university = University.objects.create(name="HUST", country=country)
+    tags = [Tag.objects.create(name=f"tag-{i}") for i in range(3)]
+    for i in range(30):
+        campus = Campus.objects.create(name=f"campus-{i}", university=university)
+        student = Student.objects.create(name=f"student-{i}", campus=campus)
+        student.tags.set(tags)
+        UnplannedStudent.objects.create(name=f"student-{i}", campus=campus)
+
+
+def test_build_query_plan():
+    serializer_class = RestFrameworkModuler().registry[Student]["serializer_class"]
+    plan = build_query_plan(Student, serializer_class)
+    assert plan.select_related == []
+    assert plan.prefetch_related == ["tags"]
+    assert list(plan.annotations) == ["campus__name", "campus__university__country__code"]
+    assert plan.fields["tags__name"].prefetch_related == ["tags"]
+    assert not plan.fields["campus"]
+
+
+def test_invalid_dotted_field():
+    with pytest.raises(ImproperlyConfigured, match="Campus has no field 'nope'"):
+        build_dotted_field_plan(Student, "campus.nope")
+    with pytest.raises(ImproperlyConfigured, match="Student.name is not a relation"):
+        build_dotted_field_plan(Student, "name.upper")
+    assert check_dotted_fields() == []
+
+
+def test_query_plan_override():
+    assert QueryPlan(select_related=["campus", "campus"]).select_related == ["campus"]
+    assert not RestFrameworkModuler().registry[UnplannedStudent]["viewset_class"]().get_query_plan()
+
+
+@pytest.mark.parametrize("page_size", [5, 25])
+@override_settings(EVO_ASSERT_QUERY_PLAN=True)
+def test_list_query_count_does_not_grow_with_page_size(students, api_client, page_size):
+    with CaptureQueriesContext(connection) as captured:
+        response = api_client.get("/students/", {"page_size": page_size})
+    assert response.status_code == 200
+    assert len(response.data["results"]) == page_size
+    first = response.data["results"][0]
+    assert first["campus__name"] == "campus-0"
+    assert first["campus__university__country__code"] == "VN"
+    assert first["tags__name"] == ["tag-0", "tag-1", "tag-2"]
+    # count, page and tags prefetch
+    assert len(captured) == 3
+
+
+@override_settings(EVO_ASSERT_QUERY_PLAN=True)
+def test_assert_query_plan_fails_on_n_plus_one(students, api_client):
+    with pytest.raises(AssertionError, match="query plan is missing relations"):
+        api_client.get("/unplanned-students/")
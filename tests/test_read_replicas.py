@@ -0,0 +1,109 @@
+import time
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+from evo_django_kits.entities.replica_routing import PRIMARY_UNTIL_COOKIE
+from tests.testapp.models import Campus, Country, Student, Tag, University
+
+
+def seed(using, name):
+    country = Country.objects.using(using).create(code="VN", name="Vietnam")
+    university = University.objects.using(using).create(name=name, country=country)
+    campus = Campus.objects.using(using).create(name=f"{name}-campus", university=university)
+    tag = Tag.objects.using(using).create(name=f"{name}-tag")
+    for i in range(3):
+        student = Student.objects.using(using).create(name=f"{name}-student-{i}", campus=campus)
+        student.tags.add(tag)
+    return university
+
+
+def set_read_replicas(viewset_class, read_replicas):
+    if "_resolved_replica_aliases" in viewset_class.__dict__:
+        del viewset_class._resolved_replica_aliases
+    if read_replicas is not None:
+        viewset_class.read_replicas = read_replicas
+    elif "read_replicas" in viewset_class.__dict__:
+        del viewset_class.read_replicas
+
+
+@pytest.fixture
+def replica(db):
+    # the primary and the replica hold different rows, to tell which one answered
+    with transaction.atomic(using="replica"):
+        seed("default", "primary")
+        seed("replica", "replica")
+        viewset_classes = [RestFrameworkModuler().registry[model]["viewset_class"] for model in (University, Student)]
+        for viewset_class in viewset_classes:
+            set_read_replicas(viewset_class, ["replica"])
+        try:
+            yield
+        finally:
+            for viewset_class in viewset_classes:
+                set_read_replicas(viewset_class, None)
+            transaction.set_rollback(True, using="replica")
+
+
+def test_reads_go_to_the_replica(replica, api_client):
+    with CaptureQueriesContext(connections["default"]) as primary_queries:
+        with CaptureQueriesContext(connections["replica"]) as replica_queries:
+            response = api_client.get("/students/")
+    assert response.status_code == 200
+    assert response.data["count"] == 3
+    assert [row["tags__name"] for row in response.data["results"]] == [["replica-tag"]] * 3
+    assert response.data["results"][0]["campus__name"] == "replica-campus"
+    # the count, the page and its prefetches
+    assert len(primary_queries) == 0 and len(replica_queries) > 0
+
+    university = University.objects.using("replica").get()
+    assert api_client.get(f"/universities/{university.pk}/").data["name"] == "replica"
+
+
+def test_writes_pin_the_client_reads_to_the_primary(replica, api_client):
+    country = Country.objects.get()
+    response = api_client.post("/universities/", {"name": "new", "country": country.pk}, format="json")
+    assert response.status_code == 201
+    assert float(response.cookies[PRIMARY_UNTIL_COOKIE].value) > time.time()
+    assert response.cookies[PRIMARY_UNTIL_COOKIE]["max-age"] == 5
+
+    # the cookie is sent back by the client
+    names = [row["name"] for row in api_client.get("/universities/").data["results"]]
+    assert names == ["primary", "new"]
+    # clients without cookies echo the header
+    names = [
+        row["name"]
+        for row in APIClient()
+        .get("/universities/", HTTP_X_EVO_PRIMARY_UNTIL=response["X-Evo-Primary-Until"])
+        .data["results"]
+    ]
+    assert names == ["primary", "new"]
+
+    # once the window is over, reads go back to the replica
+    api_client.cookies[PRIMARY_UNTIL_COOKIE] = str(time.time() - 1)
+    names = [row["name"] for row in api_client.get("/universities/").data["results"]]
+    assert names == ["replica"]
+
+
+def test_failed_writes_do_not_pin(replica, api_client):
+    response = api_client.post("/universities/", {"name": "new"}, format="json")
+    assert response.status_code == 400
+    assert PRIMARY_UNTIL_COOKIE not in response.cookies
+
+
+def test_replicas_are_configured_per_registration(db):
+    moduler = RestFrameworkModuler()
+    serializer_class = moduler.create_serializer_class(Tag)
+    viewset_class = moduler.create_viewset_class(
+        Tag, serializer_class, read_replicas="replica", primary_sticky_seconds=2
+    )
+    viewset = viewset_class()
+    assert viewset.get_replica_aliases() == ["replica"]
+    assert viewset.get_primary_sticky_seconds() == 2
+
+    viewset_class = moduler.create_viewset_class(Tag, serializer_class, read_replicas=["missing"])
+    with pytest.raises(ImproperlyConfigured):
+        viewset_class().get_replica_aliases()
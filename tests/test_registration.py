@@ -0,0 +1,49 @@
+import threading
+
+from django.db import models
+from django.test import override_settings
+
+from evo_django_kits.django_moduler.model_registration import ModelRegistration
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler, rest_api
+
+
+def define_model(name):
+    attrs = {"__module__": "tests.testapp.models", "name": models.CharField(max_length=10)}
+    return type(name, (models.Model,), attrs)
+
+
+@override_settings(EVO_LAZY_REGISTRATION=True)
+def test_lazy_registration():
+    moduler = RestFrameworkModuler()
+    model_class = rest_api(fields=["id", "name"])(define_model("LazyThing"))
+    registration = moduler.registry[model_class]
+    assert isinstance(registration, ModelRegistration)
+    assert not registration.is_materialized and not registration.routed
+    assert "viewset_class" in registration and "router" not in registration
+    assert list(registration) == ["serializer_class", "viewset_class", "resource_name", "options"]
+    assert registration.get("resource_name") == "lazy-things" and registration.get("router") is None
+    assert not registration.is_materialized
+
+    viewset_classes = []
+    threads = [threading.Thread(target=lambda: viewset_classes.append(registration["viewset_class"])) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(viewset_classes)) == 1
+    assert viewset_classes[0].serializer_class is registration.serializer_class
+
+    assert dict(registration.items())["viewset_class"] is viewset_classes[0]
+
+    # reading the router routes the pending registrations
+    router = moduler.router
+    assert registration.routed
+    assert ("lazy-things", viewset_classes[0], "lazy-things") in router.registry
+
+
+def test_eager_registration():
+    model_class = define_model("EagerThing")
+    viewset_class = RestFrameworkModuler().register_model(model_class)
+    registration = RestFrameworkModuler().registry[model_class]
+    assert registration.routed and registration["viewset_class"] is viewset_class
+    assert RestFrameworkModuler().register_model(model_class) is viewset_class
@@ -0,0 +1,87 @@
+import datetime
+import decimal
+import json
+import uuid
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from evo_django_kits.entities.renderers import EvoJSONRenderer, EvoMessagePackRenderer, evo_json_renderer, msgpack
+from tests.testapp.models import Country
+
+PAYLOAD = {
+    "message": gettext_lazy("Done"),
+    "data": {
+        "count": 2,
+        "results": [
+            {
+                "id": 1,
+                "price": decimal.Decimal("10.50"),
+                "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+                "created_at": datetime.datetime(2024, 1, 2, 3, 4, 5, 6789, tzinfo=datetime.timezone.utc),
+                "local_at": datetime.datetime(
+                    2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone(datetime.timedelta(hours=7))
+                ),
+                "day": datetime.date(2024, 1, 2),
+                "duration": datetime.timedelta(minutes=1),
+                "text": "Tiếng Việt \u2028 \u2029",
+                "tags": ("a", "b"),
+            },
+            {"id": 2, 10: "integer key", "nested": {"empty": None, "ratio": 0.1}},
+        ],
+    },
+}
+
+
+def test_json_renderer_is_wire_compatible():
+    assert EvoJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+    assert EvoJSONRenderer().render(None) == b""
+    # indented output goes through JSONRenderer
+    assert EvoJSONRenderer().render(PAYLOAD, "application/json; indent=2") == JSONRenderer().render(
+        PAYLOAD, "application/json; indent=2"
+    )
+    big = {"value": 2**70}
+    assert EvoJSONRenderer().render(big) == JSONRenderer().render(big)
+
+
+def test_json_renderer_floats():
+    floats = {"values": [1e16, 1e-7, 0.1, None]}
+    assert json.loads(EvoJSONRenderer().render(floats)) == json.loads(JSONRenderer().render(floats))
+    # Non-finite floats fail like STRICT_JSON instead of being rendered as null
+    for value in (float("nan"), float("inf")):
+        with pytest.raises(ValueError):
+            EvoJSONRenderer().render({"data": [{"ratio": value, "empty": None}]})
+    renderer = EvoJSONRenderer()
+    renderer.strict = False
+    assert renderer.render({"ratio": float("nan")}) == b'{"ratio":NaN}'
+
+
+def test_json_renderer_falls_back_to_the_stdlib(monkeypatch):
+    monkeypatch.setattr(evo_json_renderer, "orjson", None)
+    assert EvoJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+
+def test_viewsets_render_with_the_evo_renderers(db):
+    Country.objects.create(code="VN", name="Vietnam")
+    response = APIClient().get("/countries/")
+    assert isinstance(response.accepted_renderer, EvoJSONRenderer)
+    assert response.json()["results"][0]["code"] == "VN"
+
+    response = APIClient().get("/countries/", HTTP_ACCEPT="application/msgpack")
+    if msgpack is None:
+        assert response.status_code == 406
+    else:
+        assert response["Content-Type"] == "application/msgpack"
+        assert msgpack.unpackb(response.content)["results"][0]["code"] == "VN"
+
+
+def test_msgpack_renderer():
+    msgpack = pytest.importorskip("msgpack")
+    data = msgpack.unpackb(EvoMessagePackRenderer().render(PAYLOAD), strict_map_key=False)
+    row = data["data"]["results"][0]
+    assert data["message"] == "Done"
+    assert row["price"] == 10.5 and row["uuid"] == "12345678-1234-5678-1234-567812345678"
+    assert row["created_at"] == "2024-01-02T03:04:05.006789Z"
+    assert row["tags"] == ["a", "b"]
@@ -0,0 +1,130 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.permissions import BasePermission
+
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+from evo_django_kits.entities.model_version import get_model_version
+from evo_django_kits.entities.response_cache import (
+    get_related_paths,
+    get_response_cache_stats,
+    reset_response_cache_stats,
+)
+from tests.testapp.models import Campus, Country, Faculty, Student, University
+
+
+@pytest.fixture
+def university(db):
+    cache.clear()
+    reset_response_cache_stats()
+    country = Country.objects.create(code="VN", name="Vietnam")
+    university = University.objects.create(name="HUST", country=country)
+    Campus.objects.create(name="campus", university=university)
+    return university
+
+
+def test_list_is_cached_until_the_model_is_written(university, api_client):
+    first = api_client.get("/campuses/")
+    assert first["X-Cache"] == "MISS" and first["ETag"] and first["Last-Modified"]
+
+    with CaptureQueriesContext(connection) as captured:
+        second = api_client.get("/campuses/")
+    assert second["X-Cache"] == "HIT" and second["ETag"] == first["ETag"]
+    assert second.data == first.data
+    assert len(captured) == 0
+
+    with CaptureQueriesContext(connection) as captured:
+        not_modified = api_client.get("/campuses/", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert not_modified.status_code == 304
+    assert len(captured) == 0
+
+    api_client.post("/campuses/", {"name": "new", "university": university.pk}, format="json")
+    third = api_client.get("/campuses/", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert third.status_code == 200 and third["X-Cache"] == "MISS"
+    assert third.data["count"] == 2
+
+    # saves outside the viewset invalidate through the model signals
+    campus = Campus.objects.get(name="new")
+    campus.save()
+    assert api_client.get("/campuses/")["X-Cache"] == "MISS"
+    assert api_client.delete(f"/campuses/{campus.pk}/").status_code == 204
+    assert api_client.get("/campuses/")["X-Cache"] == "MISS"
+
+    stats = get_response_cache_stats(Campus)
+    assert (stats["hits"], stats["misses"], stats["not_modified"]) == (1, 4, 1)
+    assert stats["invalidations"] >= 3
+
+
+def test_cache_key_varies_by_query_params(university, api_client):
+    campus = Campus.objects.get()
+    assert api_client.get("/campuses/")["X-Cache"] == "MISS"
+    assert api_client.get("/campuses/", {"page_size": 5})["X-Cache"] == "MISS"
+    assert api_client.get(f"/campuses/{campus.pk}/")["X-Cache"] == "MISS"
+    assert api_client.get(f"/campuses/{campus.pk}/").data["name"] == "campus"
+
+
+def test_related_writes_are_tracked_from_registration(university, api_client):
+    # Tracked when the model is registered, a process that never served the viewset still bumps the version
+    viewset_class = RestFrameworkModuler().registry[Faculty]["viewset_class"]
+    assert "_resolved_cache_models" not in viewset_class.__dict__
+    version = get_model_version(University)
+    university.name = "renamed"
+    university.save()
+    assert get_model_version(University) != version
+
+    Faculty.objects.create(name="IT", university=university)
+    assert api_client.get("/faculties/")["X-Cache"] == "MISS"
+    assert api_client.get("/faculties/")["X-Cache"] == "HIT"
+    university.name = "HUST"
+    university.save()
+    response = api_client.get("/faculties/")
+    assert response["X-Cache"] == "MISS" and response.data["results"][0]["university__name"] == "HUST"
+
+
+def test_related_writes_invalidate_cached_responses(university, api_client):
+    campus = Campus.objects.get()
+    Student.objects.create(name="student", campus=campus)
+    viewset_class = RestFrameworkModuler().registry[Student]["viewset_class"]
+    assert get_related_paths(viewset_class.serializer_class()) == [
+        "campus.name",
+        "campus.university.country.code",
+        "tags.name",
+    ]
+
+    viewset_class.cache_responses = True
+    try:
+        assert api_client.get("/students/")["X-Cache"] == "MISS"
+        assert api_client.get("/students/")["X-Cache"] == "HIT"
+        campus.name = "renamed"
+        campus.save()
+        response = api_client.get("/students/")
+        university.country.code = "JP"
+        university.country.save()
+        country_codes = api_client.get("/students/").data["results"][0]["campus__university__country__code"]
+    finally:
+        del viewset_class.cache_responses
+        del viewset_class._resolved_cache_models
+    assert response["X-Cache"] == "MISS" and response.data["results"][0]["campus__name"] == "renamed"
+    assert country_codes == "JP"
+
+
+class IsNotSecret(BasePermission):
+    def has_object_permission(self, request, view, obj):
+        return obj.name != "secret"
+
+
+def test_cached_retrieve_checks_object_permissions(university, api_client):
+    campus = Campus.objects.get()
+    viewset_class = RestFrameworkModuler().registry[Campus]["viewset_class"]
+    permission_classes = viewset_class.permission_classes
+    viewset_class.permission_classes = [IsNotSecret]
+    try:
+        assert api_client.get(f"/campuses/{campus.pk}/")["X-Cache"] == "MISS"
+        assert api_client.get(f"/campuses/{campus.pk}/")["X-Cache"] == "HIT"
+        # update() doesn't bump the model version, the cached body is still there
+        Campus.objects.filter(pk=campus.pk).update(name="secret")
+        response = api_client.get(f"/campuses/{campus.pk}/")
+    finally:
+        viewset_class.permission_classes = permission_classes
+    assert response.status_code == 403
@@ -0,0 +1,106 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from evo_django_kits.django_moduler.rest_framework import RestFrameworkModuler
+from evo_django_kits.entities.search_index import get_search_index
+from tests.testapp.models import Article, Campus, Tag
+
+
+@pytest.fixture
+def articles(db):
+    return [
+        Article.objects.create(slug="a", title="Django tips", body="Querysets and indexes"),
+        Article.objects.create(slug="b", title="Weekly notes", body="A django release and other news"),
+        Article.objects.create(slug="c", title="Python", body="Generators"),
+    ]
+
+
+def search(client, term, **params):
+    response = client.get("/articles/", {"search": term, **params})
+    assert response.status_code == 200
+    return [row["slug"] for row in response.data["results"]]
+
+
+def index_size():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT COUNT(*) FROM "evo_search_testapp_article"')
+        return cursor.fetchone()[0]
+
+
+def test_search_is_ranked_and_answered_by_the_index(articles, api_client):
+    with CaptureQueriesContext(connection) as captured:
+        # matches in the title rank above matches in the body
+        assert search(api_client, "django") == ["a", "b"]
+    assert all("LIKE" not in query["sql"] for query in captured)
+    assert any("MATCH" in query["sql"] for query in captured)
+
+    # every term must match, by prefix and in any field
+    assert search(api_client, "djan index") == ["a"]
+    assert search(api_client, "missing") == []
+    assert search(api_client, "!!") == []
+    # an explicit ordering replaces the relevance
+    assert search(api_client, "django", ordering="-id") == ["b", "a"]
+
+
+def test_index_follows_writes(articles, api_client, admin_client):
+    article = articles[2]
+    article.title = "Python and Django"
+    article.save()
+    assert sorted(search(api_client, "django")) == ["a", "b", "c"]
+
+    response = admin_client.patch(
+        "/articles/bulk_update/", {"items": [{"id": article.pk, "title": "Rust"}]}, format="json"
+    )
+    assert response.status_code == 200
+    assert search(api_client, "rust") == ["c"]
+
+    response = admin_client.post(
+        "/articles/bulk_create/", {"items": [{"slug": "d", "title": "Django admin"}]}, format="json"
+    )
+    assert response.status_code == 201
+    assert search(api_client, "admin") == ["d"]
+
+    assert admin_client.delete(f"/articles/{articles[0].pk}/").status_code == 204
+    response = admin_client.delete("/articles/bulk_delete/", {"ids": [articles[1].pk]}, format="json")
+    assert response.status_code == 204
+    assert search(api_client, "django") == ["d"]
+    assert index_size() == 2
+
+
+def test_index_deletes_stay_under_the_parameters_limit(articles):
+    ids = [article.pk for article in articles] + list(range(1000, 1000 + connection.features.max_query_params))
+    with CaptureQueriesContext(connection) as captured:
+        get_search_index(Article).delete_rows(ids, "default")
+    assert [query["sql"].split()[0] for query in captured] == ["DELETE", "DELETE"]
+    assert index_size() == 0
+
+
+def test_bulk_upsert_ignoring_conflicts_indexes_the_new_rows(articles, admin_client):
+    # only unique fields: conflicting rows are kept and the inserted ones come back without primary key
+    response = admin_client.post(
+        "/articles/bulk_create/", {"items": [{"slug": "a"}, {"slug": "new"}], "upsert": True}, format="json"
+    )
+    assert response.status_code == 201
+    assert index_size() == 4
+
+
+def test_rebuild_command(articles, api_client, capsys):
+    # queryset updates don't send post_save
+    Article.objects.filter(slug="c").update(title="Flask")
+    assert search(api_client, "flask") == []
+
+    call_command("evo_rebuild_search_index", "testapp.article", "--batch-size", "2")
+    assert "testapp.article: 3 rows indexed" in capsys.readouterr().out
+    assert search(api_client, "flask") == ["c"]
+    assert index_size() == 3
+
+
+def test_search_index_needs_local_fields(db):
+    moduler = RestFrameworkModuler()
+    with pytest.raises(ImproperlyConfigured):
+        moduler.get_search_index(Tag, {"search_index": True})
+    with pytest.raises(ImproperlyConfigured):
+        moduler.get_search_index(Campus, {"search_index": ["university.name"]})
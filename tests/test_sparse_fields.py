@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.testapp.models import Campus, Country, Profile, Student, Tag, University
+
+
+@pytest.fixture
+def students(db):
+    country = Country.objects.create(code="VN", name="Vietnam")
+    university = University.objects.create(name="HUST", country=country)
+    campus = Campus.objects.create(name="Bach Khoa", university=university)
+    tag = Tag.objects.create(name="tag")
+    for i in range(3):
+        Student.objects.create(name=f"student-{i}", campus=campus).tags.add(tag)
+    Profile.objects.create(name="profile", bio="long text", country=country)
+
+
+def test_sparse_fields(api_client, students):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get("/students/", {"fields": "id,campus.name"})
+    assert response.status_code == 200
+    assert response.data["results"][0] == {"id": 1, "campus__name": "Bach Khoa"}
+    # The tags aren't prefetched and the name column isn't read
+    select = queries[-1]["sql"]
+    assert "tag" not in select and '"testapp_student"."name"' not in select
+
+    response = api_client.get("/students/1/", {"exclude": "tags,tags.name,campus__university__country__code"})
+    assert set(response.data) == {"id", "name", "campus", "campus__name"}
+
+
+def test_field_presets(api_client, students):
+    response = api_client.get("/students/", {"view": "card", "fields": "tags__name"})
+    assert response.data["results"][0] == {
+        "id": 1,
+        "name": "student-0",
+        "campus__name": "Bach Khoa",
+        "tags__name": ["tag"],
+    }
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get("/profiles/", {"view": "summary"})
+    assert response.data["results"] == [{"id": 1, "name": "profile"}]
+    assert '"bio"' not in queries[-1]["sql"]
+
+
+@pytest.mark.parametrize(
+    "params", [{"fields": "id,nope"}, {"exclude": "password"}, {"view": "nope"}], ids=["fields", "exclude", "view"]
+)
+def test_invalid_sparse_fields(api_client, students, params):
+    response = api_client.get("/students/", params)
+    assert response.status_code == 400
+    assert list(response.data) == list(params)
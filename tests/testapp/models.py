@@ -0,0 +1,129 @@
+from django.db import models
+
+from evo_django_kits.django_moduler.rest_framework import rest_api
+
+
+@rest_api(count_strategy="cached", ordering=["id"], bulk_unique_fields=["code"])
+class Country(models.Model):
+    code = models.CharField(max_length=2, unique=True)
+    name = models.CharField(max_length=100)
+
+
+@rest_api(ordering=["id"])
+class University(models.Model):
+    name = models.CharField(max_length=100)
+    country = models.ForeignKey(Country, on_delete=models.CASCADE, related_name="universities")
+
+
+@rest_api(resource_name="campuses", cache_responses=True, ordering=["id"])
+class Campus(models.Model):
+    name = models.CharField(max_length=100)
+    university = models.ForeignKey(University, on_delete=models.CASCADE, related_name="campuses")
+
+
+@rest_api(cache_responses=True, fields=["id", "name", "university.name"], ordering=["id"])
+class Faculty(models.Model):
+    name = models.CharField(max_length=100)
+    university = models.ForeignKey(University, on_delete=models.CASCADE, related_name="faculties")
+
+
+@rest_api(pagination="cursor", ordering=["name"], ordering_fields=["name", "id"])
+class Tag(models.Model):
+    name = models.CharField(max_length=50)
+
+
+@rest_api(
+    fields=["id", "name", "campus", "tags", "campus.name", "campus.university.country.code", "tags.name"],
+    search_fields=["name"],
+    ordering_fields=["name", "id"],
+    ordering=["id"],
+    field_presets={"card": ["id", "name", "campus.name"]},
+)
+class Student(models.Model):
+    name = models.CharField(max_length=100)
+    campus = models.ForeignKey(Campus, on_delete=models.CASCADE, related_name="students")
+    tags = models.ManyToManyField(Tag, blank=True)
+
+
+@rest_api(resource_name="unplanned-students", query_plan=False, fields=["id", "name", "campus.name"], ordering=["id"])
+class UnplannedStudent(models.Model):
+    name = models.CharField(max_length=100)
+    campus = models.ForeignKey(Campus, on_delete=models.CASCADE)
+
+
+@rest_api(async_=True, fields=["id", "name", "campus", "tags", "campus.name"], search_fields=["name"], ordering=["id"])
+class Course(models.Model):
+    name = models.CharField(max_length=100)
+    campus = models.ForeignKey(Campus, on_delete=models.CASCADE)
+    tags = models.ManyToManyField(Tag, blank=True)
+
+
+@rest_api(
+    fast_read=True,
+    fields=[
+        "id",
+        "name",
+        "bio",
+        "age",
+        "score",
+        "ratio",
+        "active",
+        "verified",
+        "birthday",
+        "joined_at",
+        "wake_up",
+        "session",
+        "uuid",
+        "settings",
+        "email",
+        "slug",
+        "website",
+        "level",
+        "ip",
+        "country",
+        "country.code",
+    ],
+    ordering=["id"],
+    field_presets={"summary": ["id", "name"]},
+    filterset_fields=["active"],
+    aggregate_fields={"level": [], "country": [], "country.code": [], "age": ["sum", "avg", "min", "max"], "score": []},
+)
+class Profile(models.Model):
+    name = models.CharField(max_length=100)
+    bio = models.TextField(blank=True)
+    age = models.IntegerField(null=True)
+    score = models.DecimalField(max_digits=8, decimal_places=3, null=True)
+    ratio = models.FloatField(null=True)
+    active = models.BooleanField(default=True)
+    verified = models.BooleanField(null=True)
+    birthday = models.DateField(null=True)
+    joined_at = models.DateTimeField(null=True)
+    wake_up = models.TimeField(null=True)
+    session = models.DurationField(null=True)
+    uuid = models.UUIDField(null=True)
+    settings = models.JSONField(null=True)
+    email = models.EmailField(blank=True)
+    slug = models.SlugField(blank=True)
+    website = models.URLField(blank=True)
+    level = models.CharField(max_length=10, choices=[("low", "Low"), ("high", "High")], default="low")
+    ip = models.GenericIPAddressField(null=True)
+    country = models.ForeignKey(Country, null=True, on_delete=models.SET_NULL)
+
+
+@rest_api(search_fields=["title", "body"], search_index=True, ordering=["id"], bulk_unique_fields=["slug"])
+class Article(models.Model):
+    slug = models.SlugField(unique=True)
+    title = models.CharField(max_length=200, blank=True)
+    body = models.TextField(blank=True)
+
+
+@rest_api(changes=True, ordering=["id"], bulk_unique_fields=["code"])
+class Task(models.Model):
+    code = models.CharField(max_length=20, unique=True)
+    title = models.CharField(max_length=100)
+
+
+@rest_api(changes="updated_at", changes_batch_size=2, ordering=["id"])
+class Note(models.Model):
+    text = models.CharField(max_length=100)
+    updated_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,6 @@
+from evo_django_kits.django_moduler.evo_router import EvoRouter
+
+router = EvoRouter()
+router.auto_router()
+
+urlpatterns = router.get_paths(batch=True)